@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from metrics import metrics
+from star import MANAGER_DIM_PATH, PICKS_PATH, PLAYER_DIM_PATH, load_rows
+from storage import file_sha256
+
+# ------------------ CONFIG ------------------ #
+SOURCE          = "Data/gw_data.parquet"   # Player-GW fact table, joined with the star tables (star.py)
+AGGREGATES_DIR  = "Data/aggregates"
+STARTING_XI     = 11     # team_position 1-11 score, 12-15 are the bench
+
+AGGREGATE_COLUMNS = ["gw", "gw_points", "team_position", "manager_team_name", "position"]
+AGGREGATES = ["team_gw_points", "league_gw_points", "season_totals", "position_points"]
+INPUTS_NAME = "inputs.json"   # {input path: sha256} the stored aggregates were computed from
+
+
+# ------------------ BUILD ------------------ #
+def build_aggregates(starting_players: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Compute the dashboard aggregates from starting-XI rows.
+
+    Args:
+        starting_players: Owned rows with team_position <= 11 and AGGREGATE_COLUMNS.
+
+    Returns:
+        dict[str, pd.DataFrame]:
+            team_gw_points:   manager_team_name, gw, points (long team x GW table)
+            league_gw_points: gw, total_points, teams, avg_points
+            season_totals:    manager_team_name, total_points, gameweeks, avg_points
+            position_points:  manager_team_name, position, points
+    """
+    team_gw_points = (
+        starting_players.groupby(["manager_team_name", "gw"], observed=True)["gw_points"]
+        .sum()
+        .astype("int64")
+        .reset_index()
+        .rename(columns={"gw_points": "points"})
+    )
+
+    position_points = (
+        starting_players.groupby(["manager_team_name", "position"], observed=True)["gw_points"]
+        .sum()
+        .astype("int64")
+        .reset_index()
+        .rename(columns={"gw_points": "points"})
+    )
+
+    return {
+        "team_gw_points": team_gw_points,
+        **league_totals(team_gw_points),
+        "position_points": position_points,
+    }
+
+
+def league_totals(team_gw_points: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """league_gw_points and season_totals, derived from the team x GW points table."""
+    league_gw_points = (
+        team_gw_points.groupby("gw")
+        .agg(total_points=("points", "sum"), teams=("points", "size"))
+        .reset_index()
+    )
+    league_gw_points["avg_points"] = league_gw_points["total_points"] / league_gw_points["teams"]
+
+    season_totals = (
+        team_gw_points.groupby("manager_team_name", observed=True)
+        .agg(total_points=("points", "sum"), gameweeks=("gw", "nunique"))
+        .reset_index()
+        .sort_values("total_points", ascending=False)
+        .reset_index(drop=True)
+    )
+    season_totals["avg_points"] = season_totals["total_points"] / season_totals["gameweeks"]
+
+    return {"league_gw_points": league_gw_points, "season_totals": season_totals}
+
+
+def _add_points(table: pd.DataFrame, diff: pd.Series, keys: list[str]) -> pd.DataFrame:
+    """Add per-key point differences to a (keys..., points) table, keeping its dtypes."""
+    categorical = [key for key in keys if isinstance(table[key].dtype, pd.CategoricalDtype)]
+    points = table.astype({key: str for key in categorical}).set_index(keys)["points"]
+    table = points.add(diff, fill_value=0).astype("int64").rename("points").reset_index()
+    return table.astype({key: pd.CategoricalDtype(sorted(set(table[key]))) for key in categorical})
+
+
+def apply_point_changes(aggregates: dict[str, pd.DataFrame], changes: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Update the aggregates for changed starting-XI points without re-reading the GW data.
+
+    Args:
+        aggregates: Tables from build_aggregates (or the stored ones).
+        changes: Starting-XI rows with manager_team_name, gw, position and
+            points_diff (new minus stored gw_points).
+
+    Returns:
+        dict[str, pd.DataFrame]: New tables (the given ones are not modified).
+    """
+    if changes.empty:
+        return dict(aggregates)
+    changes = changes.astype({"manager_team_name": str, "position": str})
+    team_gw_points = _add_points(
+        aggregates["team_gw_points"], changes.groupby(["manager_team_name", "gw"])["points_diff"].sum(), ["manager_team_name", "gw"]
+    )
+    position_points = _add_points(
+        aggregates["position_points"], changes.groupby(["manager_team_name", "position"])["points_diff"].sum(), ["manager_team_name", "position"]
+    )
+    return {
+        "team_gw_points": team_gw_points,
+        **league_totals(team_gw_points),
+        "position_points": position_points,
+    }
+
+
+def load_starting_players(
+    source: str = SOURCE,
+    picks_path: str = PICKS_PATH,
+    player_dim_path: str = PLAYER_DIM_PATH,
+    manager_dim_path: str = MANAGER_DIM_PATH,
+) -> pd.DataFrame:
+    """Read the owned starting-XI rows of the merged GW data (AGGREGATE_COLUMNS only)."""
+    df = load_rows(
+        ds.dataset(source, format="parquet"),
+        owned_only=True,
+        columns=AGGREGATE_COLUMNS,
+        picks_path=picks_path,
+        player_dim_path=player_dim_path,
+        manager_dim_path=manager_dim_path,
+    )
+    return df[(df["team_position"] <= STARTING_XI).to_numpy(dtype=bool, na_value=False)].reset_index(drop=True)
+
+
+def aggregate_path(name: str, out_dir: str = AGGREGATES_DIR) -> str:
+    return os.path.join(out_dir, f"{name}.parquet")
+
+
+def read_aggregates(out_dir: str = AGGREGATES_DIR) -> dict[str, pd.DataFrame] | None:
+    """The stored aggregate tables, or None if any is missing."""
+    paths = {name: aggregate_path(name, out_dir) for name in AGGREGATES}
+    if not all(os.path.exists(path) for path in paths.values()):
+        return None
+    return {name: pd.read_parquet(path) for name, path in paths.items()}
+
+
+# ------------------ WRITE ------------------ #
+def write_aggregates(
+    source: str = SOURCE,
+    out_dir: str = AGGREGATES_DIR,
+    force: bool = False,
+    picks_path: str = PICKS_PATH,
+    player_dim_path: str = PLAYER_DIM_PATH,
+    manager_dim_path: str = MANAGER_DIM_PATH,
+) -> bool:
+    """
+    Materialize the dashboard aggregates of the merged GW data as small Parquet tables.
+
+    Skipped when every table exists and the fact table, the picks and the
+    dimensions they are computed from have the same content (SHA-256) as
+    when they were last written: the pipeline rewrites its inputs on every
+    run, so their mtimes say nothing.
+
+    Returns:
+        bool: True if the tables were (re)written.
+    """
+    if not os.path.exists(source):
+        logging.warning(f"{source} not found; no aggregates written.")
+        return False
+
+    paths = [aggregate_path(name, out_dir) for name in AGGREGATES]
+    inputs_path = os.path.join(out_dir, INPUTS_NAME)
+    hashes = {
+        path: file_sha256(path)
+        for path in (source, picks_path, player_dim_path, manager_dim_path)
+        if os.path.exists(path)
+    }
+    if not force and all(os.path.exists(p) for p in paths) and os.path.exists(inputs_path):
+        with open(inputs_path, encoding="utf-8") as f:
+            if json.load(f) == hashes:
+                logging.info(f"📊 Aggregates in {out_dir} already up to date")
+                return False
+
+    starting = load_starting_players(source, picks_path, player_dim_path, manager_dim_path)
+    save_aggregates(build_aggregates(starting), out_dir)
+    with open(inputs_path, "w", encoding="utf-8") as f:
+        json.dump(hashes, f, indent=2)
+    logging.info(f"📊 Wrote aggregates {AGGREGATES} into {out_dir}")
+    return True
+
+
+def save_aggregates(tables: dict[str, pd.DataFrame], out_dir: str = AGGREGATES_DIR):
+    """Write each table atomically (temporary file, then rename)."""
+    os.makedirs(out_dir, exist_ok=True)
+    for name, frame in tables.items():
+        tmp_path = f"{aggregate_path(name, out_dir)}.tmp"
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, aggregate_path(name, out_dir))
+        metrics.add_rows(aggregate_path(name, out_dir), len(frame))
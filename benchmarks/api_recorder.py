@@ -0,0 +1,179 @@
+"""
+Capture FPL Draft API responses into a fixture directory for api_stub.py.
+
+    # Record the real API for a league
+    python benchmarks/api_recorder.py --league 24636
+
+    # Offline: rebuild equivalent payloads from the committed Data/ files
+    python benchmarks/api_recorder.py --league 24636 --from-data
+
+Each response is stored as <fixtures>/<api path>.json, e.g.
+`league/24636/details.json` or `entry/115613/event/3.json`.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from star import PLAYER_RENAMES, STAT_COLUMNS, read_table  # noqa: E402
+from utils import BASE_URL, fetch_data  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "api")
+
+# Fields players.get_player_data drops by name; synthetic elements must carry them
+PLAYER_DROPPED_FIELDS = [
+    "influence_rank", "influence_rank_type", "creativity_rank", "creativity_rank_type",
+    "threat_rank", "threat_rank_type", "ict_index_rank", "ict_index_rank_type",
+    "form_rank", "form_rank_type", "points_per_game_rank", "points_per_game_rank_type",
+    "corners_and_indirect_freekicks_order", "corners_and_indirect_freekicks_text",
+    "direct_freekicks_order", "direct_freekicks_text", "penalties_order", "penalties_text",
+    "status", "points_per_game", "in_dreamteam", "ep_this", "ep_next", "dreamteam_count", "draft_rank",
+]
+
+# Player dimension column -> bootstrap-static element field (undoes star.player_column and
+# players.get_player_data's renames)
+ELEMENT_FIELDS = {
+    **{"season_" + column.removeprefix("gw_"): stat for stat, column in STAT_COLUMNS.items()},
+    **{column: name for name, column in PLAYER_RENAMES.items()},
+    "player_id": "id",
+    "position": "element_type",
+    "season_clean_sheets": "clean_sheets",
+    "season_goals_conceded": "goals_conceded",
+    "season_expected_goals": "expected_goals",
+    "season_expected_goals_conceded": "expected_goals_conceded",
+}
+
+
+def save_fixture(fixtures_dir: str, path: str, payload: dict):
+    """Write one payload under its API path."""
+    file_path = os.path.join(fixtures_dir, f"{path.strip('/')}.json")
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+
+def record(league_id: int, fixtures_dir: str = FIXTURES_DIR) -> int:
+    """
+    Record every endpoint the pipeline touches for one league.
+
+    Returns:
+        int: Number of payloads saved.
+    """
+    saved = 0
+
+    def grab(path: str) -> dict | None:
+        nonlocal saved
+        data = fetch_data(f"{BASE_URL}/{path}", use_cache=False)
+        if data is not None:
+            save_fixture(fixtures_dir, path, data)
+            saved += 1
+        return data
+
+    game = grab("game") or {}
+    grab("bootstrap-static")
+    league = grab(f"league/{league_id}/details") or {}
+
+    entries = [e["entry_id"] for e in league.get("league_entries", []) if e.get("entry_id")]
+    for gw in range(1, game.get("current_event", 0) + 1):
+        grab(f"event/{gw}/live")
+        for entry_id in entries:
+            grab(f"entry/{entry_id}/event/{gw}")
+
+    logging.info(f"📼 Recorded {saved} payloads into {fixtures_dir}")
+    return saved
+
+
+def record_from_data(league_id: int, fixtures_dir: str = FIXTURES_DIR, data_dir: str = "Data") -> int:
+    """
+    Rebuild API-shaped payloads from the pipeline's own outputs (no network).
+
+    Live stats come from the fact table (gw_data.parquet), picks from
+    gw_picks.parquet and the players and league entries from the player and
+    manager dimensions (manager names from league_standings.csv), see star.py.
+
+    Returns:
+        int: Number of payloads saved.
+    """
+    facts = read_table(os.path.join(data_dir, "gw_data.parquet"))
+    picks = read_table(os.path.join(data_dir, "gw_picks.parquet"))
+    players = read_table(os.path.join(data_dir, "dim_players.parquet"))
+    managers = read_table(os.path.join(data_dir, "dim_managers.parquet"))
+    standings = pd.read_csv(os.path.join(data_dir, "league_standings.csv"), encoding="utf-8-sig")
+    current_gw = int(facts["gw"].max())
+    saved = 0
+
+    def put(path: str, payload: dict):
+        nonlocal saved
+        save_fixture(fixtures_dir, path, payload)
+        saved += 1
+
+    put("game", {"current_event": current_gw, "current_event_finished": True})
+
+    # bootstrap-static: undo players.get_player_data's renames and mappings
+    team_ids = {
+        "Arsenal": 1, "Aston Villa": 2, "Burnley": 3, "Bournemouth": 4, "Brentford": 5, "Brighton": 6,
+        "Chelsea": 7, "Crystal Palace": 8, "Everton": 9, "Fulham": 10, "Leeds United": 11, "Liverpool": 12,
+        "Manchester City": 13, "Manchester United": 14, "Newcastle United": 15, "Nottingham Forest": 16,
+        "Sunderland": 17, "Tottenham": 18, "West Ham": 19, "Wolverhampton": 20,
+    }
+    element_types = {"GK": 1, "DEF": 2, "MID": 3, "FWD": 4}
+    elements = players.rename(columns=ELEMENT_FIELDS)
+    elements = elements.astype({column: object for column in elements.select_dtypes("category").columns})
+    elements["team"] = elements["team"].map(team_ids)
+    elements["element_type"] = elements["element_type"].map(element_types)
+    names = elements.pop("name").fillna("").str.split(" ", n=1, expand=True)
+    elements["first_name"] = names[0]
+    elements["second_name"] = names[1].fillna("") if 1 in names else ""
+    for field in PLAYER_DROPPED_FIELDS:
+        elements[field] = None
+    events = [{"id": gw, "name": f"Gameweek {gw}", "finished": True, "data_checked": True} for gw in range(1, 39)]
+    for event in events:
+        event["finished"] = event["data_checked"] = event["id"] <= current_gw
+    put("bootstrap-static", {
+        "elements": json.loads(elements.to_json(orient="records")),
+        "events": {"current": current_gw, "data": events},
+    })
+
+    entries = managers.merge(standings.drop(columns="team_name"), on="manager_id", how="left")
+    put(f"league/{league_id}/details", {"league_entries": [
+        {
+            "entry_id": int(row.manager_id), "id": int(row.id), "player_first_name": row.first_name,
+            "player_last_name": row.last_name, "short_name": row.short_name,
+            "waiver_pick": int(row.waiver_pick), "entry_name": row.manager_team_name,
+        }
+        for row in entries.itertuples()
+    ]})
+
+    live_stats = {column: stat for stat, column in STAT_COLUMNS.items()}
+    for gw, df in facts.groupby("gw", sort=True):
+        stats = df[list(live_stats)].rename(columns=live_stats)
+        put(f"event/{gw}/live", {"elements": {
+            str(pid): {"stats": row, "explain": []}
+            for pid, row in zip(df["player_id"], json.loads(stats.to_json(orient="records")))
+        }})
+
+    for (gw, manager_id), squad in picks.groupby(["gw", "manager_id"], sort=True):
+        put(f"entry/{int(manager_id)}/event/{gw}", {"picks": [
+            {"element": int(e), "position": int(p)}
+            for e, p in sorted(zip(squad["player_id"], squad["team_position"]), key=lambda x: x[1])
+        ]})
+
+    logging.info(f"📼 Rebuilt {saved} payloads from {data_dir} into {fixtures_dir}")
+    return saved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--league", type=int, required=True, help="Draft league ID.")
+    parser.add_argument("--out", default=FIXTURES_DIR, help="Fixture directory.")
+    parser.add_argument("--from-data", action="store_true", help="Rebuild payloads from Data/ instead of the API.")
+    args = parser.parse_args()
+
+    if args.from_data:
+        record_from_data(args.league, args.out)
+    else:
+        record(args.league, args.out)
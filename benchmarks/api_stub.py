@@ -0,0 +1,177 @@
+"""
+Local stub of the FPL Draft API that replays recorded fixtures.
+
+Serves <fixtures>/<api path>.json under /api/, with optional latency, error
+injection and synthetic scale-up (more managers and gameweeks than were
+recorded, cloned from the recorded ones).
+
+    python benchmarks/api_stub.py --port 8765 --managers 500 --gameweeks 38 --latency 0.05
+    FPL_BASE_URL=http://127.0.0.1:8765/api python main.py
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "api")
+SYNTHETIC_ID_OFFSET = 10_000_000
+
+
+class StubAPI:
+    """Fixture store plus the scale-up rules that map synthetic IDs onto recorded ones."""
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, managers: int | None = None, gameweeks: int | None = None,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+        self.game = self._load("game")
+        self.recorded_gws = sorted(
+            int(f.split(".")[0]) for f in os.listdir(os.path.join(fixtures_dir, "event"))
+        )
+        self.gameweeks = gameweeks or self.game["current_event"]
+
+        self.leagues = {}
+        league_root = os.path.join(fixtures_dir, "league")
+        for league_id in os.listdir(league_root):
+            self.leagues[league_id] = self._scale_league(self._load(f"league/{league_id}/details"), managers)
+
+        # Synthetic entry ID -> recorded entry ID
+        self.entry_alias = {}
+        for league in self.leagues.values():
+            for entry in league["league_entries"]:
+                self.entry_alias[entry["entry_id"]] = entry.pop("_source_entry", entry["entry_id"])
+
+    def _load(self, path: str) -> dict:
+        with open(os.path.join(self.fixtures_dir, f"{path}.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _scale_league(league: dict, managers: int | None) -> dict:
+        entries = league["league_entries"]
+        if not managers or managers <= len(entries):
+            return {**league, "league_entries": entries[: managers or len(entries)]}
+        scaled = list(entries)
+        for i in range(len(entries), managers):
+            src = entries[i % len(entries)]
+            scaled.append({
+                **src,
+                "entry_id": src["entry_id"] + SYNTHETIC_ID_OFFSET * (i // len(entries)),
+                "id": src["id"] + SYNTHETIC_ID_OFFSET * (i // len(entries)),
+                "entry_name": f"{src['entry_name']} #{i}",
+                "_source_entry": src["entry_id"],
+            })
+        return {**league, "league_entries": scaled}
+
+    def _recorded_gw(self, gw: int) -> int:
+        return self.recorded_gws[(gw - 1) % len(self.recorded_gws)]
+
+    def resolve(self, path: str) -> dict | None:
+        """Return the payload for an API path (without the /api prefix), or None."""
+        path = path.split("?", 1)[0].strip("/")
+        if path == "game":
+            return {**self.game, "current_event": self.gameweeks}
+        if path == "bootstrap-static":
+            data = self._load("bootstrap-static")
+            events = data.get("events", {})
+            if isinstance(events, dict) and self.gameweeks > len(self.recorded_gws):
+                template = events["data"][0]
+                events["data"] = [
+                    {**template, "id": gw, "name": f"Gameweek {gw}",
+                     "finished": gw < self.gameweeks, "data_checked": gw < self.gameweeks}
+                    for gw in range(1, max(38, self.gameweeks) + 1)
+                ]
+                events["current"] = self.gameweeks
+            return data
+        match = re.fullmatch(r"league/(\d+)/details", path)
+        if match:
+            return self.leagues.get(match.group(1))
+        match = re.fullmatch(r"event/(\d+)/live", path)
+        if match and 1 <= int(match.group(1)) <= self.gameweeks:
+            return self._load(f"event/{self._recorded_gw(int(match.group(1)))}/live")
+        match = re.fullmatch(r"entry/(\d+)/event/(\d+)", path)
+        if match and 1 <= int(match.group(2)) <= self.gameweeks:
+            entry = self.entry_alias.get(int(match.group(1)), int(match.group(1)))
+            file_path = f"entry/{entry}/event/{self._recorded_gw(int(match.group(2)))}"
+            if os.path.exists(os.path.join(self.fixtures_dir, f"{file_path}.json")):
+                return self._load(file_path)
+        return None
+
+    def family(self, path: str) -> str:
+        parts = [p for p in path.split("?", 1)[0].strip("/").split("/") if p and not p.isdigit()]
+        return "/".join(parts) or "root"
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not self.path.startswith("/api/"):
+                    self.send_error(404)
+                    return
+                path = re.sub(r"/{2,}", "/", self.path[len("/api/"):])
+                with api._lock:
+                    api.requests[api.family(path)] += 1
+                    fail = api.random.random() < api.error_rate
+                    delay = api.latency + api.random.uniform(0, api.jitter)
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    self.send_error(503)
+                    return
+                payload = api.resolve(path)
+                if payload is None:
+                    self.send_error(404)
+                    return
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with api._lock:
+                    api.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def start_stub(api: StubAPI, host: str = "127.0.0.1", port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Serve the stub in a background thread; return the server and its base URL."""
+    server = ThreadingHTTPServer((host, port), api.handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/api"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--managers", type=int, help="Scale every league up to N managers.")
+    parser.add_argument("--gameweeks", type=int, help="Report N gameweeks (recorded ones are cycled).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency (0..jitter seconds).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    args = parser.parse_args()
+
+    stub = StubAPI(args.fixtures, args.managers, args.gameweeks, args.latency, args.jitter, args.error_rate)
+    server, base_url = start_stub(stub, port=args.port)
+    print(f"Serving {args.fixtures} at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,226 @@
+"""
+Dashboard benchmark on synthetic league data, compared against a stored baseline.
+
+Generates a Data/ folder at the requested scale (synthetic_data.py), then
+times every data_utils / aggregates / data_store helper, the visuals_utils
+sections and each Streamlit page (run headless with AppTest), reporting the
+best wall time of --repeat runs and the traced peak memory of one more run.
+
+Results are compared with the entry for the same scale in the baseline file;
+cases slower (or heavier) than --tolerance x baseline are flagged, and
+--check turns flags into a non-zero exit status.
+
+    python benchmarks/bench_dashboard.py                                   # 7 managers, 38 GWs
+    python benchmarks/bench_dashboard.py --managers 200 --players 3000 --seasons 2
+    python benchmarks/bench_dashboard.py --managers 200 --players 3000 --save-baseline
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import SEASON_GWS, generate  # noqa: E402
+
+BASELINE      = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "bench_dashboard.json")
+PAGES         = ["Overall.py", "Managers.py", "Current Gameweek.py", "Players Data.py", "Fixtures.py"]
+MIN_SECONDS   = 0.005   # Differences below this are noise, never regressions
+MIN_MIB       = 1.0
+
+
+def scale_key(args) -> str:
+    return f"{args.managers}m-{args.gameweeks}gw-{args.players}p-{args.seasons}s"
+
+
+def build_cases(data_dir: str) -> list[tuple[str, callable]]:
+    """(name, zero-argument callable) for every benchmarked function and page."""
+    from streamlit.testing.v1 import AppTest
+
+    import data_utils as du
+    import visuals_utils as vu
+    from aggregates import build_aggregates
+    from data_store import DataStore
+
+    paths = dict(
+        gw_data_path=os.path.join(data_dir, "gw_data.parquet"),
+        dataset_path=os.path.join(data_dir, "gw_dataset"),
+        aggregates_dir=os.path.join(data_dir, "aggregates"),
+        standings_path=os.path.join(data_dir, "league_standings.csv"),
+        gameweeks_path=os.path.join(data_dir, "gameweeks.csv"),
+        fixtures_path=os.path.join(data_dir, "fixtures.csv"),
+        players_path=os.path.join(data_dir, "players_data.parquet"),
+        fixtures_by_team_path=os.path.join(data_dir, "fixtures_by_team.csv"),
+        picks_path=os.path.join(data_dir, "gw_picks.parquet"),
+        player_dim_path=os.path.join(data_dir, "dim_players.parquet"),
+        manager_dim_path=os.path.join(data_dir, "dim_managers.parquet"),
+    )
+    # Streamlit calls outside `streamlit run` log a warning each; keep the output readable
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    store = DataStore(**paths)
+    vu.get_store = lambda: store   # visuals_utils reads the aggregates through the shared store
+
+    df = du.load_gameweeks(   # wide rows the data_utils helpers take
+        dataset_path=paths["dataset_path"], gw_data_path=paths["gw_data_path"], picks_path=paths["picks_path"],
+        player_dim_path=paths["player_dim_path"], manager_dim_path=paths["manager_dim_path"])
+    starting = du.get_starting_lineup(df)
+    team_gw_points = du.calculate_team_gw_points(starting)
+    aggregates = store.aggregates()
+    manager = sorted(aggregates["season_totals"]["manager_team_name"].astype(str))[0]
+    manager_df = store.manager_data(manager)
+    manager_points = vu.display_performance_trend(manager)
+    top = du.get_top_performers(manager_df)
+    latest_gw = max(store.gameweeks())
+
+    def fresh(name, func):
+        """Drop one cached table so the store rebuilds it."""
+        def run():
+            store._tables.pop(name, None)
+            return func()
+        return run
+
+    def page(script):
+        def run():
+            at = AppTest.from_file(os.path.join(ROOT, "pages", script), default_timeout=300)
+            at.session_state["manager"] = manager
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"{script}: {at.exception[0].value}")
+        return run
+
+    cases = [
+        ("data_utils.load_gameweeks",          lambda: du.load_gameweeks(
+            dataset_path=paths["dataset_path"], gw_data_path=paths["gw_data_path"], picks_path=paths["picks_path"],
+            player_dim_path=paths["player_dim_path"], manager_dim_path=paths["manager_dim_path"])),
+        ("data_utils.get_starting_lineup",     lambda: du.get_starting_lineup(df)),
+        ("data_utils.calculate_team_gw_points", lambda: du.calculate_team_gw_points(starting)),
+        ("data_utils.get_teams_avg_points",    lambda: du.get_teams_avg_points(team_gw_points)),
+        ("data_utils.get_top_performers",      lambda: du.get_top_performers(manager_df)),
+        ("data_utils.get_player_progression",  lambda: du.get_player_progression(manager_df)),
+        ("aggregates.build_aggregates",        lambda: build_aggregates(starting)),
+        ("data_utils.load_aggregates",         lambda: du.load_aggregates(paths["aggregates_dir"])),
+        ("data_utils.get_team_gw_points_table", lambda: du.get_team_gw_points_table(aggregates)),
+        ("data_utils.get_league_average",      lambda: du.get_league_average(aggregates, exclude=manager)),
+        ("data_utils.get_season_totals",       lambda: du.get_season_totals(aggregates)),
+        ("data_utils.get_position_points",     lambda: du.get_position_points(aggregates, manager)),
+        ("data_store.view(current_gameweek)",  lambda: store.view("current_gameweek", gw_range=(latest_gw, latest_gw))),
+        ("data_store.manager_slices",          fresh("manager_slices", store.manager_slices)),
+        ("data_store.fixture_lookup",          fresh("fixture_lookup", store.fixture_lookup)),
+        ("visuals_utils.display_overview",     lambda: vu.display_overview(manager)),
+        ("visuals_utils.display_performance_trend", lambda: vu.display_performance_trend(manager)),
+        ("visuals_utils.display_latest_gw",    lambda: vu.display_latest_gw(manager_df)),
+        ("visuals_utils.display_top_performers", lambda: vu.display_top_performers(manager_df)),
+        ("visuals_utils.display_player_progression", lambda: vu.display_player_progression(manager_df)),
+        ("visuals_utils.display_other_stats",  lambda: vu.display_other_stats(manager_points, top)),
+    ]
+    cases += [(f"page: {script[:-3]}", page(script)) for script in PAGES]
+    return cases
+
+
+def measure(func, repeat: int) -> dict:
+    """Best wall time of `repeat` runs, then the traced peak memory of one more."""
+    func()  # warm-up (imports, first-use caches)
+    seconds = min(_timed(func) for _ in range(repeat))
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 5), "peak_mib": round(peak / 2**20, 2)}
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Names of the cases slower or heavier than tolerance x baseline."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        slower = r["seconds"] > base["seconds"] * tolerance and r["seconds"] - base["seconds"] > MIN_SECONDS
+        heavier = r["peak_mib"] > base["peak_mib"] * tolerance and r["peak_mib"] - base["peak_mib"] > MIN_MIB
+        if slower or heavier:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--managers", type=int, default=7)
+    parser.add_argument("--gameweeks", type=int, default=SEASON_GWS, help="GWs per season.")
+    parser.add_argument("--players", type=int, default=750)
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept).")
+    parser.add_argument("--only", help="Run only the cases whose name contains this text.")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Flag cases above this multiple of the baseline.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline for this scale.")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if any case regressed.")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data_dir = os.path.join(workdir, "Data")
+        start = time.perf_counter()
+        scale = generate(data_dir, args.managers, args.gameweeks, args.players, args.seasons, args.seed)
+        print(f"Generated {scale['rows']:,} rows ({scale['managers']} managers, {scale['gameweeks']} GWs, "
+              f"{scale['players']} players) in {time.perf_counter() - start:.1f}s")
+
+        # Pages read Data/ and assets/ relative to the working directory
+        os.symlink(os.path.join(ROOT, "assets"), os.path.join(workdir, "assets"))
+        os.chdir(workdir)
+        results = {}
+        for name, func in build_cases(data_dir):
+            if args.only and args.only not in name:
+                continue
+            results[name] = measure(func, args.repeat)
+        os.chdir(ROOT)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+    key = scale_key(args)
+    baseline = baselines.get(key, {}).get("results", {})
+    regressions = compare(results, baseline, args.tolerance)
+
+    print(f"\nScale {key}, best of {args.repeat}" + ("" if baseline else " (no baseline for this scale)"))
+    print(f"{'case':<46}{'ms':>10}{'peak MiB':>10}{'base ms':>10}{'ratio':>8}")
+    for name, r in results.items():
+        base = baseline.get(name)
+        ratio = f"{r['seconds'] / base['seconds']:.2f}" if base and base["seconds"] else ""
+        base_ms = f"{base['seconds'] * 1000:.1f}" if base else ""
+        flag = "  << REGRESSION" if name in regressions else ""
+        print(f"{name:<46}{r['seconds'] * 1000:>10.1f}{r['peak_mib']:>10.1f}{base_ms:>10}{ratio:>8}{flag}")
+
+    if args.save_baseline:
+        merged = {**baseline, **results} if args.only else results
+        baselines[key] = {"scale": scale, "results": merged}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline for {key} to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.tolerance}x baseline: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Wall-clock comparison of serial vs process-pool gameweek builds.
+
+Replays the stored Data/gameweeks_parquet files as pre-fetched inputs (no
+API calls) and times final.process_gameweeks in both modes. Use --repeat to
+simulate a longer season by cloning the stored gameweeks.
+
+    python benchmarks/bench_gameweek_builds.py --repeat 3 --processes 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import final  # noqa: E402
+from star import STAT_COLUMNS  # noqa: E402
+
+
+def load_inputs(repeat: int = 1) -> dict[int, tuple[pd.DataFrame, pd.DataFrame]]:
+    """Rebuild (gw_stats, picks_df) pairs from the stored gameweek files (either layout)."""
+    files = sorted(f for f in os.listdir(final.GW_FOLDER) if f.startswith("gw_data_gw"))
+    stats = {column: stat for stat, column in STAT_COLUMNS.items()}
+    inputs, gw = {}, 0
+    for _ in range(repeat):
+        for f in files:
+            gw += 1
+            df = final.rename_columns(pd.read_parquet(os.path.join(final.GW_FOLDER, f)))
+            gw_stats = df[["player_id", *[c for c in stats if c in df.columns]]].rename(columns={"player_id": "id", **stats})
+            gw_stats["gameweek"] = gw
+
+            owned = df[df["manager_id"].notna()]
+            picks_df = pd.DataFrame({
+                "player_id": owned["player_id"],
+                "manager_id": owned["manager_id"].astype(int),
+                "gw": gw,
+                "team_position": owned["team_position"].astype(int),
+            })
+            inputs[gw] = (gw_stats, picks_df)
+    return inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1, help="Clone the stored season N times.")
+    parser.add_argument("--processes", type=int, default=final.MAX_PROCESSES)
+    args = parser.parse_args()
+
+    inputs = load_inputs(args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        final.GW_FOLDER = tmp
+        for label, processes in (("serial", 1), (f"parallel x{args.processes}", args.processes)):
+            start = time.perf_counter()
+            rows, failures = final.process_gameweeks(inputs, processes=processes)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<14} {len(inputs):>3} GWs  {sum(rows.values()):>7} rows  {elapsed:6.2f}s  failures={len(failures)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Decoding of event/{gw}/live payloads: the former row-dict loop of
+utils.get_player_gw_data versus the columnar live_decoder.
+
+The payload is a recorded fixture (benchmarks/fixtures/api/event/N/live.json,
+see api_recorder.py). Decoding alone is timed on the parsed payload; the
+"fetch +" cases replay it through api_stub.py over HTTP, as the pipeline
+fetches it (HTTP cache disabled). Fixtures rebuilt with --from-data carry
+no "explain" breakdown; --explain adds one derived from the stats, and
+--scale (up to 32) repeats the players to mimic larger payloads.
+
+    python benchmarks/bench_live_decode.py
+    python benchmarks/bench_live_decode.py --gw 12 --explain --scale 20 --repeat 20
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("FPL_HTTP_CACHE", "0")
+
+import pandas as pd  # noqa: E402
+
+from api_stub import FIXTURES_DIR, StubAPI, start_stub  # noqa: E402
+
+# Stats that score in the explain breakdown
+EXPLAIN_STATS = ["minutes", "goals_scored", "assists", "clean_sheets", "goals_conceded", "saves", "bonus",
+                 "yellow_cards", "red_cards", "defensive_contribution"]
+
+
+def legacy_decode(data: dict, gameweek: int) -> pd.DataFrame:
+    """utils.get_player_gw_data before live_decoder: one dict per player, then pd.DataFrame."""
+    records = []
+    for player_id, value in data["elements"].items():
+        stats = dict(value.get("stats", {}))
+        stats["id"] = int(player_id)
+        stats["gameweek"] = int(gameweek)
+        records.append(stats)
+    return pd.DataFrame(records)
+
+
+def scaled_payload(data: dict, scale: int, explain: bool) -> dict:
+    """Repeat the players `scale` times (new IDs) and optionally add an explain breakdown."""
+    elements = {}
+    for copy_index in range(scale):
+        for player_id, element in data["elements"].items():
+            element = copy.deepcopy(element)
+            if explain:
+                stats = element["stats"]
+                element["explain"] = [{
+                    "fixture": 1 + int(player_id) % 10,
+                    "stats": [
+                        {"identifier": name, "value": stats[name], "points": 1}
+                        for name in EXPLAIN_STATS if stats.get(name)
+                    ],
+                }]
+            elements[str(int(player_id) + copy_index * 1_000)] = element   # IDs stay within int16
+    return {**data, "elements": elements}
+
+
+def measure(func, repeat: int) -> dict:
+    """Best wall time of `repeat` runs, then the traced peak memory of one more."""
+    func()
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(seconds), "peak_mib": peak / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gw", type=int, help="Recorded gameweek to decode (latest by default).")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the players this many times.")
+    parser.add_argument("--explain", action="store_true", help="Add an explain breakdown to every player.")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per case (best is kept).")
+    args = parser.parse_args()
+
+    stub = StubAPI()
+    gw = args.gw or max(stub.recorded_gws)
+    with open(os.path.join(FIXTURES_DIR, "event", str(gw), "live.json"), encoding="utf-8") as f:
+        data = scaled_payload(json.load(f), args.scale, args.explain)
+
+    # Serve the (scaled) payload through the stub, so fetches go over local HTTP
+    resolve = stub.resolve
+    stub.resolve = lambda path: data if path.strip("/") == f"event/{gw}/live" else resolve(path)
+    server, base_url = start_stub(stub)
+
+    import rate_limit
+    rate_limit.rate_limiter.rate = rate_limit.rate_limiter.max_rate = 10_000
+    from live_decoder import decode_explain, decode_live
+    from utils import fetch_data, get_player_gw_data
+
+    url = f"{base_url}/event/{gw}/live"
+    cases = [
+        ("row dicts -> DataFrame (before)", lambda: legacy_decode(data, gw)),
+        ("decode_live -> Arrow",            lambda: decode_live(data, gw)),
+        ("decode_live -> DataFrame",        lambda: decode_live(data, gw).to_pandas()),
+        ("decode_explain -> Arrow",         lambda: decode_explain(data, gw)),
+        ("fetch + row dicts (before)",      lambda: legacy_decode(fetch_data(url, use_cache=False), gw)),
+        ("fetch + get_player_gw_data",      lambda: get_player_gw_data(gw, base_url=base_url)),
+    ]
+
+    before, after = legacy_decode(data, gw), decode_live(data, gw).to_pandas()
+    mismatched = [
+        c for c in after.columns
+        if not (before[c].astype(float) - after[c].astype(float)).abs().lt(1e-4).all()
+    ]
+
+    explain_rows = decode_explain(data, gw).num_rows
+    print(f"GW{gw}: {len(data['elements'])} players, {explain_rows} explain rows, best of {args.repeat}")
+    print(f"{'case':<34}{'ms':>10}{'peak MiB':>10}{'MiB out':>10}")
+    for name, func in cases:
+        result = measure(func, args.repeat)
+        output = func()
+        size = output.nbytes if hasattr(output, "nbytes") else output.memory_usage(deep=True).sum()
+        print(f"{name:<34}{result['seconds'] * 1000:>10.2f}{result['peak_mib']:>10.2f}{size / 2**20:>10.2f}")
+    print("Decoded columns match the row-dict frame" if not mismatched else f"Mismatched columns: {mismatched}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+End-to-end pipeline benchmark against the local API stub.
+
+Starts api_stub.py in-process, points the pipeline at it via FPL_BASE_URL and
+runs main.run_pipeline's stages in a scratch directory, reporting wall time,
+request counts per endpoint family and peak memory for each stage.
+
+    python benchmarks/api_recorder.py --league 24636 --from-data
+    python benchmarks/bench_pipeline.py --managers 500 --gameweeks 38 --latency 0.02 --max-rate 500
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_stub import FIXTURES_DIR, StubAPI, start_stub  # noqa: E402
+
+
+def run_stage(name: str, stub: StubAPI, func, *args, **kwargs) -> dict:
+    """Run one pipeline stage and measure it."""
+    before = stub.requests.copy()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    requests = stub.requests - before
+    return {"stage": name, "seconds": elapsed, "requests": sum(requests.values()),
+            "by_family": dict(requests), "peak_mib": peak / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--managers", type=int)
+    parser.add_argument("--gameweeks", type=int)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--runs", type=int, default=1, help="Repeat final.main to measure incremental runs.")
+    parser.add_argument("--cache", action="store_true", help="Keep the on-disk HTTP cache enabled.")
+    parser.add_argument("--parallel", action="store_true", help="Build gameweeks across a process pool.")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent picks requests.")
+    parser.add_argument("--max-rate", type=float, help="Raise the client rate limiter ceiling (req/s).")
+    args = parser.parse_args()
+
+    stub = StubAPI(args.fixtures, args.managers, args.gameweeks, args.latency, error_rate=args.error_rate)
+    server, base_url = start_stub(stub)
+    os.environ["FPL_BASE_URL"] = base_url
+    if not args.cache:
+        os.environ["FPL_HTTP_CACHE"] = "0"
+
+    # Import after FPL_BASE_URL is set: the modules build their URLs at import time
+    import final
+    import rate_limit
+    from league import get_league_standings
+    from players import get_player_data
+
+    if args.max_rate:
+        rate_limit.rate_limiter.rate = rate_limit.rate_limiter.max_rate = args.max_rate
+        rate_limit.rate_limiter.capacity = max(rate_limit.BURST, int(args.max_rate))
+
+    league_id = next(iter(stub.leagues))
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.makedirs("Data", exist_ok=True)
+        results.append(run_stage("league_standings", stub, get_league_standings, league_id, "Data/league_standings.csv"))
+        results.append(run_stage("player_data", stub, get_player_data, "Data/players_data.parquet"))
+        for run in range(1, args.runs + 1):
+            results.append(run_stage(f"final.main #{run}", stub, final.main,
+                                     max_workers=args.workers, parallel=args.parallel))
+        os.chdir(ROOT)
+    server.shutdown()
+
+    managers = len(stub.leagues[league_id]["league_entries"])
+    print(f"\nLeague {league_id}: {managers} managers, {stub.gameweeks} GWs, latency {args.latency}s, "
+          f"error rate {args.error_rate:.0%}")
+    print(f"{'stage':<20}{'seconds':>10}{'requests':>10}{'peak MiB':>10}")
+    for r in results:
+        print(f"{r['stage']:<20}{r['seconds']:>10.2f}{r['requests']:>10}{r['peak_mib']:>10.1f}")
+    print(f"{'total':<20}{sum(r['seconds'] for r in results):>10.2f}{sum(r['requests'] for r in results):>10}")
+    print(f"Process peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB, "
+          f"{stub.bytes_sent / 2**20:.1f} MiB served")
+    for r in results:
+        print(f"  {r['stage']}: {r['by_family']}")
+
+
+if __name__ == "__main__":
+    main()
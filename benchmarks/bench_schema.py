@@ -0,0 +1,78 @@
+"""
+File size and in-memory footprint of the merged gameweek table, with the
+inferred (object / int64 / float64) types versus the declared compact types
+from schema.py.
+
+    python benchmarks/bench_schema.py                  # uses Data/gameweeks_parquet
+    python benchmarks/bench_schema.py --gw-folder /tmp/e2e/Data/gameweeks_parquet
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from schema import enforce, to_pandas  # noqa: E402
+
+
+def load_inferred(gw_folder: str) -> pa.Table:
+    """Merge the per-GW files the way the pipeline did before the declared schema."""
+    from final import rename_columns
+
+    files = sorted(f for f in os.listdir(gw_folder) if f.startswith("gw_data_gw") and f.endswith(".parquet"))
+    tables = [
+        pa.Table.from_pandas(rename_columns(pd.read_parquet(os.path.join(gw_folder, f))), preserve_index=False)
+        for f in files
+    ]
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def measure(name: str, table: pa.Table, frame, workdir: str) -> dict:
+    """Write one variant, read it back and measure it."""
+    path = os.path.join(workdir, f"{name}.parquet")
+    with pq.ParquetWriter(path, table.schema) as writer:  # one row group per GW, as final.merge_all_gameweeks
+        for gw in sorted(pc.unique(table["gw"]).to_pylist()):
+            rows = table.filter(pc.equal(table["gw"], gw))
+            writer.write_table(rows, row_group_size=rows.num_rows)
+    start = time.perf_counter()
+    df = frame(pq.read_table(path))
+    read_seconds = time.perf_counter() - start
+    return {
+        "variant": name,
+        "file_mib": os.path.getsize(path) / 2**20,
+        "memory_mib": df.memory_usage(deep=True).sum() / 2**20,
+        "read_seconds": read_seconds,
+        "rows": len(df),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gw-folder", default=os.path.join(ROOT, "Data", "gameweeks_parquet"))
+    args = parser.parse_args()
+
+    inferred = load_inferred(args.gw_folder)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [
+            measure("inferred", inferred, lambda t: t.to_pandas(), workdir),
+            measure("declared", enforce(inferred), to_pandas, workdir),
+        ]
+
+    print(f"{'variant':<12}{'rows':>8}{'file MiB':>10}{'pandas MiB':>12}{'read s':>8}")
+    for r in results:
+        print(f"{r['variant']:<12}{r['rows']:>8}{r['file_mib']:>10.2f}{r['memory_mib']:>12.2f}{r['read_seconds']:>8.3f}")
+    before, after = results
+    print(f"file size x{before['file_mib'] / after['file_mib']:.2f} smaller, "
+          f"in-memory x{before['memory_mib'] / after['memory_mib']:.2f} smaller")
+
+
+if __name__ == "__main__":
+    main()
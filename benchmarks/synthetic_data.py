@@ -0,0 +1,182 @@
+"""
+Synthetic league data in the pipeline's output format, at any scale.
+
+Writes a Data/ folder the dashboard can read: the star-schema tables
+(gw_data.parquet fact table and gw_picks.parquet with one row group per GW,
+as final.merge_all_gameweeks writes them, and the player / manager
+dimensions, see star.py), the aggregate tables, league_standings.csv and
+players_data.parquet. gameweeks.csv and fixtures.csv are copied from the
+repository's Data/ folder.
+
+Every GW has one row per player; each manager owns 15 players (squad
+positions 1-15). Extra seasons continue the GW numbering (with 38 GWs,
+season 2 starts at GW 39) and reshuffle the squads.
+
+    python benchmarks/synthetic_data.py --out /tmp/synthetic --managers 200 --gameweeks 38 --players 3000
+"""
+import argparse
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aggregates import write_aggregates  # noqa: E402
+from fixture_index import TEAM_NAMES  # noqa: E402
+from players import conform_players  # noqa: E402
+from scoring import SCORING_COLUMNS, defensive_points  # noqa: E402
+from star import FACT_SCHEMA, PICKS_SCHEMA, write_dimensions  # noqa: E402
+
+REFERENCE     = ["gameweeks.csv", "fixtures.csv"]
+SQUAD_SIZE    = 15
+SEASON_GWS    = 38
+POSITIONS     = np.array(["GK", "DEF", "MID", "FWD"])
+POSITION_MIX  = [0.1, 0.35, 0.4, 0.15]
+
+# Value ranges of the columns not generated explicitly, by Arrow type
+RANGES = {pa.int8(): 5, pa.int16(): 300, pa.int32(): 100_000}
+
+
+def make_players(players: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Player dimension: ID, names, position and real team."""
+    ids = np.arange(1, players + 1)
+    return pd.DataFrame({
+        "player_id":  ids,
+        "full_name":  [f"Player {i}" for i in ids],
+        "short_name": [f"P{i}" for i in ids],
+        "position":   rng.choice(POSITIONS, size=players, p=POSITION_MIX),
+        "real_team":  np.array(list(TEAM_NAMES.values()))[(ids - 1) % len(TEAM_NAMES)],
+        "code":       100_000 + ids,
+    })
+
+
+def make_gameweek(gw: int, players_df: pd.DataFrame, squads: np.ndarray, managers: pd.DataFrame,
+                  rng: np.random.Generator) -> tuple[pa.Table, pa.Table]:
+    """One GW of fact rows (every player) and picks (each manager's squad positions)."""
+    n = len(players_df)
+    columns = {}
+    for field in FACT_SCHEMA:
+        if field.name in SCORING_COLUMNS:
+            continue
+        if pa.types.is_integer(field.type):
+            columns[field.name] = rng.integers(0, RANGES.get(field.type, 100), size=n)
+        elif pa.types.is_floating(field.type):
+            columns[field.name] = rng.random(n) * 10
+        elif pa.types.is_boolean(field.type):
+            columns[field.name] = rng.random(n) < 0.05
+        else:
+            columns[field.name] = None
+    df = pd.DataFrame(columns, index=range(n))
+
+    minutes = rng.choice([0, 30, 90], size=n, p=[0.4, 0.2, 0.4])
+    df["gw"] = gw
+    df["gw_minutes"] = minutes
+    df["gw_points"] = np.where(minutes > 0, rng.poisson(2.5, size=n) + (minutes >= 60), 0)
+    df["gw_defensive_contribution"] = np.where(minutes > 0, rng.integers(0, 18, size=n), 0)
+    df["player_id"] = players_df["player_id"].to_numpy()
+    df = df.assign(**defensive_points(players_df["position"], df["gw_defensive_contribution"]))
+
+    # squads[m, k] = row of the player in squad position k + 1 of manager m
+    picks = pd.DataFrame({
+        "gw": gw,
+        "player_id": players_df["player_id"].to_numpy()[squads.ravel()],
+        "manager_id": np.repeat(managers["manager_id"].to_numpy(), SQUAD_SIZE),
+        "team_position": np.tile(np.arange(1, SQUAD_SIZE + 1), len(managers)),
+    })
+    return (
+        pa.Table.from_pandas(df[FACT_SCHEMA.names], preserve_index=False).cast(FACT_SCHEMA),
+        pa.Table.from_pandas(picks, preserve_index=False).cast(PICKS_SCHEMA),
+    )
+
+
+def generate(out_dir: str, managers: int = 7, gameweeks: int = SEASON_GWS, players: int = 750,
+             seasons: int = 1, seed: int = 0) -> dict:
+    """
+    Write a synthetic Data/ folder.
+
+    Args:
+        out_dir: Folder to write (created if missing).
+        managers: League size.
+        gameweeks: GWs per season.
+        players: Players per GW (raised to managers x 15 if smaller).
+        seasons: Seasons (GW numbering continues across seasons).
+        seed: Random seed.
+
+    Returns:
+        dict: The scale actually generated and the number of rows.
+    """
+    rng = np.random.default_rng(seed)
+    players = max(players, managers * SQUAD_SIZE)
+    os.makedirs(out_dir, exist_ok=True)
+
+    players_df = make_players(players, rng)
+    league = pd.DataFrame({
+        "manager_id": np.arange(1, managers + 1) * 1000,
+        "id":         np.arange(1, managers + 1),
+        "first_name": [f"Manager {m}" for m in range(1, managers + 1)],
+        "last_name":  "Synthetic",
+        "short_name": [f"M{m}" for m in range(1, managers + 1)],
+        "waiver_pick": np.arange(1, managers + 1),
+        "team_name":  [f"Team {m:04d}" for m in range(1, managers + 1)],
+    })
+    league.to_csv(os.path.join(out_dir, "league_standings.csv"), index=False)
+
+    # Season table in the players_data.parquet layout the Players Data page reads
+    season = players_df.rename(columns={"player_id": "ID", "full_name": "name", "short_name": "web_name", "real_team": "team"})
+    for column in ["total_points", "goals_scored", "assists", "CS", "starts", "yellow_cards", "red_cards"]:
+        season[column] = rng.integers(0, 40 if column == "total_points" else 10, size=players)
+    season["xG"] = rng.random(players) * 10
+    season["news"] = ""
+    pq.write_table(conform_players(season), os.path.join(out_dir, "players_data.parquet"))
+
+    paths = {
+        name: os.path.join(out_dir, f"{name}.parquet")
+        for name in ["gw_data", "gw_picks", "dim_players", "dim_managers"]
+    }
+    write_dimensions(os.path.join(out_dir, "players_data.parquet"), os.path.join(out_dir, "league_standings.csv"),
+                     paths["dim_players"], paths["dim_managers"])
+
+    rows = 0
+    with pq.ParquetWriter(paths["gw_data"], FACT_SCHEMA) as writer, pq.ParquetWriter(paths["gw_picks"], PICKS_SCHEMA) as picks_writer:
+        for season_index in range(seasons):
+            squads = rng.permutation(players)[: managers * SQUAD_SIZE].reshape(managers, SQUAD_SIZE)
+            for gw in range(1, gameweeks + 1):
+                if gw > 1:
+                    # Swap two squad slots per manager each GW (bench rotation)
+                    swaps = rng.integers(0, SQUAD_SIZE, size=(managers, 2))
+                    swapped = squads[np.arange(managers)[:, None], swaps]
+                    squads[np.arange(managers)[:, None], swaps] = swapped[:, ::-1]
+                table, picks = make_gameweek(season_index * gameweeks + gw, players_df, squads, league, rng)
+                writer.write_table(table, row_group_size=table.num_rows)
+                picks_writer.write_table(picks, row_group_size=picks.num_rows)
+                rows += table.num_rows
+    write_aggregates(paths["gw_data"], os.path.join(out_dir, "aggregates"), force=True, picks_path=paths["gw_picks"],
+                     player_dim_path=paths["dim_players"], manager_dim_path=paths["dim_managers"])
+
+    for name in REFERENCE:
+        shutil.copy(os.path.join(ROOT, "Data", name), os.path.join(out_dir, name))
+
+    return {"managers": managers, "gameweeks": gameweeks * seasons, "players": players, "seasons": seasons, "rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Folder to write the synthetic Data/ files into.")
+    parser.add_argument("--managers", type=int, default=7)
+    parser.add_argument("--gameweeks", type=int, default=SEASON_GWS, help="GWs per season.")
+    parser.add_argument("--players", type=int, default=750)
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    scale = generate(args.out, args.managers, args.gameweeks, args.players, args.seasons, args.seed)
+    print(f"Wrote {scale['rows']} rows ({scale}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# data_store.py
+import json
+import logging
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from aggregates import AGGREGATES_DIR
+from data_utils import (
+    GW_DATA_PATH,
+    GW_DATASET_PATH,
+    VIEWS,
+    load_aggregates,
+    load_gameweeks,
+    load_reference_data,
+)
+from fixture_index import FIXTURES_BY_TEAM_PATH, fixture_lookup, load_fixtures_by_team
+from star import MANAGER_DIM_PATH, PICKS_PATH, PLAYER_DIM_PATH
+
+# ---------------- CONFIG ----------------
+STANDINGS_PATH = "Data/league_standings.csv"
+GAMEWEEKS_PATH = "Data/gameweeks.csv"
+FIXTURES_PATH  = "Data/fixtures.csv"
+PLAYERS_PATH   = "Data/players_data.parquet"
+LIVE_DELTA_PATH = "Data/live_delta.json"   # Written by live.py
+
+
+# ---------------- STORE ----------------
+class DataStore:
+    """
+    Read-only copy of the dashboard data, shared by every page and session.
+
+    Each table is loaded on first use and kept once per process. Every access
+    compares the (mtime, size) signature of the files under Data/ with the
+    one the cached tables were loaded from; when the pipeline rewrites any of
+    them, everything is dropped and reloaded lazily. When only the files
+    live.py updates changed (the live GW partition, the aggregates and the
+    delta file), the reference tables are kept and only the GW data is reloaded.
+
+    The GW data is never held whole: each view is read with its filters and
+    columns pushed down to the Parquet scans (data_utils.load_gameweeks) and
+    cached per (columns, filters).
+
+    Frames returned by the accessors are copies (or fresh slices), so pages
+    may modify them freely without touching the shared data.
+    """
+
+    def __init__(
+        self,
+        gw_data_path: str = GW_DATA_PATH,
+        dataset_path: str = GW_DATASET_PATH,
+        aggregates_dir: str = AGGREGATES_DIR,
+        standings_path: str = STANDINGS_PATH,
+        gameweeks_path: str = GAMEWEEKS_PATH,
+        fixtures_path: str = FIXTURES_PATH,
+        players_path: str = PLAYERS_PATH,
+        fixtures_by_team_path: str = FIXTURES_BY_TEAM_PATH,
+        live_delta_path: str = LIVE_DELTA_PATH,
+        picks_path: str = PICKS_PATH,
+        player_dim_path: str = PLAYER_DIM_PATH,
+        manager_dim_path: str = MANAGER_DIM_PATH,
+    ):
+        self.gw_data_path = gw_data_path
+        self.dataset_path = dataset_path
+        self.aggregates_dir = aggregates_dir
+        self.reference_paths = (standings_path, gameweeks_path, fixtures_path)
+        self.players_path = players_path
+        self.fixtures_by_team_path = fixtures_by_team_path
+        self.live_delta_path = live_delta_path
+        self.star_paths = (picks_path, player_dim_path, manager_dim_path)
+        self.live = None   # Last applied live delta header (gw, seq, updated_at)
+        self.version = 0
+        self._signature = None
+        self._tables = {}
+        self._lock = threading.RLock()
+
+    # ---------- invalidation ----------
+    def _watched_files(self) -> list[str]:
+        files = [
+            self.gw_data_path, *self.star_paths, *self.reference_paths,
+            self.players_path, self.fixtures_by_team_path, self.live_delta_path,
+        ]
+        for folder in (self.dataset_path, self.aggregates_dir):
+            for root, _, names in os.walk(folder):
+                files.extend(os.path.join(root, name) for name in names if name.endswith(".parquet"))
+        return sorted(files)
+
+    def signature(self) -> tuple:
+        """(path, mtime_ns, size) of every watched file that exists."""
+        signature = []
+        for path in self._watched_files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _get(self, name: str, loader):
+        with self._lock:
+            signature = self.signature()
+            if signature != self._signature:
+                if not self._apply_live_delta(signature):
+                    if self._signature is not None:
+                        logging.info(f"🔄 Data files changed; reloading data store (version {self.version + 1})")
+                    self._tables.clear()
+                    self.live = None
+                self._signature = signature
+                self.version += 1
+            if name not in self._tables:
+                self._tables[name] = loader()
+            return self._tables[name]
+
+    def _apply_live_delta(self, signature: tuple) -> bool:
+        """
+        Keep the reference tables if only the files live.py writes changed.
+
+        The GW data is reloaded from the rewritten gw=N partition on next use.
+
+        Returns:
+            bool: True if the live delta was applied (the reference tables are kept).
+        """
+        if self._signature is None:
+            return False
+        try:
+            with open(self.live_delta_path, encoding="utf-8") as f:
+                delta = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        live_prefixes = (
+            os.path.join(self.dataset_path, f"gw={delta['gw']}") + os.sep,
+            os.path.join(self.aggregates_dir, ""),
+        )
+        changed = set(self._signature) ^ set(signature)
+        if not all(path == self.live_delta_path or path.startswith(live_prefixes) for path, *_ in changed):
+            return False
+
+        # Keep the reference tables; everything read from the GW data or the aggregates is reloaded
+        self._tables = {
+            name: table for name, table in self._tables.items()
+            if name in ("reference_data", "fixture_lookup", "players")
+        }
+        self.live = {key: delta[key] for key in ("gw", "seq", "updated_at")}
+        logging.info(f"⚡ Applied live delta #{delta['seq']} for GW{delta['gw']} ({len(delta['players'])} players)")
+        return True
+
+    # ---------- tables ----------
+    def _load_rows(self, columns: list[str], **filters) -> pd.DataFrame:
+        """GW rows with the filters and columns pushed down to the scans (see data_utils.load_gameweeks)."""
+        picks_path, player_dim_path, manager_dim_path = self.star_paths
+        return load_gameweeks(
+            columns=columns,
+            dataset_path=self.dataset_path,
+            gw_data_path=self.gw_data_path,
+            picks_path=picks_path,
+            player_dim_path=player_dim_path,
+            manager_dim_path=manager_dim_path,
+            **filters,
+        )
+
+    def view(self, view, gw_range: tuple[int, int] = None, manager=None, owned_only: bool = False) -> pd.DataFrame:
+        """
+        Copy of the rows and columns of the GW data for one page.
+
+        Only those rows and columns are read, once per data version and
+        combination of arguments.
+
+        Args:
+            view: View name from data_utils.VIEWS or a list of columns.
+            gw_range: Inclusive (first, last) gameweek.
+            manager: Manager team name (str) or manager ID (int).
+            owned_only: Keep only players picked by a manager.
+        """
+        columns = VIEWS[view] if isinstance(view, str) else list(view)
+        gw_range = tuple(gw_range) if gw_range is not None else None
+        key = ("view", tuple(columns), gw_range, manager, owned_only)
+        return self._get(key, lambda: self._load_rows(
+            columns, gw_range=gw_range, manager=manager, owned_only=owned_only
+        )).copy()
+
+    def manager_slices(self) -> dict[str, pd.DataFrame]:
+        """
+        Index of manager team name -> that manager's owned rows (VIEWS["manager"] columns).
+
+        Built with a single groupby the first time it is needed after each
+        data (re)load, so rendering a manager is a dict lookup instead of a
+        scan of the whole table.
+        """
+        def build():
+            owned = self._load_rows(VIEWS["manager"], owned_only=True)
+            return {
+                str(name): group.reset_index(drop=True)
+                for name, group in owned.groupby("manager_team_name", observed=True, sort=False)
+            }
+        return self._get("manager_slices", build)
+
+    def manager_data(self, manager_name: str) -> pd.DataFrame:
+        """Copy of one manager's slice (empty if the manager has no data)."""
+        slices = self.manager_slices()
+        if manager_name not in slices:
+            return pd.DataFrame(columns=VIEWS["manager"])
+        return slices[manager_name].copy()
+
+    def gameweeks(self) -> list[int]:
+        """Gameweeks present in the GW data."""
+        return self._get("gameweeks", lambda: sorted(int(gw) for gw in self._load_rows(["gw"])["gw"].unique()))
+
+    def aggregates(self) -> dict[str, pd.DataFrame]:
+        """Pipeline aggregate tables (shared; do not modify), see aggregates.py."""
+        return self._get("aggregates", lambda: load_aggregates(self.aggregates_dir))
+
+    def reference_data(self) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Copies of (standings, gameweeks, fixtures)."""
+        tables = self._get("reference_data", lambda: load_reference_data(*self.reference_paths))
+        return tuple(table.copy() for table in tables)
+
+    def fixture_lookup(self) -> pd.DataFrame:
+        """
+        Long fixture table indexed by (event, team), for fixture_index.attach_fixtures
+        (shared; do not modify).
+
+        Read from Data/fixtures_by_team.csv, or built from fixtures.csv when
+        an older Data/ folder does not have it.
+        """
+        def build():
+            fixtures = self._get("reference_data", lambda: load_reference_data(*self.reference_paths))[2]
+            return fixture_lookup(load_fixtures_by_team(self.fixtures_by_team_path, fixtures=fixtures))
+        return self._get("fixture_lookup", build)
+
+    def players(self) -> pd.DataFrame:
+        """Copy of the season players table."""
+        return self._get("players", lambda: pd.read_parquet(self.players_path)).copy()
+
+    # ---------- introspection ----------
+    def memory_usage(self) -> dict[str, int]:
+        """Bytes held per loaded table."""
+        def size(obj) -> int:
+            if isinstance(obj, pd.DataFrame):
+                return int(obj.memory_usage(deep=True).sum())
+            if isinstance(obj, dict):
+                return sum(size(v) for v in obj.values())
+            if isinstance(obj, (list, tuple)):
+                return sum(size(v) for v in obj)
+            return 0
+
+        with self._lock:
+            return {name: size(table) for name, table in self._tables.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def get_store() -> DataStore:
+    """The process-wide DataStore (one per Streamlit server)."""
+    return DataStore()
+
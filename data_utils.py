@@ -1,31 +1,175 @@
 # data_utils.py
+import os
 import pandas as pd
+import pyarrow.dataset as ds
 from datetime import datetime, timezone
-import io
-from supabase import create_client
 import streamlit as st
+from scoring import SCORING_COLUMNS, SCORING_INPUTS, add_defensive_points
+from aggregates import AGGREGATES, AGGREGATES_DIR, AGGREGATE_COLUMNS, aggregate_path, build_aggregates
+from star import MANAGER_DIM_PATH, PICKS_PATH, PLAYER_DIM_PATH, load_rows
+from storage import BUCKET, REMOTE_CACHE_DIR, SupabaseStorage, fetch_files
 
 # ---------------- SUPABASE CONFIG ----------------
 SUPABASE_URL = "https://xgesjwvsdatcqrzudoyg.supabase.co"
-SUPABASE_KEY = st.secrets["SUPABASE_ANON_KEY"]  # Streamlit secret
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@st.cache_resource(show_spinner=False)
+def get_remote_storage(bucket: str = BUCKET) -> SupabaseStorage:
+    """Read-only Supabase bucket (anon key from Streamlit secrets); connects on first download."""
+    return SupabaseStorage(bucket, SUPABASE_URL, st.secrets["SUPABASE_ANON_KEY"])
+
+GW_DATA_PATH    = "Data/gw_data.parquet"   # Player-GW fact table (see star.py)
+GW_DATASET_PATH = "Data/gw_dataset"   # Hive-partitioned by gw (see final.write_gw_partition)
+
+# ---------------- GAMEWEEK DATASET ----------------
+def _gw_dataset(dataset_path: str = GW_DATASET_PATH, gw_data_path: str = GW_DATA_PATH) -> ds.Dataset:
+    """Open the partitioned GW dataset, falling back to the merged Parquet file."""
+    if os.path.isdir(dataset_path) and any(d.startswith("gw=") for d in os.listdir(dataset_path)):
+        return ds.dataset(dataset_path, format="parquet", partitioning="hive")
+    return ds.dataset(gw_data_path, format="parquet")
+
+
+def load_gameweeks(
+    gw_range: tuple[int, int] = None,
+    manager=None,
+    owned_only: bool = False,
+    columns: list[str] = None,
+    dataset_path: str = GW_DATASET_PATH,
+    gw_data_path: str = GW_DATA_PATH,
+    picks_path: str = PICKS_PATH,
+    player_dim_path: str | None = PLAYER_DIM_PATH,
+    manager_dim_path: str | None = MANAGER_DIM_PATH,
+) -> pd.DataFrame:
+    """
+    Load player GW rows, pushing filters down to the Parquet scans.
+
+    The fact rows are joined with the picks and the player / manager
+    dimensions (see star.load_rows); GW filters prune whole gw=N partitions,
+    manager filters read only that manager's players.
+    Columns come back with the declared dtypes from schema.py (categoricals,
+    small ints, nullable Int manager_id / team_position).
+
+    Args:
+        gw_range: Inclusive (first, last) gameweek.
+        manager: Manager team name (str) or manager ID (int).
+        owned_only: Keep only players picked by a manager.
+        columns: Columns to read (all if None).
+        player_dim_path: Player dimension, or None to leave the player
+            attributes out.
+        manager_dim_path: Manager dimension, or None to leave the team names out.
+    """
+    dataset = _gw_dataset(dataset_path, gw_data_path)
+
+    # Data merged before the scores were stored: score on read instead
+    missing_scores = [
+        c for c in SCORING_COLUMNS
+        if c not in dataset.schema.names and (columns is None or c in columns)
+    ]
+    read_columns = columns
+    if missing_scores and columns is not None:
+        read_columns = list(dict.fromkeys([c for c in columns if c not in SCORING_COLUMNS] + SCORING_INPUTS))
+
+    df = load_rows(
+        dataset, gw_range, manager, owned_only, read_columns,
+        picks_path=picks_path, player_dim_path=player_dim_path, manager_dim_path=manager_dim_path,
+    )
+    if missing_scores:
+        df = add_defensive_points(df)
+        if columns is not None:
+            df = df[columns]
+    return df
+
+
+# ---------------- COLUMN VIEWS ----------------
+# Columns each page actually uses (see data_store.DataStore.view)
+VIEWS = {
+    "league":  ["gw", "gw_points", "team_position", "manager_team_name"],
+    "manager": ["gw", "gw_points", "team_position", "manager_team_name", "full_name", "real_team", "position"],
+    "current_gameweek": ["gw", "real_team", "short_name", "position", "def_points", "progress", "total_contributions"],
+    "players_data": [
+        "manager_team_name", "full_name", "real_team", "season_points", "gw", "gw_points", "gw_goals",
+        "gw_assists", "gw_bonus", "gw_minutes", "gw_expected_goals", "gw_expected_assists",
+        "gw_defensive_contribution", "position",
+    ],
+}
+
+
+# ---------------- AGGREGATES ----------------
+def load_aggregates(aggregates_dir: str = AGGREGATES_DIR) -> dict[str, pd.DataFrame]:
+    """
+    Read the aggregate tables materialized by the pipeline (see aggregates.py).
+
+    If any table is missing they are all computed from the GW data instead.
+    """
+    paths = {name: aggregate_path(name, aggregates_dir) for name in AGGREGATES}
+    if all(os.path.exists(path) for path in paths.values()):
+        return {name: pd.read_parquet(path) for name, path in paths.items()}
+    df = load_gameweeks(owned_only=True, columns=AGGREGATE_COLUMNS)
+    return build_aggregates(get_starting_lineup(df))
+
+
+def get_team_gw_points_table(aggregates: dict, gw_range: tuple[int, int] = None, manager: str = None) -> pd.DataFrame:
+    """Team x GW starting-XI points with a Total column (as calculate_team_gw_points), from the aggregates."""
+    team_gw_points = aggregates["team_gw_points"]
+    if gw_range is not None:
+        team_gw_points = team_gw_points[team_gw_points["gw"].between(*gw_range)]
+    if manager is not None:
+        team_gw_points = team_gw_points[team_gw_points["manager_team_name"] == manager]
+    return calculate_team_gw_points(team_gw_points.rename(columns={"points": "gw_points"}))
+
+
+def get_league_average(aggregates: dict, exclude: str = None) -> pd.DataFrame:
+    """
+    Average starting-XI points per GW across the league.
+
+    Args:
+        aggregates: Tables from load_aggregates.
+        exclude: Manager team name left out of the average.
+
+    Returns:
+        pd.DataFrame: gw, avg_points
+    """
+    league = aggregates["league_gw_points"][["gw", "total_points", "teams"]]
+    if exclude is not None:
+        team_gw_points = aggregates["team_gw_points"]
+        excluded = team_gw_points.loc[team_gw_points["manager_team_name"] == exclude, ["gw", "points"]]
+        league = league.merge(excluded, on="gw", how="left")
+        league["total_points"] -= league["points"].fillna(0)
+        league["teams"] -= league["points"].notna()
+    league = league[league["teams"] > 0]
+    return pd.DataFrame({"gw": league["gw"], "avg_points": league["total_points"] / league["teams"]}).reset_index(drop=True)
+
+
+def get_season_totals(aggregates: dict) -> pd.DataFrame:
+    """Season starting-XI points per team (Team, Total Points)."""
+    return (
+        aggregates["season_totals"][["manager_team_name", "total_points"]]
+        .rename(columns={"manager_team_name": "Team", "total_points": "Total Points"})
+    )
+
+
+def get_position_points(aggregates: dict, manager: str) -> pd.DataFrame:
+    """Starting-XI points by position (position, gw_points) for one manager."""
+    position_points = aggregates["position_points"]
+    return (
+        position_points.loc[position_points["manager_team_name"] == manager, ["position", "points"]]
+        .rename(columns={"points": "gw_points"})
+        .reset_index(drop=True)
+    )
+
 
 # ---------------- DATA LOADING ----------------
-def load_data(
-    gw_data_path  ="Data/gw_data.parquet",
+def load_reference_data(
     standings_path="Data/league_standings.csv",
     gameweeks_path="Data/gameweeks.csv",
     fixtures_path ="Data/fixtures.csv"
 ):
     """
-    Load all necessary FPL data.
+    Load the small lookup tables.
     Returns:
-        df: player GW data
         standings: league standings
         gameweeks: GW deadlines
         fixtures: fixtures data
     """
-    df = pd.read_parquet(gw_data_path)
     standings = pd.read_csv(standings_path)
     gameweeks = pd.read_csv(gameweeks_path)
     fixtures  = pd.read_csv(fixtures_path)
@@ -34,37 +178,47 @@ def load_data(
     gameweeks["deadline_time"] = pd.to_datetime(gameweeks["deadline_time"], utc=True)
     fixtures["kickoff_time"]   = pd.to_datetime(fixtures["kickoff_time"], utc=True)
 
-    return df, standings, gameweeks, fixtures
+    return standings, gameweeks, fixtures
+
 
 # ---------------- DATA LOADING ----------------
 def load_data2(
     gw_data_file      ="gw_data.parquet",
+    picks_file        ="gw_picks.parquet",
+    player_dim_file   ="dim_players.parquet",
+    manager_dim_file  ="dim_managers.parquet",
     standings_file    ="league_standings.csv",
     gameweeks_file    ="gameweeks.csv",
     fixtures_file     ="fixtures.csv",
-    bucket            ="data"
+    bucket            ="data",
+    storage           =None,
+    cache_dir         =REMOTE_CACHE_DIR
 ):
     """
     Load all necessary FPL data from Supabase Storage.
+    Files are downloaded in parallel into cache_dir and reused while their
+    hash matches the bucket's manifest; if storage is unreachable the cached
+    copies are used (see storage.fetch_files). Pass a storage.LocalStorage
+    (or any object with download()) as storage to read elsewhere.
     Returns:
-        df: player GW data (Parquet)
+        df: player GW data (the star-schema Parquet tables, joined)
         standings: league standings (CSV)
         gameweeks: GW deadlines (CSV)
         fixtures: fixtures data (CSV)
     """
-
-    def download_parquet(file_name):
-        data = supabase.storage.from_(bucket).download(file_name)
-        return pd.read_parquet(io.BytesIO(data))
-
-    def download_csv(file_name):
-        data = supabase.storage.from_(bucket).download(file_name)
-        return pd.read_csv(io.BytesIO(data))
-
-    df = download_parquet(gw_data_file)
-    standings = download_csv(standings_file)
-    gameweeks = download_csv(gameweeks_file)
-    fixtures  = download_csv(fixtures_file)
+    storage = storage or get_remote_storage(bucket)
+    star_files = [gw_data_file, picks_file, player_dim_file, manager_dim_file]
+    paths = fetch_files(star_files + [standings_file, gameweeks_file, fixtures_file], storage, cache_dir)
+
+    df = load_rows(
+        ds.dataset(paths[gw_data_file], format="parquet"),
+        picks_path=paths[picks_file],
+        player_dim_path=paths[player_dim_file],
+        manager_dim_path=paths[manager_dim_file],
+    )
+    standings = pd.read_csv(paths[standings_file])
+    gameweeks = pd.read_csv(paths[gameweeks_file])
+    fixtures  = pd.read_csv(paths[fixtures_file])
 
     # Convert date columns to UTC datetime
     gameweeks["deadline_time"] = pd.to_datetime(gameweeks["deadline_time"], utc=True)
@@ -109,14 +263,6 @@ def get_upcoming_fixtures(fixtures: pd.DataFrame, next_gw: pd.DataFrame) -> pd.D
     return upcoming
 
 
-# ---------------- MANAGER FILTER ----------------
-def get_manager_data(df: pd.DataFrame, manager_name: str) -> pd.DataFrame:
-    """Filter dataframe for a specific manager."""
-    if manager_name not in df['manager_team_name'].unique():
-        return pd.DataFrame()  # return empty for safety
-    return df[df['manager_team_name'] == manager_name]
-
-
 # ---------------- STARTING LINEUP ----------------
 def get_starting_lineup(df: pd.DataFrame) -> pd.DataFrame:
     """Get starting XI (positions 1-11)."""
@@ -130,7 +276,8 @@ def calculate_team_gw_points(starting_players: pd.DataFrame) -> pd.DataFrame:
         columns='gw',
         values='gw_points',
         aggfunc='sum',
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
     if team_gw_points.empty:
         return team_gw_points
@@ -149,37 +296,14 @@ def get_teams_avg_points(team_gw_points: pd.DataFrame) -> pd.DataFrame:
     return team_avg_points.sort_values(by='avg_points', ascending=False)
 
 
-# ---------------- TOTAL POINTS BY TEAM ----------------
-def get_team_total_points(starting_players: pd.DataFrame) -> pd.DataFrame:
-    if starting_players.empty:
-        return pd.DataFrame(columns=['manager_team_name','Total Points'])
-    team_total_points = (
-        starting_players.groupby('manager_team_name')['gw_points']
-        .sum()
-        .reset_index()
-        .rename(columns={'manager_team_name':'Team','gw_points':'Total Points'})
-        .sort_values('Total Points', ascending=False)
-        .reset_index(drop=True)
-    )
-    return team_total_points
-
-
-# ---------------- POINTS BY POSITION ----------------
-def points_per_player_position(starting_players: pd.DataFrame) -> pd.DataFrame:
-
-    if starting_players.empty:
-        return pd.DataFrame(columns=['position','gw_points'])
-    
-    return starting_players.groupby('position')['gw_points'].sum().reset_index()
-
-
 # ---------------- TOP PERFORMERS ----------------
 def get_top_performers(manager_df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     agg_df = (
-        manager_df.groupby(['gw','full_name','real_team'], as_index=False)
+        manager_df.assign(benched=manager_df['team_position'] > 11)
+        .groupby(['gw','full_name','real_team'], as_index=False, observed=True)
         .agg(
             total_points=('gw_points','sum'),
-            Benched=('team_position', lambda x: (x>11).any())
+            Benched=('benched','any')
         )
     )
     top_df = agg_df.sort_values('total_points', ascending=False).head(top_n)
@@ -193,5 +317,6 @@ def get_player_progression(manager_df: pd.DataFrame) -> pd.DataFrame:
         index='gw',
         columns='full_name',
         values='gw_points',
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
\ No newline at end of file
@@ -1,179 +1,535 @@
+import argparse
+import json
 import logging
 import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
-from utils import fetch_data, fetch_managers_ids, get_player_gw_data
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from utils import BASE_URL, fetch_data, fetch_managers_ids, get_player_gw_data
+from http_cache import mark_finished_events, response_cache
+from schema import COLUMN_TYPES
+from star import (
+    FACT_SCHEMA, MANAGER_DIM_PATH, PICKS_PATH, PICKS_SCHEMA, PLAYER_DIM_PATH, STAT_COLUMNS,
+    player_positions, split_gameweek, write_dimensions,
+)
+from aggregates import AGGREGATES_DIR, write_aggregates
+from metrics import metrics
 
 # ------------------ CONFIG ------------------ #
-BASE_URL        = "https://draft.premierleague.com/api"
-TEAMS_URL       = f"{BASE_URL}/entry/"
+TEAMS_URL       = f"{BASE_URL}/entry"
 GAME_STATUS_URL = f"{BASE_URL}/game"
-PLAYERS_CSV     = "Data/players_data.csv"
+BOOTSTRAP_URL   = f"{BASE_URL}/bootstrap-static"
+DATA_DIR        = "Data"
+PLAYERS_PATH    = "Data/players_data.parquet"
 GW_FOLDER       = "Data/gameweeks_parquet"
-MERGED_OUTPUT   = "Data/gw_data.parquet"
+MERGED_OUTPUT   = "Data/gw_data.parquet"    # Player-GW fact table (see star.py)
 STANDINGS_CSV   = "Data/league_standings.csv"
+GW_MANIFEST     = "Data/gw_manifest.json"
+MERGE_MANIFEST  = "Data/gw_merge_manifest.json"
+GW_DATASET      = "Data/gw_dataset"       # Hive-partitioned copy of the fact table: gw=N/
+MAX_WORKERS     = 8      # Concurrent manager-picks requests (1 = serial)
+MAX_PROCESSES   = os.cpu_count() or 1   # Worker processes for parallel GW builds
 
 
 # ------------------ LOGGING ------------------ #
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
 # ------------------ HELPERS ------------------ #
+def league_paths(data_dir: str | None = None) -> dict[str, str]:
+    """
+    Input and output paths of one league's run.
+
+    Args:
+        data_dir (str | None): Folder holding the league's files; None uses
+            the module constants (the single-league Data/ layout).
+
+    Returns:
+        dict[str, str]: players_path, standings_csv, gw_folder, merged_output,
+        gw_manifest, merge_manifest, gw_dataset, gw_picks, player_dim,
+        manager_dim and aggregates_dir.
+    """
+    if data_dir is None:
+        return {
+            "players_path": PLAYERS_PATH,
+            "standings_csv": STANDINGS_CSV,
+            "gw_folder": GW_FOLDER,
+            "merged_output": MERGED_OUTPUT,
+            "gw_manifest": GW_MANIFEST,
+            "merge_manifest": MERGE_MANIFEST,
+            "gw_dataset": GW_DATASET,
+            "gw_picks": PICKS_PATH,
+            "player_dim": PLAYER_DIM_PATH,
+            "manager_dim": MANAGER_DIM_PATH,
+            "aggregates_dir": AGGREGATES_DIR,
+        }
+    # Same file names as the constants, under data_dir
+    defaults = league_paths()
+    return {key: os.path.join(data_dir, os.path.relpath(path, DATA_DIR)) for key, path in defaults.items()}
+
 def fetch_current_gameweek() -> int:
     """Fetch the current gameweek number from API."""
     data = fetch_data(GAME_STATUS_URL)
     if not data or "current_event" not in data:
         logging.error("Failed to fetch current gameweek.")
         return 0
+
     return data["current_event"]
 
-def load_players() -> pd.DataFrame:
-    """Load player IDs and names from CSV."""
-    df = pd.read_csv(PLAYERS_CSV)
-    df = df.astype({"ID": int})
-    return df
+def fetch_gameweek_status() -> dict[int, dict]:
+    """
+    Fetch the finished / data_checked flags of every gameweek.
+
+    Returns:
+        dict[int, dict]: {gw: {"finished": bool, "data_checked": bool}}, empty on failure.
+    """
+    data = fetch_data(BOOTSTRAP_URL)
+    events = (data or {}).get("events", [])
+    if isinstance(events, dict):
+        events = events.get("data", [])
+
+    return {
+        int(e["id"]): {"finished": bool(e.get("finished")), "data_checked": bool(e.get("data_checked"))}
+        for e in events
+        if "id" in e
+    }
+
+def load_manifest(path: str = GW_MANIFEST) -> dict:
+    """Load the processed-gameweeks manifest (empty if missing or unreadable)."""
+    if not os.path.exists(path):
+        return {"managers": [], "gws": {}}
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable manifest {path}: {e}")
+        return {"managers": [], "gws": {}}
+    manifest.setdefault("managers", [])
+    manifest.setdefault("gws", {})
+    return manifest
+
+def save_manifest(manifest: dict, path: str = GW_MANIFEST):
+    """Persist the processed-gameweeks manifest."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
-def fetch_manager_picks(manager_id: int, gw: int) -> pd.DataFrame:
-    """Fetch a managers team picks for a given gameweek."""
+def gameweeks_to_rebuild(
+    current_gw: int,
+    status: dict[int, dict],
+    manifest: dict,
+    managers: list[int],
+    full: bool = False,
+    gw_folder: str | None = None,
+) -> list[int]:
+    """
+    Decide which gameweeks need to be (re)built.
+
+    A GW is served from its existing parquet only when it is finished and
+    data-checked upstream, was built with the same status and managers, and
+    its file still exists. The current GW is always rebuilt.
+    """
+    gw_folder = gw_folder or GW_FOLDER
+    gws = list(range(1, current_gw + 1))
+    if full:
+        return gws
+    if sorted(manifest["managers"]) != sorted(int(m) for m in managers):
+        logging.info("Manager list changed since last run: rebuilding all gameweeks.")
+        return gws
+
+    rebuild = []
+    for gw in gws:
+        upstream = status.get(gw, {"finished": gw < current_gw, "data_checked": False})
+        stored = manifest["gws"].get(str(gw))
+        settled = upstream["finished"] and upstream["data_checked"]
+        if (
+            gw == current_gw
+            or not settled
+            or stored is None
+            or stored.get("finished") != upstream["finished"]
+            or stored.get("data_checked") != upstream["data_checked"]
+            or not os.path.exists(f"{gw_folder}/gw_data_gw{gw}.parquet")
+        ):
+            rebuild.append(gw)
+    return rebuild
+
+def fetch_manager_picks(manager_id: int, gw: int) -> pd.DataFrame | None:
+    """Fetch a managers team picks for a given gameweek (None if the request failed)."""
     url = f"{TEAMS_URL}/{manager_id}/event/{gw}"
     data = fetch_data(url)
     if not data or "picks" not in data:
+        logging.warning(f"Missing picks for manager {manager_id} in GW {gw}")
+        return None
+    if not data["picks"]:
         return pd.DataFrame()
 
     picks = pd.DataFrame(data["picks"])
-    picks.rename(columns={"element": "ID", "position": "team_position"}, inplace=True)
+    picks.rename(columns={"element": "player_id", "position": "team_position"}, inplace=True)
     picks["manager_id"] = manager_id
-    picks["gameweek"] = gw
-    return picks[["ID", "manager_id", "gameweek", "team_position"]]
+    picks["gw"] = gw
+    return picks[["player_id", "manager_id", "gw", "team_position"]]
 
-def build_gameweek_data(gw: int, managers: list[int], players_df: pd.DataFrame) -> pd.DataFrame:
-    """Build a single gameweek DataFrame."""
-    logging.info(f"Processing Gameweek {gw}...")
+def fetch_picks_batch(
+    gws: list[int], managers: list[int], max_workers: int = MAX_WORKERS
+) -> tuple[dict[int, pd.DataFrame], dict[int, list[int]]]:
+    """
+    Fetch the picks of every manager for a batch of gameweeks concurrently.
 
-    gw_stats = get_player_gw_data(gw)
+    Requests share the pooled `utils.session`; results keep the serial
+    (gameweek, manager) order so the concatenated frames are identical.
+
+    Args:
+        gws (list[int]): Gameweeks to fetch.
+        managers (list[int]): Manager IDs.
+        max_workers (int): Maximum concurrent requests (1 = serial).
+
+    Returns:
+        tuple: ({gw: picks_df}, {gw: [manager IDs whose picks could not be fetched]}).
+        A GW listed in the second dict is incomplete and must not be treated as settled.
+    """
+    jobs = [(mid, gw) for gw in gws for mid in managers]
+    if max_workers <= 1 or len(jobs) <= 1:
+        results = [fetch_manager_picks(mid, gw) for mid, gw in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda job: fetch_manager_picks(*job), jobs))
+
+    picks_by_gw = {gw: [] for gw in gws}
+    missing = {}
+    for (mid, gw), picks in zip(jobs, results):
+        if picks is None:
+            missing.setdefault(gw, []).append(mid)
+        elif not picks.empty:
+            picks_by_gw[gw].append(picks)
+
+    picks_by_gw = {
+        gw: pd.concat(picks, ignore_index=True) if picks else pd.DataFrame()
+        for gw, picks in picks_by_gw.items()
+    }
+    return picks_by_gw, missing
+
+def fetch_gameweek_picks(gw: int, managers: list[int], max_workers: int = MAX_WORKERS) -> pd.DataFrame:
+    """Fetch all manager picks for a single gameweek concurrently."""
+    return fetch_picks_batch([gw], managers, max_workers)[0][gw]
+
+def fetch_gameweek_stats(gws: list[int], max_workers: int = MAX_WORKERS) -> dict[int, pd.DataFrame]:
+    """Fetch the live player stats of several gameweeks concurrently."""
+    if max_workers <= 1 or len(gws) <= 1:
+        return {gw: get_player_gw_data(gw) for gw in gws}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(gws, executor.map(get_player_gw_data, gws)))
+
+def assemble_gameweek(gw: int, gw_stats: pd.DataFrame, picks_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Published GW stats of every player with the manager and squad position of the picked ones.
+
+    Player and manager attributes are not repeated here: they live in the
+    dimension tables (see star.py).
+    """
     if gw_stats.empty:
         logging.warning(f"No player stats found for GW{gw}")
         return pd.DataFrame()
 
-    gw_stats.rename(columns={"id": "ID"}, inplace=True)
-    gw_stats["gameweek"] = gw
-    gw_stats = gw_stats.merge(players_df, on="ID", how="left")
-
-    # Collect all manager picks for the GW
-    picks = [fetch_manager_picks(mid, gw) for mid in managers]
-    picks = [p for p in picks if not p.empty]
+    gw_stats = gw_stats.rename(columns={"id": "player_id", "gameweek": "gw", **STAT_COLUMNS})
+    gw_stats["gw"] = gw
 
-    if picks:
-        picks_df = pd.concat(picks, ignore_index=True)
-        gw_stats = gw_stats.merge(picks_df, on=["ID", "gameweek"], how="left")
-        gw_stats["team_id"] = gw_stats["manager_id"]
+    if not picks_df.empty:
+        gw_stats = gw_stats.merge(picks_df, on=["player_id", "gw"], how="left")
 
     return gw_stats
 
-def save_gameweek(gw_df: pd.DataFrame, gw: int, standings_csv="Data/league_standings.csv"):
+def build_gameweek_data(
+    gw: int,
+    managers: list[int],
+    picks_df: pd.DataFrame | None = None,
+    max_workers: int = MAX_WORKERS,
+) -> pd.DataFrame:
+    """Build a single gameweek DataFrame (picks are fetched unless pre-fetched)."""
+    logging.info(f"Processing Gameweek {gw}...")
+
+    gw_stats = get_player_gw_data(gw)
+
+    # Collect all manager picks for the GW
+    if picks_df is None:
+        picks_df = fetch_gameweek_picks(gw, managers, max_workers)
+
+    return assemble_gameweek(gw, gw_stats, picks_df)
+
+def save_gameweek(gw_df: pd.DataFrame, gw: int, gw_folder: str | None = None):
     """Save a single gameweek file."""
-    os.makedirs(GW_FOLDER, exist_ok=True)
-    output_path = f"{GW_FOLDER}/gw_data_gw{gw}.parquet"
-
-    # ✅ Read the CSV first
-    standings_df = pd.read_csv(standings_csv)
-
-    # Merge team names
-    gw_df = gw_df.merge(
-        standings_df[['manager_id', 'team_name']],
-        left_on='team_id',
-        right_on='manager_id',
-        how='left'
-    )
-    
+    gw_folder = gw_folder or GW_FOLDER
+    os.makedirs(gw_folder, exist_ok=True)
+    output_path = f"{gw_folder}/gw_data_gw{gw}.parquet"
+
     gw_df.to_parquet(output_path, index=False, engine="pyarrow")
     logging.info(f"✅ Saved Gameweek {gw} as Parquet: {output_path}")
 
-def merge_all_gameweeks():
-    """Combine all GW CSVs into one big file."""
-    files = sorted([f for f in os.listdir(GW_FOLDER) if f.startswith("gw_data_gw") and f.endswith(".parquet")])
+# ------------------ GAMEWEEK BUILDS ------------------ #
+def _build_gameweek(gw: int, gw_stats: pd.DataFrame, picks_df: pd.DataFrame, gw_folder: str | None = None) -> int:
+    """Assemble and write one GW; return rows written."""
+    gw_df = assemble_gameweek(gw, gw_stats, picks_df)
+    if gw_df.empty:
+        return 0
+    save_gameweek(gw_df, gw, gw_folder=gw_folder)
+    return len(gw_df)
+
+def process_gameweeks(
+    inputs: dict[int, tuple[pd.DataFrame, pd.DataFrame]],
+    processes: int = 1,
+    gw_folder: str | None = None,
+) -> tuple[dict[int, int], dict[int, str]]:
+    """
+    Assemble and write independent gameweeks, serially or across a process pool.
+
+    Args:
+        inputs (dict): {gw: (gw_stats, picks_df)} fetched beforehand.
+        processes (int): Worker processes (1 = serial, in-process).
+        gw_folder (str | None): Output folder of the GW files (GW_FOLDER by default).
+
+    Returns:
+        tuple: ({gw: rows written}, {gw: error message}) — failures never abort the run.
+    """
+    rows, failures = {}, {}
+    gw_folder = gw_folder or GW_FOLDER
+
+    if processes <= 1 or len(inputs) <= 1:
+        for gw, (gw_stats, picks_df) in inputs.items():
+            try:
+                rows[gw] = _build_gameweek(gw, gw_stats, picks_df, gw_folder)
+            except Exception as e:
+                failures[gw] = repr(e)
+        return rows, failures
+
+    with ProcessPoolExecutor(max_workers=min(processes, len(inputs))) as executor:
+        futures = {
+            gw: executor.submit(_build_gameweek, gw, gw_stats, picks_df, gw_folder)
+            for gw, (gw_stats, picks_df) in inputs.items()
+        }
+        for gw, future in futures.items():
+            try:
+                rows[gw] = future.result()
+            except Exception as e:
+                failures[gw] = repr(e)
+
+    return rows, failures
+
+def _gw_files(gw_folder: str | None = None) -> dict[int, str]:
+    """Map gameweek -> path of every saved gameweek Parquet file."""
+    gw_folder = gw_folder or GW_FOLDER
+    return {
+        int(f.split("gw")[-1].split(".")[0]): os.path.join(gw_folder, f)
+        for f in os.listdir(gw_folder)
+        if f.startswith("gw_data_gw") and f.endswith(".parquet")
+    }
+
+def _file_signature(path: str) -> list[int]:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+def merge_all_gameweeks(paths: dict[str, str] | None = None):
+    """
+    Split all GW Parquet files into the star-schema tables, one row group per GW.
+
+    The player-GW fact table (MERGED_OUTPUT) keeps only the per-GW stats and
+    the defensive-contribution scores (scoring.py, computed with the
+    positions of the player dimension); the picks go to their own table
+    (see star.py). Both are cast to the compact types declared in schema.py.
+
+    GWs are streamed through ParquetWriters one at a time, so peak memory is
+    bounded by a single gameweek. Row groups of GWs whose source file is
+    unchanged since the last merge are copied from the previous outputs
+    instead of being re-read; nothing is written if no GW changed. GW files
+    written before the star layout (player and manager attributes included)
+    are renamed and split the same way.
+
+    Args:
+        paths (dict | None): A league's paths (see league_paths); the module
+            constants by default.
+    """
+    paths = paths or league_paths()
+    gw_folder, merged_output, merge_manifest = paths["gw_folder"], paths["merged_output"], paths["merge_manifest"]
+    picks_output = paths["gw_picks"]
+    files = _gw_files(gw_folder) if os.path.isdir(gw_folder) else {}
     if not files:
         logging.warning("No gameweek Parquet files found to merge.")
         return
 
-    dfs = [pd.read_parquet(os.path.join(GW_FOLDER, f)) for f in files]
-    merged_df = pd.concat(dfs, ignore_index=True)
-    merged_df = rename_columns(merged_df)
-    merged_df.to_parquet(MERGED_OUTPUT, index=False, engine="pyarrow")
-    logging.info(f"📦 Merged all gameweeks into {MERGED_OUTPUT}")
+    gws = sorted(files)
+    signatures = {str(gw): _file_signature(files[gw]) for gw in gws}
+    previous = {}
+    if os.path.exists(merge_manifest) and os.path.exists(merged_output) and os.path.exists(picks_output):
+        with open(merge_manifest, encoding="utf-8") as f:
+            previous = json.load(f)
 
-def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
-    # --- Step 1: Rename columns ---
-    rename_map = {
-        "minutes_x": "gw_minutes",
-        "goals_scored_x": "gw_goals",
-        "assists_x": "gw_assists",
-        "clean_sheets": "gw_clean_sheets",
-        "goals_conceded": "gw_goals_conceded",
-        "bps_x": "gw_bps",
-        "bonus_x": "gw_bonus",
-        "ict_index_x": "gw_ict_index",
-        "total_points_x": "gw_points",
-        "in_dreamteam": "gw_in_dreamteam",
-        "expected_goals": "gw_expected_goals",
-        "expected_assists_x": "gw_expected_assists",
-        "expected_goal_involvements_x": "gw_expected_goal_involvements",
-        "expected_goals_conceded": "gw_expected_goals_conceded",
-        "own_goals_x": "gw_own_goals",
-        "penalties_saved_x": "gw_penalties_saved",
-        "penalties_missed_x": "gw_penalties_missed",
-        "yellow_cards_x": "gw_yellow_cards",
-        "red_cards_x": "gw_red_cards",
-        "saves_x": "gw_saves",
-        "influence_x": "gw_influence",
-        "creativity_x": "gw_creativity",
-        "threat_x": "gw_threat",
-        "starts_x": "gw_starts",
-        "clearances_blocks_interceptions_x": "gw_clearances_blocks_interceptions",
-        "recoveries_x": "gw_recoveries",
-        "tackles_x": "gw_tackles",
-        "defensive_contribution_x": "gw_defensive_contribution",
-    
-        # --- Season stats ---
-        "minutes_y": "season_minutes",
-        "goals_scored_y": "season_goals",
-        "assists_y": "season_assists",
-        "bps_y": "season_bps",
-        "bonus_y": "season_bonus",
-        "ict_index_y": "season_ict_index",
-        "total_points_y": "season_points",
-        "xG": "season_expected_goals",
-        "xGc": "season_expected_goals_conceded",
-        "CS": "season_clean_sheets",
-        "Gc": "season_goals_conceded",
-        "own_goals_y": "season_own_goals",
-        "penalties_saved_y": "season_penalties_saved",
-        "penalties_missed_y": "season_penalties_missed",
-        "yellow_cards_y": "season_yellow_cards",
-        "red_cards_y": "season_red_cards",
-        "saves_y": "season_saves",
-        "influence_y": "season_influence",
-        "creativity_y": "season_creativity",
-        "threat_y": "season_threat",
-        "starts_y": "season_starts",
-        "expected_assists_y": "season_expected_assists",
-        "expected_goal_involvements_y": "season_expected_goal_involvements",
-        "clearances_blocks_interceptions_y": "season_clearances_blocks_interceptions",
-        "recoveries_y": "season_recoveries",
-        "tackles_y": "season_tackles",
-        "defensive_contribution_y": "season_defensive_contribution",
-    
-        # --- Identifiers ---
-        "ID": "player_id",
-        "team_id": "manager_team_id",
-        "team_name": "manager_team_name",
-        "manager_id_x": "manager_id",
-        "manager_id_y": "manager_id",
-        "web_name": "short_name",
-        "name": "full_name",
-        "team": "real_team",
-        "gameweek": "gw",
+    # Picks row groups follow the fact row groups one to one
+    old_file = old_picks = None
+    if (
+        previous
+        and pq.read_schema(merged_output).remove_metadata().equals(FACT_SCHEMA)
+        and pq.read_schema(picks_output).remove_metadata().equals(PICKS_SCHEMA)
+    ):
+        old_file, old_picks = pq.ParquetFile(merged_output), pq.ParquetFile(picks_output)
+        if old_picks.num_row_groups != old_file.num_row_groups:
+            old_file = old_picks = None
+    reusable = {
+        gw for gw in gws
+        if old_file is not None and previous.get("signatures", {}).get(str(gw)) == signatures[str(gw)]
     }
+    if old_file is not None and reusable == set(gws) and previous.get("row_groups") and sorted(set(previous["row_groups"])) == gws:
+        logging.info(f"📦 {merged_output} already up to date ({len(gws)} GWs)")
+        sync_gw_dataset(previous["row_groups"], paths)
+        return
+
+    positions = player_positions(paths["player_dim"])
+    tmp_output, tmp_picks = f"{merged_output}.tmp", f"{picks_output}.tmp"
+    row_groups = []
+    with pq.ParquetWriter(tmp_output, FACT_SCHEMA) as writer, pq.ParquetWriter(tmp_picks, PICKS_SCHEMA) as picks_writer:
+        for gw in gws:
+            old_groups = [i for i, g in enumerate(previous.get("row_groups", [])) if g == gw]
+            if gw in reusable and old_groups:
+                for i in old_groups:
+                    writer.write_table(old_file.read_row_group(i))
+                    picks_writer.write_table(old_picks.read_row_group(i))
+                    row_groups.append(gw)
+                continue
+
+            table, picks = split_gameweek(rename_columns(pd.read_parquet(files[gw])), positions)
+            if table.num_rows:
+                writer.write_table(table, row_group_size=table.num_rows)
+                picks_writer.write_table(picks, row_group_size=max(picks.num_rows, 1))
+                write_gw_partition(table, gw, paths["gw_dataset"])
+                row_groups.append(gw)
+    os.replace(tmp_output, merged_output)
+    os.replace(tmp_picks, picks_output)
+
+    with open(merge_manifest, "w", encoding="utf-8") as f:
+        json.dump({"signatures": signatures, "row_groups": row_groups}, f, indent=2)
+
+    metrics.add_rows(merged_output, pq.ParquetFile(merged_output).metadata.num_rows)
+    metrics.add_rows(picks_output, pq.ParquetFile(picks_output).metadata.num_rows)
+    changed = [gw for gw in gws if gw not in reusable]
+    logging.info(f"📦 Merged all gameweeks into {merged_output} and {picks_output} (rewrote GWs {changed}, reused {len(gws) - len(changed)})")
+    sync_gw_dataset(row_groups, paths)
+
+def _partition_dir(gw: int, dataset: str | None = None) -> str:
+    return os.path.join(dataset or GW_DATASET, f"gw={gw}")
+
+def write_gw_partition(table: pa.Table, gw: int, dataset: str | None = None):
+    """
+    Replace the gw=N partition of the hive-partitioned GW dataset.
 
-    df = df.rename(columns=rename_map)
+    The gw column becomes the partition key.
+    """
+    dataset = dataset or GW_DATASET
+    shutil.rmtree(_partition_dir(gw, dataset), ignore_errors=True)
+    ds.write_dataset(
+        table,
+        dataset,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([pa.field("gw", COLUMN_TYPES["gw"])]), flavor="hive"),
+        basename_template=f"part-gw{gw}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+def sync_gw_dataset(row_groups: list[int], paths: dict[str, str] | None = None):
+    """Write dataset partitions missing for merged GWs and drop partitions of GWs no longer merged."""
+    paths = paths or league_paths()
+    dataset = paths["gw_dataset"]
+    os.makedirs(dataset, exist_ok=True)
+    merged = set(row_groups)
+    for name in os.listdir(dataset):
+        if name.startswith("gw=") and int(name[3:]) not in merged:
+            shutil.rmtree(os.path.join(dataset, name))
+
+    missing = [gw for gw in sorted(merged) if not os.path.isdir(_partition_dir(gw, dataset))]
+    if not missing:
+        return
+    merged_file = pq.ParquetFile(paths["merged_output"])
+    for gw in missing:
+        groups = [i for i, g in enumerate(row_groups) if g == gw]
+        write_gw_partition(merged_file.read_row_groups(groups), gw, dataset)
+    logging.info(f"🗂️ Wrote dataset partitions for GWs {missing} into {dataset}")
+
+# Raw merged column -> published column name, for GW files written before the star layout
+# (stats and players_data merged into one row, hence the _x / _y suffixes)
+RENAME_MAP = {
+    "minutes_x": "gw_minutes",
+    "goals_scored_x": "gw_goals",
+    "assists_x": "gw_assists",
+    "clean_sheets": "gw_clean_sheets",
+    "goals_conceded": "gw_goals_conceded",
+    "bps_x": "gw_bps",
+    "bonus_x": "gw_bonus",
+    "ict_index_x": "gw_ict_index",
+    "total_points_x": "gw_points",
+    "in_dreamteam": "gw_in_dreamteam",
+    "expected_goals": "gw_expected_goals",
+    "expected_assists_x": "gw_expected_assists",
+    "expected_goal_involvements_x": "gw_expected_goal_involvements",
+    "expected_goals_conceded": "gw_expected_goals_conceded",
+    "own_goals_x": "gw_own_goals",
+    "penalties_saved_x": "gw_penalties_saved",
+    "penalties_missed_x": "gw_penalties_missed",
+    "yellow_cards_x": "gw_yellow_cards",
+    "red_cards_x": "gw_red_cards",
+    "saves_x": "gw_saves",
+    "influence_x": "gw_influence",
+    "creativity_x": "gw_creativity",
+    "threat_x": "gw_threat",
+    "starts_x": "gw_starts",
+    "clearances_blocks_interceptions_x": "gw_clearances_blocks_interceptions",
+    "recoveries_x": "gw_recoveries",
+    "tackles_x": "gw_tackles",
+    "defensive_contribution_x": "gw_defensive_contribution",
+
+    # --- Season stats ---
+    "minutes_y": "season_minutes",
+    "goals_scored_y": "season_goals",
+    "assists_y": "season_assists",
+    "bps_y": "season_bps",
+    "bonus_y": "season_bonus",
+    "ict_index_y": "season_ict_index",
+    "total_points_y": "season_points",
+    "xG": "season_expected_goals",
+    "xGc": "season_expected_goals_conceded",
+    "CS": "season_clean_sheets",
+    "Gc": "season_goals_conceded",
+    "own_goals_y": "season_own_goals",
+    "penalties_saved_y": "season_penalties_saved",
+    "penalties_missed_y": "season_penalties_missed",
+    "yellow_cards_y": "season_yellow_cards",
+    "red_cards_y": "season_red_cards",
+    "saves_y": "season_saves",
+    "influence_y": "season_influence",
+    "creativity_y": "season_creativity",
+    "threat_y": "season_threat",
+    "starts_y": "season_starts",
+    "expected_assists_y": "season_expected_assists",
+    "expected_goal_involvements_y": "season_expected_goal_involvements",
+    "clearances_blocks_interceptions_y": "season_clearances_blocks_interceptions",
+    "recoveries_y": "season_recoveries",
+    "tackles_y": "season_tackles",
+    "defensive_contribution_y": "season_defensive_contribution",
+
+    # --- Identifiers ---
+    "ID": "player_id",
+    "team_id": "manager_team_id",
+    "team_name": "manager_team_name",
+    "manager_id_x": "manager_id",
+    "manager_id_y": "manager_id",
+    "web_name": "short_name",
+    "name": "full_name",
+    "team": "real_team",
+    "gameweek": "gw",
+}
+
+def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # --- Step 1: Rename columns ---
+    df = df.rename(columns=RENAME_MAP)
     # --- Step 2: Remove duplicated columns ---
     # Drop duplicated manager_id or repeated metrics if both versions exist
     df = df.loc[:, ~df.columns.duplicated()]
@@ -181,47 +537,111 @@ def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 # ------------------ MAIN PROCESSING ------------------ #
-def main():
+def main(
+    max_workers: int = MAX_WORKERS,
+    full: bool = False,
+    parallel: bool = False,
+    processes: int = MAX_PROCESSES,
+    data_dir: str | None = None,
+):
     logging.info("🏁 Starting incremental FPL gameweek data extraction...")
+    paths = league_paths(data_dir)
 
-    current_gw = fetch_current_gameweek()
+    with metrics.stage("current_gameweek"):
+        current_gw = fetch_current_gameweek()
     if current_gw == 0:
         logging.error("Aborting: could not fetch current gameweek.")
         return
 
-    managers = fetch_managers_ids()
+    managers = fetch_managers_ids(paths["standings_csv"])
     if not managers:
         logging.error("Aborting: no manager IDs found.")
         return
 
-    players_df = load_players()
+    # Player and manager attributes, stored once instead of on every GW row (see star.py)
+    with metrics.stage("dimensions"):
+        write_dimensions(paths["players_path"], paths["standings_csv"], paths["player_dim"], paths["manager_dim"])
 
-    # Identify already processed GWs
-    os.makedirs(GW_FOLDER, exist_ok=True)
-    existing_gws = {
-        int(f.split("gw")[-1].split(".")[0])
-        for f in os.listdir(GW_FOLDER)
-        if f.startswith("gw_data_gw")
-    }
+    # Identify which GWs changed upstream since the last run
+    os.makedirs(paths["gw_folder"], exist_ok=True)
+    with metrics.stage("gameweek_status"):
+        status = fetch_gameweek_status()
+    mark_finished_events(gw for gw, flags in status.items() if flags["finished"] and flags["data_checked"])
+    manifest = load_manifest(paths["gw_manifest"])
+    gws = gameweeks_to_rebuild(current_gw, status, manifest, managers, full=full, gw_folder=paths["gw_folder"])
+
+    skipped = [gw for gw in range(1, current_gw + 1) if gw not in gws]
+    logging.info(f"Serving finished GWs from disk: {skipped}")
+    logging.info(f"Rebuilding GWs: {gws}")
+
+    # Gather live stats and every manager's picks for the GWs to rebuild concurrently
+    logging.info(f"Fetching stats and picks for {len(managers)} managers x {len(gws)} GWs ({max_workers} workers)...")
+    with metrics.stage("fetch_stats"):
+        stats_by_gw = fetch_gameweek_stats(gws, max_workers)
+    with metrics.stage("fetch_picks"):
+        picks_by_gw, missing_picks = fetch_picks_batch(gws, managers, max_workers)
 
-    logging.info(f"Already have data for GWs: {sorted(existing_gws)}")
-
-    # Fetch only missing GWs
-    for gw in range(1, current_gw + 1):
-        # Skip past GWs if already saved
-        #if gw < current_gw and gw in existing_gws:
-        #    logging.info(f"Skipping Gameweek {gw} (already saved)")
-        #    continue
-        
-        gw_df = build_gameweek_data(gw, managers, players_df)
-        
-        if not gw_df.empty:
-            save_gameweek(gw_df, gw)
+    # Assemble and write each complete GW, in parallel across processes if requested.
+    # A GW without live stats or with missing picks is failed: it keeps its previous
+    # file and stays out of the manifest so the next run rebuilds it.
+    incomplete = {gw: "No live stats" for gw in gws if stats_by_gw[gw].empty}
+    for gw, missing in missing_picks.items():
+        incomplete.setdefault(gw, f"Missing picks for managers {sorted(missing)}")
+    inputs = {gw: (stats_by_gw[gw], picks_by_gw[gw]) for gw in gws if gw not in incomplete}
+    with metrics.stage("build_gameweeks"):
+        rows, failures = process_gameweeks(inputs, processes=processes if parallel else 1, gw_folder=paths["gw_folder"])
+    failures.update(incomplete)
+    metrics.add_rows(paths["gw_folder"], sum(rows.values()))
+
+    manifest["managers"] = sorted(int(m) for m in managers)
+    for gw in gws:
+        if rows.get(gw):
+            upstream = status.get(gw, {"finished": False, "data_checked": False})
+            manifest["gws"][str(gw)] = {
+                **upstream,
+                "built_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
             logging.info(f"Saved Gameweek {gw}")
         else:
-            logging.warning(f"No data for Gameweek {gw}")
+            manifest["gws"].pop(str(gw), None)
+            if gw not in failures:
+                logging.warning(f"No data for Gameweek {gw}")
+
+    save_manifest(manifest, paths["gw_manifest"])
 
-    # Rebuild master dataset
-    merge_all_gameweeks()
+    # Rebuild master dataset and the dashboard's aggregate tables
+    with metrics.stage("merge"):
+        merge_all_gameweeks(paths)
+    with metrics.stage("aggregates"):
+        write_aggregates(
+            paths["merged_output"], paths["aggregates_dir"],
+            picks_path=paths["gw_picks"], player_dim_path=paths["player_dim"], manager_dim_path=paths["manager_dim"],
+        )
+
+    response_cache.log_stats()
+    metrics.set("http_cache", dict(response_cache.stats))
+    metrics.set("failed_gameweeks", sorted(failures))
+
+    if failures:
+        for gw, error in sorted(failures.items()):
+            logging.error(f"❌ Gameweek {gw} failed: {error}")
+        logging.error(f"Completed with {len(failures)} failed gameweek(s): {sorted(failures)}")
+        return sorted(failures)
 
     logging.info("🏁 Incremental data extraction completed successfully.")
+    return []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build FPL Draft gameweek data.")
+    parser.add_argument("--full", action="store_true", help="Rebuild every gameweek, ignoring the manifest.")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Concurrent picks requests.")
+    parser.add_argument("--parallel", action="store_true", help="Build gameweeks across a process pool.")
+    parser.add_argument("--processes", type=int, default=MAX_PROCESSES, help="Worker processes with --parallel.")
+    args = parser.parse_args()
+    try:
+        with metrics.stage("final"):
+            failed = main(max_workers=args.workers, full=args.full, parallel=args.parallel, processes=args.processes)
+    finally:
+        metrics.write()
+    sys.exit(1 if failed is None or failed else 0)
@@ -0,0 +1,110 @@
+import pandas as pd
+
+# ------------------ CONFIG ------------------ #
+FIXTURES_BY_TEAM_PATH = "Data/fixtures_by_team.csv"
+
+# Team IDs -> names used across the pipeline (players.py, real_team in the GW data)
+TEAM_NAMES = {
+    1: "Arsenal", 2: "Aston Villa", 3: "Burnley", 4: "Bournemouth",
+    5: "Brentford", 6: "Brighton", 7: "Chelsea", 8: "Crystal Palace",
+    9: "Everton", 10: "Fulham", 11: "Leeds United", 12: "Liverpool",
+    13: "Manchester City", 14: "Manchester United", 15: "Newcastle United",
+    16: "Nottingham Forest", 17: "Sunderland", 18: "Tottenham",
+    19: "West Ham", 20: "Wolverhampton"
+}
+
+FIXTURE_COLUMNS = [
+    "event", "team", "team_id", "opponent", "opponent_id",
+    "is_home", "difficulty", "kickoff_time", "fixture_name",
+]
+INDEX_COLUMNS = ["event", "team"]
+
+
+# ------------------ BUILD ------------------ #
+def build_fixtures_by_team(fixtures: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reshape the FPL fixture list into one row per (event, team).
+
+    Every fixture becomes two rows, one from each side, with the opponent,
+    home/away flag and that side's difficulty. Teams are named from their IDs
+    with TEAM_NAMES, so the names match real_team in the GW data. Fixtures
+    without a gameweek (postponed) are dropped; a team with a double gameweek
+    has two rows for that event.
+
+    Args:
+        fixtures: Fixtures with event, team_h, team_a, team_h_difficulty,
+            team_a_difficulty and kickoff_time (as written by game.py).
+
+    Returns:
+        pd.DataFrame: FIXTURE_COLUMNS, sorted by event, team and kickoff.
+    """
+    fixtures = fixtures.dropna(subset=["event"])
+    home_names = fixtures["team_h"].map(TEAM_NAMES)
+    away_names = fixtures["team_a"].map(TEAM_NAMES)
+    fixture_name = home_names + " vs " + away_names
+
+    def side(team, opponent, team_names, opponent_names, difficulty, is_home):
+        return pd.DataFrame({
+            "event":        fixtures["event"].astype(int),
+            "team":         team_names,
+            "team_id":      fixtures[team],
+            "opponent":     opponent_names,
+            "opponent_id":  fixtures[opponent],
+            "is_home":      is_home,
+            "difficulty":   fixtures[difficulty],
+            "kickoff_time": fixtures["kickoff_time"],
+            "fixture_name": fixture_name,
+        })
+
+    by_team = pd.concat([
+        side("team_h", "team_a", home_names, away_names, "team_h_difficulty", True),
+        side("team_a", "team_h", away_names, home_names, "team_a_difficulty", False),
+    ], ignore_index=True)
+    return by_team.sort_values(["event", "team", "kickoff_time"]).reset_index(drop=True)[FIXTURE_COLUMNS]
+
+
+# ------------------ LOOKUP ------------------ #
+def load_fixtures_by_team(path: str = FIXTURES_BY_TEAM_PATH, fixtures: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Read the long fixture table, or build it from the raw fixtures if the file is missing.
+
+    Args:
+        path: CSV written by game.py.
+        fixtures: Raw fixtures to fall back on (older Data/ folders).
+
+    Returns:
+        pd.DataFrame: FIXTURE_COLUMNS with kickoff_time parsed as UTC.
+    """
+    try:
+        by_team = pd.read_csv(path)
+    except FileNotFoundError:
+        if fixtures is None:
+            raise
+        by_team = build_fixtures_by_team(fixtures)
+    by_team["kickoff_time"] = pd.to_datetime(by_team["kickoff_time"], utc=True)
+    return by_team
+
+
+def fixture_lookup(fixtures_by_team: pd.DataFrame) -> pd.DataFrame:
+    """Index the long fixture table by (event, team) for attach_fixtures."""
+    return fixtures_by_team.set_index(INDEX_COLUMNS).sort_index()
+
+
+def attach_fixtures(df: pd.DataFrame, lookup: pd.DataFrame, columns: list[str] = None,
+                    gw_col: str = "gw", team_col: str = "real_team") -> pd.DataFrame:
+    """
+    Add fixture columns to player rows with one keyed join on (gameweek, team).
+
+    Args:
+        df: Player rows with a gameweek and a team name column.
+        lookup: Output of fixture_lookup.
+        columns: Fixture columns to add (default: all of them).
+        gw_col: Gameweek column in df.
+        team_col: Team name column in df.
+
+    Returns:
+        pd.DataFrame: df with the fixture columns (NaN where the team has no
+        fixture; one row per fixture for double gameweeks).
+    """
+    fixture_columns = lookup[columns] if columns is not None else lookup
+    return df.join(fixture_columns, on=[gw_col, team_col])
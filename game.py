@@ -1,6 +1,8 @@
 import requests
 import pandas as pd
 
+from fixture_index import FIXTURES_BY_TEAM_PATH, build_fixtures_by_team
+
 # ---------------- BOOTSTRAP STATIC (for deadlines) ----------------
 url = "https://fantasy.premierleague.com/api/bootstrap-static/"
 data = requests.get(url).json()
@@ -38,5 +40,10 @@ fixtures_df["team_a_name"] = fixtures_df["team_a"].map(team_map)
 fixtures_df.to_csv("Data/fixtures.csv", index=False)
 print("✅ Saved fixtures to Data/fixtures.csv")
 
+# One row per (event, team), named like real_team in the GW data
+fixtures_by_team = build_fixtures_by_team(fixtures_df)
+fixtures_by_team.to_csv(FIXTURES_BY_TEAM_PATH, index=False)
+print(f"✅ Saved per-team fixtures to {FIXTURES_BY_TEAM_PATH}")
+
 # Preview
 print(fixtures_df.head())
@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# ------------------ CONFIG ------------------ #
+CACHE_DB        = os.environ.get("FPL_HTTP_CACHE_DB", "Data/http_cache.sqlite")
+CACHE_ENABLED   = os.environ.get("FPL_HTTP_CACHE", "1") != "0"
+CACHE_MAX_BYTES = 200 * 1024 * 1024   # LRU eviction above this body size
+FOREVER         = float("inf")
+
+# Seconds a cached response is served without revalidation, by endpoint.
+# Settled gameweeks (finished and data_checked) never change, so their
+# live/picks payloads are pinned FOREVER once registered through
+# mark_finished_events(). Only entries stored (or revalidated) after the GW
+# settled are pinned; older ones are revalidated once first. bootstrap-static
+# carries the finished / data_checked flags behind the incremental rebuild and
+# the pinning, so it is not served staler than /game.
+TTL_RULES = [
+    (re.compile(r"/game/?$"),                 60),
+    (re.compile(r"/bootstrap-static/?$"),     60),
+    (re.compile(r"/league/\d+/details/?$"),   600),
+    (re.compile(r"/event/(\d+)/live/?$"),     60),
+    (re.compile(r"/entry/\d+/event/(\d+)/?$"), 300),
+]
+DEFAULT_TTL = 0   # Always revalidate
+
+# Endpoint families (see rate_limit.endpoint_family) whose payloads do not
+# depend on the league: fetched once per batch run and shared (SingleFlight).
+SHARED_FAMILIES = {"bootstrap-static", "game", "event/live"}
+
+_finished_events: set[int] = set()
+
+
+def mark_finished_events(gws) -> None:
+    """Register settled (finished and data_checked) gameweeks so their payloads are cached forever."""
+    _finished_events.update(int(gw) for gw in gws)
+
+
+def _rule(url: str):
+    """(TTL, gameweek or None) of the first TTL rule matching a URL, or None."""
+    for pattern, ttl in TTL_RULES:
+        match = pattern.search(url)
+        if match:
+            return ttl, int(match.group(1)) if match.groups() else None
+    return None
+
+
+def is_settled(url: str) -> bool:
+    """Check whether a URL is the payload of a gameweek registered as settled."""
+    rule = _rule(url)
+    return rule is not None and rule[1] in _finished_events
+
+
+def ttl_for(url: str, settled: bool = False) -> float:
+    """
+    Return the freshness lifetime (seconds) for a URL.
+
+    Args:
+        url (str): Requested URL.
+        settled (bool): The cached entry was stored after its gameweek settled.
+
+    Returns:
+        float: TTL in seconds (FOREVER for settled gameweek payloads).
+    """
+    rule = _rule(url)
+    if rule is None:
+        return DEFAULT_TTL
+    ttl, gw = rule
+    return FOREVER if settled and gw is not None else ttl
+
+
+# ------------------ CACHE ------------------ #
+class ResponseCache:
+    """
+    Persistent, size-capped (LRU) response cache keyed by URL.
+
+    Stores the raw body together with its ETag / Last-Modified headers so
+    stale entries can be revalidated with a conditional request.
+    """
+
+    def __init__(self, path: str = CACHE_DB, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "bytes_saved": 0, "bytes_downloaded": 0}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                       url           TEXT PRIMARY KEY,
+                       body          BLOB NOT NULL,
+                       etag          TEXT,
+                       last_modified TEXT,
+                       stored_at     REAL NOT NULL,
+                       accessed_at   REAL NOT NULL,
+                       size          INTEGER NOT NULL,
+                       settled       INTEGER NOT NULL DEFAULT 0
+                   )"""
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(responses)")]
+            if "settled" not in columns:
+                # Cache files written before the settled flag: every entry is revalidated once
+                self._conn.execute("ALTER TABLE responses ADD COLUMN settled INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[dict]:
+        """Return the cached entry for a URL (marking it recently used), or None."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT body, etag, last_modified, stored_at, settled FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+        body, etag, last_modified, stored_at, settled = row
+        return {"body": body, "etag": etag, "last_modified": last_modified, "stored_at": stored_at, "settled": bool(settled)}
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a response body and its validators, evicting LRU entries over the size cap."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, stored_at, accessed_at, size, settled) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, len(body), is_settled(url)),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def touch(self, url: str):
+        """Mark an entry as freshly validated (after a 304 Not Modified), settling it if its GW has settled."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ?, settled = MAX(settled, ?) WHERE url = ?",
+                (now, now, is_settled(url), url),
+            )
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in conn.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC").fetchall():
+            conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def is_fresh(self, entry: dict, url: str) -> bool:
+        """Check whether a cached entry is still within its endpoint TTL."""
+        return time.time() - entry["stored_at"] < ttl_for(url, entry.get("settled", False))
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> dict:
+        """Build If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, event: str, size: int = 0):
+        """Update the hit / miss / revalidation counters."""
+        with self._lock:
+            self.stats[event] += 1
+            if event in ("hits", "revalidated"):
+                self.stats["bytes_saved"] += size
+            else:
+                self.stats["bytes_downloaded"] += size
+
+    def log_stats(self):
+        """Log cache counters and the bandwidth saved."""
+        s = self.stats
+        logging.info(
+            f"🗄️ HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated (304), {s['misses']} misses — "
+            f"{s['bytes_saved'] / 1024:.1f} KiB saved, {s['bytes_downloaded'] / 1024:.1f} KiB downloaded"
+        )
+
+
+def decode(body: bytes) -> dict:
+    """Decode a cached JSON body."""
+    return json.loads(body)
+
+
+# ------------------ SINGLE FLIGHT ------------------ #
+class SingleFlight:
+    """
+    Per-run deduplication of identical fetches across threads.
+
+    While a run is open (see run()), the first caller of a key performs the
+    fetch, concurrent callers of the same key wait for its result, and later
+    callers get the stored result. Failed fetches (None) are not stored, so
+    the next caller tries again. Results are dropped when the last run closes.
+    """
+
+    def __init__(self):
+        self.stats = {"fetched": 0, "shared": 0}
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._results: dict[str, object] = {}
+        self._inflight: dict[str, threading.Event] = {}
+
+    @property
+    def active(self) -> bool:
+        return self._runs > 0
+
+    @contextmanager
+    def run(self):
+        """Share fetches between every thread until the block exits."""
+        with self._lock:
+            if not self._runs:
+                self.stats = {"fetched": 0, "shared": 0}
+            self._runs += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._runs -= 1
+                if not self._runs:
+                    self._results.clear()
+
+    def do(self, key: str, fetch: Callable[[], object]):
+        """Return fetch()'s result for key, calling it at most once at a time per run."""
+        while True:
+            with self._lock:
+                if key in self._results:
+                    self.stats["shared"] += 1
+                    return self._results[key]
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+            event.wait()   # Another thread is fetching it; then re-check
+
+        try:
+            result = fetch()
+            with self._lock:
+                self.stats["fetched"] += 1
+                if result is not None and self._runs:
+                    self._results[key] = result
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+
+response_cache = ResponseCache()
+shared_fetches = SingleFlight()
@@ -1,8 +1,5 @@
 import logging
-from utils import fetch_data,save_csv
-
-# Define URLs
-BASE_URL            = "https://draft.premierleague.com/api"
+from utils import BASE_URL, fetch_data, save_csv
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
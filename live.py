@@ -0,0 +1,241 @@
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+import final
+from aggregates import STARTING_XI, apply_point_changes, read_aggregates, save_aggregates
+from live_decoder import decode_live
+from metrics import metrics
+from schema import conform, to_pandas, typed_schema
+from scoring import SCORING_COLUMNS, add_defensive_points
+from star import STAT_COLUMNS, join, read_table
+from utils import BASE_URL, fetch_data
+
+# ------------------ CONFIG ------------------ #
+LIVE_URL        = f"{BASE_URL}/event/{{gw}}/live"
+LIVE_DELTA_PATH = "Data/live_delta.json"   # Read by data_store.DataStore
+POLL_INTERVAL   = 60                       # Seconds between polls
+
+# Live stat -> published gw_* column of the fact table
+LIVE_COLUMNS = STAT_COLUMNS
+
+# ------------------ LOGGING ------------------ #
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+
+# ------------------ HELPERS ------------------ #
+def fetch_live(gw: int) -> pd.DataFrame:
+    """
+    Fetch event/{gw}/live, bypassing the HTTP cache.
+
+    Returns:
+        pd.DataFrame: Published gw_* columns with their declared dtypes,
+        indexed by player_id (empty on failure).
+    """
+    data = fetch_data(LIVE_URL.format(gw=gw), use_cache=False)
+    if not data or "elements" not in data:
+        logging.warning(f"No live data for GW{gw}")
+        return pd.DataFrame()
+
+    df = decode_live(data, gw).to_pandas().drop(columns="gameweek")
+    return df.rename(columns={"id": "player_id", **LIVE_COLUMNS}).set_index("player_id")
+
+
+def changed_players(previous: pd.DataFrame, current: pd.DataFrame) -> pd.Index:
+    """Player IDs whose live stats differ between two fetch_live frames (new players included)."""
+    columns = [c for c in current.columns if c in previous.columns]
+    before = previous[columns].reindex(current.index)
+    differs = current[columns].ne(before) & ~(current[columns].isna() & before.isna())
+    return current.index[differs.any(axis=1).to_numpy()]
+
+
+def read_partition(dataset: str, gw: int) -> pa.Table:
+    """Rows of one GW from the hive-partitioned dataset written by final.py (declared types)."""
+    table = ds.dataset(dataset, format="parquet", partitioning="hive").to_table(filter=ds.field("gw") == gw)
+    return table.cast(typed_schema(table.schema))
+
+
+def starting_xi(df: pd.DataFrame) -> pd.Series:
+    """Mask of the owned rows that score (squad positions 1-11)."""
+    return df["manager_id"].notna() & df["team_position"].le(STARTING_XI).fillna(False)
+
+
+def _json_value(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+# ------------------ LIVE SESSION ------------------ #
+class LiveSession:
+    """
+    Incremental updates of one gameweek while it is being played.
+
+    Each poll() fetches event/{gw}/live and compares it with the previous
+    snapshot (initially the stored gw=N partition). Only when players changed:
+    their rows of the gw=N dataset partition are updated (stats and scoring
+    columns), the affected managers' points are patched into the aggregate
+    tables, and the delta file is rewritten.
+
+    The delta file holds every player changed since the session started
+    (latest values) and the current GW points of the affected managers, so a
+    reader applying it gets the current state even if it skipped a poll.
+
+    The partition holds only the fact rows (stats and scores); positions and
+    ownership come from the GW's picks and the dimensions (see star.py),
+    read once per session.
+    """
+
+    def __init__(self, gw: int, data_dir: str | None = None):
+        self.gw = gw
+        self.paths = final.league_paths(data_dir)
+        self.delta_path = os.path.join(data_dir or final.DATA_DIR, os.path.basename(LIVE_DELTA_PATH))
+        self.snapshot: pd.DataFrame | None = None
+        self.players: dict[int, dict] = {}
+        self.managers: dict[str, int] = {}
+        self.seq = 0
+        self.star: tuple | None = None
+
+    def _star_tables(self) -> tuple:
+        """(picks of the GW, player positions, manager dimension) for star.join."""
+        if self.star is None:
+            self.star = (
+                read_table(self.paths["gw_picks"], filter=ds.field("gw") == self.gw),
+                read_table(self.paths["player_dim"], columns=["player_id", "position"]),
+                read_table(self.paths["manager_dim"]),
+            )
+        return self.star
+
+    def _stored_snapshot(self, partition: pd.DataFrame) -> pd.DataFrame:
+        columns = [c for c in LIVE_COLUMNS.values() if c in partition.columns]
+        return partition.drop_duplicates("player_id").set_index("player_id")[columns]
+
+    def poll(self) -> int:
+        """
+        Fetch the live stats once and apply the changes.
+
+        Returns:
+            int: Number of players whose stats changed.
+        """
+        start = time.perf_counter()
+        live = fetch_live(self.gw)
+        if live.empty:
+            return 0
+
+        partition = None
+        if self.snapshot is None:
+            if not os.path.isdir(final._partition_dir(self.gw, self.paths["gw_dataset"])):
+                logging.warning(f"No gw={self.gw} partition yet; run the pipeline once before going live.")
+                return 0
+            partition = read_partition(self.paths["gw_dataset"], self.gw)
+            self.snapshot = self._stored_snapshot(to_pandas(partition))
+
+        changed = changed_players(self.snapshot, live)
+        if changed.empty:
+            logging.info(f"⏸️ GW{self.gw}: no changes ({time.perf_counter() - start:.2f}s)")
+            self.snapshot = live
+            return 0
+
+        managers = self._update_partition(live.loc[changed], partition)
+        self.snapshot = live
+        self.seq += 1
+        self._write_delta()
+        logging.info(
+            f"⚡ GW{self.gw}: {len(changed)} players and {len(managers)} managers updated "
+            f"in {time.perf_counter() - start:.2f}s (delta #{self.seq})"
+        )
+        return len(changed)
+
+    def _update_partition(self, updates: pd.DataFrame, partition: pa.Table | None = None) -> list[str]:
+        """Rewrite the gw=N partition with the changed rows; return the affected managers."""
+        partition = partition if partition is not None else read_partition(self.paths["gw_dataset"], self.gw)
+        df = to_pandas(partition)
+        rows = df["player_id"].isin(updates.index).to_numpy()
+        old_points = df.loc[rows, "gw_points"].to_numpy()
+
+        values = updates.reindex(df.loc[rows, "player_id"])
+        for column in values.columns:
+            if column in df.columns:
+                df.loc[rows, column] = values[column].to_numpy()
+
+        # Positions (for the scores) and ownership from the star tables
+        wide = join(df, *self._star_tables())
+        changed = add_defensive_points(wide.loc[rows])
+        for column in SCORING_COLUMNS:
+            df.loc[rows, column] = changed[column].to_numpy()
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        final.write_gw_partition(conform(table, partition.schema), self.gw, self.paths["gw_dataset"])
+
+        for player_id, row in changed.set_index("player_id")[list(values.columns) + SCORING_COLUMNS].iterrows():
+            self.players[int(player_id)] = {column: _json_value(value) for column, value in row.items()}
+
+        # Starting-XI point changes of the owners, patched into the aggregates
+        starting = starting_xi(changed).to_numpy(dtype=bool)
+        diffs = changed.loc[starting, ["manager_team_name", "gw", "position"]].assign(
+            points_diff=changed.loc[starting, "gw_points"].to_numpy().astype("int64") - old_points[starting]
+        )
+        diffs = diffs[diffs["points_diff"] != 0]
+        if not diffs.empty:
+            aggregates = read_aggregates(self.paths["aggregates_dir"])
+            if aggregates is not None:
+                save_aggregates(apply_point_changes(aggregates, diffs), self.paths["aggregates_dir"])
+
+        managers = sorted(str(m) for m in changed.loc[changed["manager_id"].notna(), "manager_team_name"].unique())
+        owned = wide[starting_xi(wide)]
+        totals = owned.groupby(owned["manager_team_name"].astype(str))["gw_points"].sum()
+        self.managers.update({manager: int(totals.get(manager, 0)) for manager in managers})
+        return managers
+
+    def _write_delta(self):
+        delta = {
+            "gw": self.gw,
+            "seq": self.seq,
+            "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "players": [{"player_id": player_id, **values} for player_id, values in sorted(self.players.items())],
+            "managers": [{"manager_team_name": name, "gw_points": points} for name, points in sorted(self.managers.items())],
+        }
+        data = json.dumps(delta, default=_json_value).encode()
+        tmp_path = f"{self.delta_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.delta_path)
+        metrics.add_rows(self.delta_path, len(delta["players"]))
+
+
+# ------------------ MAIN ------------------ #
+def main(gw: int | None = None, interval: float = POLL_INTERVAL, polls: int | None = None,
+         data_dir: str | None = None):
+    gw = gw or final.fetch_current_gameweek()
+    if not gw:
+        logging.error("Aborting: could not fetch current gameweek.")
+        return
+
+    session = LiveSession(gw, data_dir=data_dir)
+    logging.info(f"🔴 Live mode for GW{gw}: polling every {interval:g}s (Ctrl+C to stop)")
+    count = 0
+    try:
+        while True:
+            session.poll()
+            count += 1
+            if polls is not None and count >= polls:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    logging.info(f"🏁 Live mode stopped after {count} polls ({session.seq} deltas written)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll the live gameweek and update the current GW partition in place.")
+    parser.add_argument("--gw", type=int, help="Gameweek to follow (current by default).")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Seconds between polls.")
+    parser.add_argument("--polls", type=int, help="Stop after this many polls.")
+    parser.add_argument("--data-dir", help="League folder to update (Data/ by default).")
+    args = parser.parse_args()
+    main(gw=args.gw, interval=args.interval, polls=args.polls, data_dir=args.data_dir)
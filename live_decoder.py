@@ -0,0 +1,128 @@
+import pyarrow as pa
+
+from schema import typed_array
+
+# ------------------ SCHEMA ------------------ #
+# Stats of event/{gw}/live, typed as their published gw_* columns (schema.py).
+# Stats missing from a payload are null; stats not listed here are ignored.
+LIVE_STATS = {
+    "minutes":                          pa.int16(),
+    "goals_scored":                     pa.int8(),
+    "assists":                          pa.int8(),
+    "clean_sheets":                     pa.int8(),
+    "goals_conceded":                   pa.int8(),
+    "own_goals":                        pa.int8(),
+    "penalties_saved":                  pa.int8(),
+    "penalties_missed":                 pa.int8(),
+    "yellow_cards":                     pa.int8(),
+    "red_cards":                        pa.int8(),
+    "saves":                            pa.int8(),
+    "bonus":                            pa.int8(),
+    "bps":                              pa.int16(),
+    "influence":                        pa.float32(),
+    "creativity":                       pa.float32(),
+    "threat":                           pa.float32(),
+    "ict_index":                        pa.float32(),
+    "starts":                           pa.int8(),
+    "expected_goals":                   pa.float32(),
+    "expected_assists":                 pa.float32(),
+    "expected_goal_involvements":       pa.float32(),
+    "expected_goals_conceded":          pa.float32(),
+    "clearances_blocks_interceptions":  pa.int8(),
+    "recoveries":                       pa.int8(),
+    "tackles":                          pa.int8(),
+    "defensive_contribution":           pa.int8(),
+    "total_points":                     pa.int8(),
+    "in_dreamteam":                     pa.bool_(),
+}
+
+# Same column names as the rows utils.get_player_gw_data used to build
+LIVE_SCHEMA = pa.schema([("id", pa.int16()), ("gameweek", pa.int16()), *LIVE_STATS.items()])
+
+# One row per (player, fixture, scoring stat) of the "explain" breakdown
+EXPLAIN_SCHEMA = pa.schema([
+    ("id", pa.int16()),
+    ("gameweek", pa.int16()),
+    ("fixture", pa.int32()),
+    ("stat", pa.dictionary(pa.int32(), pa.string())),
+    ("value", pa.float32()),
+    ("points", pa.int16()),
+])
+
+
+# ------------------ HELPERS ------------------ #
+def _elements(data: dict) -> tuple[list, list]:
+    """(player ids, element dicts) of a live payload ({id: element} or a list of elements with "id")."""
+    elements = (data or {}).get("elements") or {}
+    if isinstance(elements, dict):
+        return list(elements.keys()), list(elements.values())
+    return [e.get("id") for e in elements], list(elements)
+
+
+def _explain_entry(entry) -> tuple:
+    """(fixture, stat dicts) of one explain entry: {"fixture", "stats"} or [stats, fixture]."""
+    if isinstance(entry, dict):
+        return entry.get("fixture"), entry.get("stats") or []
+    if isinstance(entry, (list, tuple)) and entry:
+        return (entry[1] if len(entry) > 1 else None), entry[0] or []
+    return None, []
+
+
+# ------------------ DECODERS ------------------ #
+def decode_live(data: dict, gameweek: int) -> pa.Table:
+    """
+    Decode the stats of an event/{gw}/live payload into an Arrow table.
+
+    Each stat is gathered straight into one typed column (LIVE_SCHEMA); no
+    per-player row dicts are built and the payload is not modified.
+
+    Args:
+        data (dict): Parsed JSON payload.
+        gameweek (int): Gameweek of the payload.
+
+    Returns:
+        pa.Table: One row per player (empty if the payload has no elements).
+    """
+    ids, elements = _elements(data)
+    stats = [element.get("stats") or {} for element in elements]
+    columns = [
+        typed_array(ids, pa.int16()),
+        pa.array([gameweek] * len(ids), pa.int16()),
+        *(typed_array([s.get(name) for s in stats], type_) for name, type_ in LIVE_STATS.items()),
+    ]
+    return pa.Table.from_arrays(columns, schema=LIVE_SCHEMA)
+
+
+def decode_explain(data: dict, gameweek: int) -> pa.Table:
+    """
+    Decode the per-fixture points breakdown ("explain") of a live payload.
+
+    Args:
+        data (dict): Parsed JSON payload.
+        gameweek (int): Gameweek of the payload.
+
+    Returns:
+        pa.Table: EXPLAIN_SCHEMA rows (player, fixture, stat, value, points).
+    """
+    ids, fixtures, names, values, points = [], [], [], [], []
+    for player_id, element in zip(*_elements(data)):
+        for entry in element.get("explain") or []:
+            fixture, entries = _explain_entry(entry)
+            for item in entries:
+                ids.append(player_id)
+                fixtures.append(fixture)
+                names.append(item.get("identifier") or item.get("stat") or item.get("name"))
+                values.append(item.get("value"))
+                points.append(item.get("points"))
+
+    return pa.Table.from_arrays(
+        [
+            typed_array(ids, pa.int16()),
+            pa.array([gameweek] * len(ids), pa.int16()),
+            typed_array(fixtures, pa.int32()),
+            pa.array(names, pa.string()).dictionary_encode(),
+            typed_array(values, pa.float32()),
+            typed_array(points, pa.int16()),
+        ],
+        schema=EXPLAIN_SCHEMA,
+    )
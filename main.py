@@ -1,13 +1,17 @@
 import os
+import sys
+import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from league  import get_league_standings
 from players import get_player_data
 import final 
+from utils import BASE_URL
+from http_cache import response_cache, shared_fetches
+from metrics import RUN_REPORT_PATH, metrics
 
 ###########################################################Endpoints###########################################################
-# Define URLs
-BASE_URL            = "https://draft.premierleague.com/api"
 
 #Our league ID 
 LEAGUE_ID           = '24636'
@@ -27,12 +31,52 @@ GW_URL              = f"{BASE_URL}/event/"
 #Player data endpoint
 PLAYER_DATA_URL     = f"{BASE_URL}/bootstrap-static"
 
+#Per-league output folders of a batch run, and how many leagues run at once
+LEAGUES_DIR         = "Data/leagues"
+MAX_LEAGUES         = 4
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 #################################################################################################################################
 
+def run_league(league_id: int, full: bool = False, parallel: bool = False, data_dir: str | None = None,
+               players_csv: bool = False):
+    """
+    Fetch a league's standings and the player data, then build its gameweek data.
+
+    Args:
+        league_id (int): Draft league ID.
+        full (bool): Rebuild every gameweek instead of only changed ones.
+        parallel (bool): Build gameweeks across a process pool.
+        data_dir (str | None): Folder receiving the league's files (Data/ by default).
+        players_csv (bool): Also export the players table as players_data.csv.
+    Returns:
+        list[int] | None: Failed gameweeks, or None if the build was aborted.
+    """
+    folder = data_dir or final.DATA_DIR
+    os.makedirs(folder, exist_ok=True)
+
+    # Fetch and save league standings data with just managers' information
+    logging.info(f"Fetching league standings for league {league_id}...")
+    with metrics.stage("league_standings"):
+        get_league_standings(league_id, output_file=os.path.join(folder, "league_standings.csv"))
+
+    # Player data
+    logging.info("Fetching player data...")
+    with metrics.stage("player_data"):
+        get_player_data(
+            output_file=os.path.join(folder, "players_data.parquet"),
+            csv_file=os.path.join(folder, "players_data.csv") if players_csv else None,
+        )
+
+    logging.info("✅ Data extraction completed successfully.")
+    logging.info("Running final data processing...")
+    with metrics.stage("final"):
+        return final.main(full=full, parallel=parallel, data_dir=data_dir)
+
 # Main function to execute the data extraction script
-def run_pipeline(league_id: int):
+def run_pipeline(league_id: int, full: bool = False, parallel: bool = False, report_path: str = RUN_REPORT_PATH,
+                 players_csv: bool = False):
     """
     Main function to execute the data extraction script.
     This function performs the following tasks:
@@ -42,33 +86,117 @@ def run_pipeline(league_id: int):
     4. Fetches and saves player data.
     5. Prints a completion message.
     6. Saves the data as CSV files in the 'Data' folder.
+    7. Writes the run report (stage times, requests, rows, peak RSS) to report_path.
+    Args:
+        league_id (int): Draft league ID.
+        full (bool): Rebuild every gameweek instead of only changed ones.
+        parallel (bool): Build gameweeks across a process pool.
+        report_path (str): Where to write the JSON run report.
+        players_csv (bool): Also export the players table as CSV.
     Returns:
-        None
+        list[int] | None: Failed gameweeks, or None if the build was aborted.
     """
 
     logging.info("🚀 Starting FPL Draft data extraction pipeline...")
-    
-
-    # Ensure the data directory exists
-    if not os.path.exists('Data'):
-        os.makedirs('Data', exist_ok=True)
+    metrics.reset()
 
-    # Fetch and save league standings data with just managers' information
-    logging.info("Fetching league standings...")
-    get_league_standings(league_id, output_file="Data/league_standings.csv")
-
-    # Player data
-    logging.info("Fetching player data...")
-    get_player_data(output_file="Data/players_data.csv")
-
-    logging.info("✅ Data extraction completed successfully.")
-    logging.info("Running final data processing...")
-    final.main()
-
-    logging.info("✅ Pipeline completed successfully.")
+    try:
+        failed = run_league(league_id, full=full, parallel=parallel, players_csv=players_csv)
+    finally:
+        metrics.write(report_path)
+
+    if failed is None:
+        logging.error("❌ Pipeline aborted.")
+    elif failed:
+        logging.error(f"❌ Pipeline completed with failed gameweeks: {failed}")
+    else:
+        logging.info("✅ Pipeline completed successfully.")
+    return failed
+
+def run_batch(
+    league_ids: list[int],
+    full: bool = False,
+    parallel: bool = False,
+    out_dir: str = LEAGUES_DIR,
+    max_leagues: int = MAX_LEAGUES,
+    report_path: str = RUN_REPORT_PATH,
+    players_csv: bool = False,
+) -> dict[int, dict]:
+    """
+    Run the pipeline for several leagues concurrently, one output folder per league.
+
+    League-independent payloads (bootstrap-static, game, event/{gw}/live) are
+    fetched once for the whole batch: concurrent requests for the same URL
+    wait for a single in-flight fetch (http_cache.SingleFlight). A failing
+    league is logged and reported without stopping the others.
+    Args:
+        league_ids (list[int]): Draft league IDs.
+        full (bool): Rebuild every gameweek instead of only changed ones.
+        parallel (bool): Build gameweeks across a process pool.
+        out_dir (str): Parent folder of the per-league folders (out_dir/<league_id>).
+        max_leagues (int): Leagues processed at once.
+        report_path (str): Where to write the JSON run report of the batch.
+        players_csv (bool): Also export each league's players table as CSV.
+    Returns:
+        dict[int, dict]: {league_id: {"data_dir", "failed_gameweeks" or "error"}}.
+    """
+    logging.info(f"🚀 Starting batch extraction for {len(league_ids)} leagues...")
+    metrics.reset()
+
+    def run_one(league_id: int) -> dict:
+        data_dir = os.path.join(out_dir, str(league_id))
+        try:
+            with metrics.stage(f"league_{league_id}"):
+                failed = run_league(league_id, full=full, parallel=parallel, data_dir=data_dir, players_csv=players_csv)
+        except Exception as e:
+            logging.error(f"❌ League {league_id} failed: {e!r}")
+            return {"data_dir": data_dir, "error": repr(e)}
+        if failed is None:
+            return {"data_dir": data_dir, "error": "gameweek build aborted"}
+        return {"data_dir": data_dir, "failed_gameweeks": failed}
+
+    results = {}
+    try:
+        with shared_fetches.run(), ThreadPoolExecutor(max_workers=max(1, min(max_leagues, len(league_ids)))) as executor:
+            results = dict(zip(league_ids, executor.map(run_one, league_ids)))
+    finally:
+        metrics.set("leagues", {str(league_id): result for league_id, result in results.items()})
+        # final.main sets these per league; each league overwrote the previous one, so set them for the batch
+        metrics.set("http_cache", dict(response_cache.stats))
+        metrics.set("failed_gameweeks", {
+            str(league_id): result.get("failed_gameweeks", []) for league_id, result in results.items()
+        })
+        metrics.set("shared_fetches", dict(shared_fetches.stats))
+        metrics.write(report_path)
+
+    failed = batch_failed(results)
+    logging.info(
+        f"✅ Batch completed: {len(league_ids) - len(failed)} of {len(league_ids)} leagues succeeded; "
+        f"{shared_fetches.stats['shared']} shared fetches reused"
+    )
+    return results
+
+def batch_failed(results: dict[int, dict]) -> list[int]:
+    """League IDs of a run_batch result that errored or have failed gameweeks."""
+    return [league_id for league_id, result in results.items() if "error" in result or result["failed_gameweeks"]]
 
 # Main function
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FPL Draft data extraction pipeline.")
+    parser.add_argument("--full", action="store_true", help="Rebuild every gameweek, ignoring the manifest.")
+    parser.add_argument("--parallel", action="store_true", help="Build gameweeks across a process pool.")
+    parser.add_argument("--players-csv", action="store_true", help="Also export players_data.csv.")
+    parser.add_argument("--leagues", type=int, nargs="+", metavar="ID", help="Process several leagues concurrently.")
+    parser.add_argument("--out-dir", default=LEAGUES_DIR, help="Parent folder of the per-league outputs with --leagues.")
+    parser.add_argument("--max-leagues", type=int, default=MAX_LEAGUES, help="Leagues processed at once with --leagues.")
+    args = parser.parse_args()
+
+    # Non-zero exit status on any failure, so CI does not upload partial data
+    if args.leagues:
+        results = run_batch(args.leagues, full=args.full, parallel=args.parallel, out_dir=args.out_dir,
+                            max_leagues=args.max_leagues, players_csv=args.players_csv)
+        sys.exit(1 if batch_failed(results) else 0)
+
     # Ask user for league ID
     try:
         league_id = int(input("Enter your League ID: "))
@@ -76,4 +204,5 @@ if __name__ == "__main__":
         print("❌ Invalid input. Please enter a numeric League ID.")
         exit(1)
 
-    run_pipeline(league_id) 
\ No newline at end of file
+    failed = run_pipeline(league_id, full=args.full, parallel=args.parallel, players_csv=args.players_csv)
+    sys.exit(1 if failed is None or failed else 0) 
\ No newline at end of file
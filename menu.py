@@ -3,13 +3,12 @@ import streamlit as st
 import requests
 from datetime import datetime, timezone
 
-import supabase
+from data_store import get_store
 from data_utils import (
-    load_data,
     get_next_gameweek,
     get_upcoming_fixtures,
-    get_starting_lineup,
-    get_team_total_points
+    get_season_totals,
+    get_remote_storage
 )
 
 # --- GITHUB ACTIONS ETL TRIGGER ---
@@ -39,7 +38,9 @@ st.title("⚽ Fantasy Premier League Draft Dashboard")
 st.markdown("### Select a page to view detailed stats")
 
 # --- LOAD DATA ---
-df, standings, gameweeks, fixtures = load_data()
+# Shared by every page and session; reloaded automatically after an ETL run
+store = get_store()
+standings, gameweeks, fixtures = store.reference_data()
 
 # --- NEXT GAMEWEEK & UPCOMING FIXTURES ---
 now = datetime.now(timezone.utc)
@@ -69,7 +70,8 @@ for i in range(0, len(manager_buttons), cols_per_row):
         with cols[j]:
             if st.button(name, use_container_width=True):
                 st.session_state["current_page"] = name
-                st.switch_page(f"pages/{name}.py")
+                st.session_state["manager"] = name
+                st.switch_page("pages/Managers.py")
 
 st.divider()
 
@@ -93,8 +95,7 @@ left_col, right_col = st.columns([1.5, 1])
 
 with left_col:
     st.subheader("🏆 League Table / Total Team Points")
-    starting_players = get_starting_lineup(df)
-    team_total_points = get_team_total_points(starting_players)
+    team_total_points = get_season_totals(store.aggregates())
     st.dataframe(team_total_points, hide_index=True, use_container_width=True)
 
 with right_col:
@@ -126,9 +127,15 @@ if st.button("Run ETL Pipeline"):
 
 def get_last_update():
     try:
-        data = supabase.storage.from_("data").download("last_updated.txt")
+        data = get_remote_storage().download("last_updated.txt")
         return data.decode("utf-8")
     except:
         return "Never"
 
 st.info(f"📅 Last pipeline update: {get_last_update()}")
+
+memory = store.memory_usage()
+st.caption(
+    f"🧠 Data store v{store.version}: {sum(memory.values()) / 2**20:.1f} MiB in memory "
+    f"({', '.join(f'{name} {size / 2**20:.1f}' for name, size in memory.items())})"
+)
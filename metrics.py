@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ------------------ CONFIG ------------------ #
+RUN_REPORT_PATH = "Data/run_report.json"
+PERCENTILES     = (50, 90, 95, 99)
+
+
+# ------------------ HELPERS ------------------ #
+def peak_rss_mb(who: str = "self") -> Optional[float]:
+    """Peak resident set size (MiB) of this process ("self") or its finished children ("children")."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return round(usage / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Nearest-rank percentiles (and max) of latencies in seconds, reported in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {
+        f"p{p}": round(ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] * 1000, 1)
+        for p in PERCENTILES
+    }
+    result["max"] = round(ordered[-1] * 1000, 1)
+    return result
+
+
+# ------------------ RUN METRICS ------------------ #
+class RunMetrics:
+    """
+    Thread-safe counters for one pipeline run, written out as a JSON run report.
+
+    Stages are timed with the stage() context manager (nested stages are
+    reported as "outer/inner"); utils.fetch_data records every request and
+    retry per endpoint family; writers record the rows they write.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc)
+            self._start = time.perf_counter()
+            self.stages = []
+            self.latencies = defaultdict(list)
+            self.requests = defaultdict(lambda: {"count": 0, "errors": 0, "cached": 0, "retries": 0, "bytes": 0})
+            self.rows = defaultdict(int)
+            self.extra = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block of the run."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(name)
+        path = "/".join(stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                self.stages.append({"name": path, "seconds": round(seconds, 3), "peak_rss_mb": peak_rss_mb()})
+            logging.info(f"⏱️ {path}: {seconds:.2f}s")
+
+    def record_request(self, family: str, seconds: float, size: int, ok: bool = True):
+        """One HTTP response (or failed attempt) of an endpoint family."""
+        with self._lock:
+            stats = self.requests[family]
+            stats["count"] += 1
+            stats["bytes"] += size
+            if not ok:
+                stats["errors"] += 1
+            self.latencies[family].append(seconds)
+
+    def record_cached(self, family: str):
+        """A response served from the HTTP cache without a request."""
+        with self._lock:
+            self.requests[family]["cached"] += 1
+
+    def record_retry(self, family: str):
+        with self._lock:
+            self.requests[family]["retries"] += 1
+
+    def add_rows(self, output: str, rows: int):
+        """Rows written to an output file or table."""
+        with self._lock:
+            self.rows[output] += int(rows)
+
+    def set(self, key: str, value):
+        """Attach another section (e.g. HTTP cache counters) to the report."""
+        with self._lock:
+            self.extra[key] = value
+
+    def report(self) -> dict:
+        """The run report as a JSON-serialisable dict."""
+        with self._lock:
+            requests = {
+                family: {**stats, "latency_ms": percentiles(self.latencies[family])}
+                for family, stats in sorted(self.requests.items())
+            }
+            return {
+                "started_at": self.started_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "finished_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "wall_seconds": round(time.perf_counter() - self._start, 3),
+                "stages": list(self.stages),
+                "requests": requests,
+                "totals": {
+                    key: sum(stats[key] for stats in self.requests.values())
+                    for key in ("count", "errors", "cached", "retries", "bytes")
+                },
+                "rows": dict(self.rows),
+                "peak_rss_mb": peak_rss_mb(),
+                "peak_child_rss_mb": peak_rss_mb("children"),
+                **self.extra,
+            }
+
+    def write(self, path: str = RUN_REPORT_PATH) -> dict:
+        """Write the run report next to the data and log a one-line summary."""
+        report = self.report()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        totals = report["totals"]
+        logging.info(
+            f"🧾 Run report: {report['wall_seconds']:.1f}s, {totals['count']} requests "
+            f"({totals['retries']} retries, {totals['bytes'] / 2**20:.2f} MiB), "
+            f"peak RSS {report['peak_rss_mb']} MiB -> {path}"
+        )
+        return report
+
+
+metrics = RunMetrics()
@@ -1,63 +1,28 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
-from visuals_utils import calc_defensive_points
+from data_store import get_store
+from fixture_index import attach_fixtures
 
 # ---------------- CONFIG ----------------
 st.set_page_config(layout="wide")
-GW_DATA_PATH   = "Data/gw_data.parquet"
-STANDINGS_PATH = "Data/league_standings.csv"
-FIXTURES_PATH = "Data/fixtures.csv"
-fixtures = pd.read_csv(FIXTURES_PATH)
+store = get_store()
 
 # ---------------- LOAD DATA ----------------
-@st.cache_data
-def load_data():
-    df = pd.read_parquet(GW_DATA_PATH)
-    standings = pd.read_csv(STANDINGS_PATH)
-    return df, standings
-
-df, standings = load_data()
+# Latest GW rows and the view's columns, sliced from the shared data store
+# (def_points / progress / total_contributions are precomputed by scoring.py)
+latest_gw = max(store.gameweeks())
+df = store.view("current_gameweek", gw_range=(latest_gw, latest_gw))
 
 #---------------- OPERATIONS ----------------
-latest_gw = df["gw"].max()
-latest_df = df[df["gw"] == latest_gw].copy()
-
-# Create fixture name column (e.g. "Liverpool vs Bournemouth")
-fixtures["fixture_name"] = fixtures["team_h_name"] + " vs " + fixtures["team_a_name"]
-
-
-# --- 1️⃣ Merge by home team ---
-merged = latest_df.merge(
-    fixtures[["event", "team_h_name", "team_a_name", "fixture_name"]],
-    left_on=["gw", "real_team"],
-    right_on=["event", "team_h_name"],
-    how="left"
-)
-
-# --- 2️⃣ Identify which rows didn’t match ---
-mask_missing = merged["fixture_name"].isna()
-
-# --- 3️⃣ Merge again for away teams, but only on those missing rows ---
-away_merged = merged.loc[mask_missing, ["gw", "real_team"]].merge(
-    fixtures[["event", "team_h_name", "team_a_name", "fixture_name"]],
-    left_on=["gw", "real_team"],
-    right_on=["event", "team_a_name"],
-    how="left"
-)
-
-# --- 4️⃣ Fill fixture_name for those missing ---
-merged.loc[mask_missing, "fixture_name"] = away_merged["fixture_name"].values
-
-# --- 5️⃣ Clean up ---
-latest_df = merged.drop(columns=["event", "team_h_name", "team_a_name"], errors="ignore")
+# Fixture name (e.g. "Liverpool vs Bournemouth") from the (gameweek, team) fixture index
+latest_df = attach_fixtures(df, store.fixture_lookup(), columns=["fixture_name"])
 
 print(latest_df[["real_team", "fixture_name"]].drop_duplicates().head(10))
-
-latest_df[["def_points", "progress", "total_contributions"]] = latest_df.apply(calc_defensive_points, axis=1)
 # ---------------- DASHBOARD TITLE ------------------
 st.title(f"FPL Draft Current Gameweek {latest_gw}")
+if store.live and store.live["gw"] == latest_gw:
+    st.caption(f"🔴 Live scores, updated {store.live['updated_at']} (update #{store.live['seq']})")
 
 st.subheader("🛡️ Defensive Contributions Points")
 
@@ -92,5 +57,5 @@ for fixture in latest_df["fixture_name"].unique():
             st.markdown(f"### {team}")
             for _, row in top5.iterrows():
                 st.text(f"{row['short_name']} ({row['position']})")
-                st.progress(row["progress"])
+                st.progress(float(row["progress"]))
                 st.caption(f"Total contributions: {row['total_contributions']} | Defensive points: {row['def_points']}")
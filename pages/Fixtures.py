@@ -3,23 +3,21 @@ import pandas as pd
 import streamlit.components.v1 as components
 from datetime import datetime, timezone
 import base64
+import numpy as np
 from pathlib import Path
 
+from data_store import get_store
+from fixture_index import TEAM_NAMES
+
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="FPL Fixtures", layout="wide")
 
 # --- LOAD DATA ---
-fixtures = pd.read_csv("Data/fixtures.csv")
+store = get_store()
+_, _, fixtures = store.reference_data()
 
 # --- TEAM MAPPINGS ---
-teams = {
-        1: "Arsenal", 2: "Aston Villa", 3: "Burnley", 4: "Bournemouth",
-        5: "Brentford", 6: "Brighton", 7: "Chelsea", 8: "Crystal Palace",
-        9: "Everton", 10: "Fulham", 11: "Leeds United", 12: "Liverpool",
-        13: "Manchester City", 14: "Manchester United", 15: "Newcastle United",
-        16: "Nottingham Forest", 17: "Sunderland", 18: "Tottenham",
-        19: "West Ham", 20: "Wolverhampton"
-    }
+teams = TEAM_NAMES
 
 fixtures["team_h_name"] = fixtures["team_h"].map(teams)
 fixtures["team_a_name"] = fixtures["team_a"].map(teams)
@@ -33,7 +31,12 @@ def img_to_base64(path):
         data = f.read()
     return "data:image/png;base64," + base64.b64encode(data).decode()
 
-team_badges = {team: img_to_base64(f"assets/badges/{team}.png") for team in teams.values()}
+@st.cache_resource(show_spinner=False)
+def load_team_badges():
+    """Badge data URIs, encoded once per server process."""
+    return {team: img_to_base64(f"assets/badges/{team}.png") for team in teams.values()}
+
+team_badges = load_team_badges()
 
 # --- DIFFICULTY FUNCTIONS ---
 def difficulty_emoji(difficulty):
@@ -66,61 +69,78 @@ for _, row in gw_fixtures.iterrows():
     st.markdown("---")
 
 # --- TABLE DATA ---
-teams_list = sorted(teams.values())
-table_data = pd.DataFrame(index=teams_list, columns=gameweeks)
-difficulty_data = pd.DataFrame(index=teams_list, columns=gameweeks)
-badge_data = pd.DataFrame(index=teams_list, columns=gameweeks)
-
-for _, row in fixtures.iterrows():
-    gw = row["event"]
-    home, away = row["team_h_name"], row["team_a_name"]
-    table_data.loc[home, gw] = f"{away} (h)"
-    difficulty_data.loc[home, gw] = row["team_h_difficulty"]
-    badge_data.loc[home, gw] = team_badges[away]
-    table_data.loc[away, gw] = f"{home} (a)"
-    difficulty_data.loc[away, gw] = row["team_a_difficulty"]
-    badge_data.loc[away, gw] = team_badges[home]
+def build_fixture_matrices(fixtures):
+    """
+    Team x GW opponent labels and difficulties.
+    Each fixture gives one row per side; if a team plays twice in a GW the later fixture wins.
+    """
+    fixtures = fixtures.dropna(subset=["event"]).reset_index(drop=True)
+    home = pd.DataFrame({
+        "team": fixtures["team_h_name"], "gw": fixtures["event"],
+        "label": fixtures["team_a_name"] + " (h)", "difficulty": fixtures["team_h_difficulty"],
+    })
+    away = pd.DataFrame({
+        "team": fixtures["team_a_name"], "gw": fixtures["event"],
+        "label": fixtures["team_h_name"] + " (a)", "difficulty": fixtures["team_a_difficulty"],
+    })
+    sides = (
+        pd.concat([home, away], keys=[0, 1], names=["side", "fixture"])
+        .reset_index()
+        .sort_values(["fixture", "side"])
+        .drop_duplicates(["team", "gw"], keep="last")
+    )
+    teams_list = sorted(teams.values())
+    table_data = sides.pivot(index="team", columns="gw", values="label").reindex(index=teams_list, columns=gameweeks)
+    difficulty_data = sides.pivot(index="team", columns="gw", values="difficulty").reindex(index=teams_list, columns=gameweeks)
+    return table_data, difficulty_data
+
+def difficulty_bg_colors(difficulty_data):
+    """Vectorized difficulty_bg_color over a whole matrix."""
+    values = difficulty_data.to_numpy(dtype=float)
+    colors = np.select(
+        [values <= 2, values == 3, values == 4],
+        ["#6ebd2e", "#dadab57a", "#EE3000"],
+        default="#793131",
+    )
+    return pd.DataFrame(colors, index=difficulty_data.index, columns=difficulty_data.columns)
+
+# --- BUILD HTML TABLE WITH TEAM BADGES ONLY IN FIRST COLUMN ---
+@st.cache_data(show_spinner=False)
+def render_fixture_table(fixtures_version, start_gw, _fixtures):
+    """
+    HTML of the fixture difficulty table from start_gw onwards.
+    Cached per (data store version, start GW); _fixtures is not hashed.
+    """
+    table_data, difficulty_data = build_fixture_matrices(_fixtures)
+    filtered_gameweeks = [gw for gw in gameweeks if gw >= start_gw]
+    filtered_table_data = table_data[filtered_gameweeks]
+    filtered_colors = difficulty_bg_colors(difficulty_data[filtered_gameweeks])
+
+    header_style = "border:1px solid #ddd; padding:8px; color:white; background-color:#111;"
+    html = [
+        "<div style='overflow-x:auto; overflow-y:auto; height:1350px; padding:10px;'>",
+        "<table style='border-collapse:collapse; width:100%; font-size:16px;'>",
+        f"<tr><th style='{header_style}'>Team</th>",
+        *(f"<th style='{header_style}'>GW{int(gw)}</th>" for gw in filtered_gameweeks),
+        "</tr>",
+    ]
+    for team, cells, colors in zip(filtered_table_data.index, filtered_table_data.to_numpy(), filtered_colors.to_numpy()):
+        html.append(
+            f"<tr><td style='border:1px solid #ddd; padding:8px; font-weight:bold; color:white; background-color:#111'>"
+            f"<img src='{team_badges[team]}' width='30' style='vertical-align:middle;'> {team}</td>"
+        )
+        for cell, color in zip(cells, colors):
+            if pd.isna(cell):
+                html.append("<td style='border:1px solid #ddd; padding:8px; text-align:center; color:white; background-color:#000'>-</td>")
+            else:
+                html.append(f"<td style='border:1px solid #ddd; padding:8px; text-align:center; background-color:{color}; color:#000; vertical-align:middle'>{cell}</td>")
+        html.append("</tr>")
+    html.append("</table></div>")
+    return "".join(html)
 
 # --- NEXT UPCOMING GAMEWEEK ---
 now = datetime.now(timezone.utc)
 upcoming_fixtures = fixtures[fixtures["kickoff_time"] >= now]
 next_gw = upcoming_fixtures["event"].min() if not upcoming_fixtures.empty else max(gameweeks)
 
-filtered_gameweeks = [gw for gw in gameweeks if gw >= next_gw]
-filtered_table_data = table_data[filtered_gameweeks]
-filtered_difficulty_data = difficulty_data[filtered_gameweeks]
-filtered_badge_data = badge_data[filtered_gameweeks]
-
-# --- BUILD HTML TABLE WITH TEAM BADGES ONLY IN FIRST COLUMN ---
-html = """
-<div style='overflow-x:auto; overflow-y:auto; height:1350px; padding:10px;'>
-<table style='border-collapse:collapse; width:100%; font-size:16px;'>
-<tr>
-<th style='border:1px solid #ddd; padding:8px; color:white; background-color:#111;'>Team</th>
-"""
-
-# Header GW columns
-for gw in filtered_gameweeks:
-    html += f"<th style='border:1px solid #ddd; padding:8px; color:white; background-color:#111;'>GW{int(gw)}</th>"
-html += "</tr>"
-
-# Data rows
-for team in filtered_table_data.index:
-    team_badge = team_badges[team]  # Only in first column
-    html += f"""
-    <tr>
-        <td style='border:1px solid #ddd; padding:8px; font-weight:bold; color:white; background-color:#111'>
-            <img src='{team_badge}' width='30' style='vertical-align:middle;'> {team}
-        </td>
-    """
-    for gw in filtered_gameweeks:
-        cell = filtered_table_data.loc[team, gw]
-        if pd.isna(cell):
-            html += "<td style='border:1px solid #ddd; padding:8px; text-align:center; color:white; background-color:#000'>-</td>"
-        else:
-            color = difficulty_bg_color(filtered_difficulty_data.loc[team, gw])
-            html += f"<td style='border:1px solid #ddd; padding:8px; text-align:center; background-color:{color}; color:#000; vertical-align:middle'>{cell}</td>"
-    html += "</tr>"
-
-html += "</table></div>"
-components.html(html, height=1500, scrolling=True)
+components.html(render_fixture_table(store.version, next_gw, fixtures), height=1500, scrolling=True)
@@ -0,0 +1,32 @@
+import streamlit as st
+
+from data_store import get_store
+from visuals_utils import render_manager_page
+
+# ---------------- CONFIG ----------------
+st.set_page_config(layout="wide")
+
+# ---------------- MANAGER SELECTION ----------------
+# Every manager in the league standings; preselected by the menu buttons or a ?manager=... link
+store = get_store()
+standings, _, _ = store.reference_data()
+managers = sorted(standings["team_name"].dropna().unique().tolist())
+
+requested = st.session_state.get("manager") or st.query_params.get("manager")
+manager_name = st.selectbox(
+    "Select Manager",
+    options=managers,
+    index=managers.index(requested) if requested in managers else 0
+)
+st.session_state["manager"] = manager_name
+st.query_params["manager"] = manager_name
+
+# ---------------- LOAD DATA ----------------
+# Pre-sliced per manager once per data version (see DataStore.manager_slices)
+manager_df = store.manager_data(manager_name)
+if manager_df.empty:
+    st.error("⚠️ Manager not found in data")
+    st.stop()
+
+# ---------------- DASHBOARD ----------------
+render_manager_page(manager_name, manager_df)
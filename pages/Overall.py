@@ -1,25 +1,24 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from data_utils import load_data, get_starting_lineup, calculate_team_gw_points, get_teams_avg_points
+from data_store import get_store
+from data_utils import get_team_gw_points_table, get_teams_avg_points
 
 # ---------------- CONFIG ----------------
 st.set_page_config(page_title="FPL Draft Overall Dashboard", layout="wide")
 
 # ---------------- LOAD DATA ----------------
-@st.cache_data
-def load_all_data():
-    df, standings, gameweeks, fixtures = load_data()
-    return df, standings, gameweeks, fixtures
-
-df, standings, gameweeks, fixtures = load_all_data()
+store = get_store()
+standings, _, _ = store.reference_data()
+gameweek_list = store.gameweeks()
+team_names = sorted(standings['team_name'].dropna().unique())
 
 # ---------------- DASHBOARD TITLE ----------------
 st.title("FPL Draft Overall Dashboard")
 st.write("Explore managers and gameweek stats.")
 
 # ---------------- FILTERS ----------------
-min_gw, max_gw = int(df['gw'].min()), int(df['gw'].max())
+min_gw, max_gw = int(min(gameweek_list)), int(max(gameweek_list))
 selected_gw_range = st.slider(
     "Select Gameweek Range",
     min_value=min_gw,
@@ -28,20 +27,12 @@ selected_gw_range = st.slider(
 )
 selected_team = st.selectbox(
     "Select Manager",
-    options=[None] + sorted(df['manager_team_name'].dropna().unique())
+    options=[None] + team_names
 )
 
-# ---------------- FILTER DATA ----------------
-filtered_df = df[
-    (df['gw'] >= selected_gw_range[0]) &
-    (df['gw'] <= selected_gw_range[1])
-]
-if selected_team:
-    filtered_df = filtered_df[filtered_df['manager_team_name'] == selected_team]
-
 # ---------------- TEAM POINTS ----------------
-starting_players = get_starting_lineup(filtered_df)
-team_gw_points   = calculate_team_gw_points(starting_players)
+# Read from the pipeline's team x GW aggregate, filtered to the selected GWs (and manager)
+team_gw_points   = get_team_gw_points_table(store.aggregates(), gw_range=selected_gw_range, manager=selected_team)
 team_avg_points  = get_teams_avg_points(team_gw_points)
 
 st.subheader("🏆 Team Points by Gameweek (Starting XI)")
@@ -106,7 +97,7 @@ with col1:
 with col2:
     if not team_gw_points_melted.empty:
         team_cumsum = team_gw_points_melted.copy()
-        team_cumsum['season_points'] = team_cumsum.groupby('manager_team_name')['points'].cumsum()
+        team_cumsum['season_points'] = team_cumsum.groupby('manager_team_name', observed=True)['points'].cumsum()
         fig_cumsum = px.line(
             team_cumsum,
             x='gw',
@@ -1,22 +1,14 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
+from data_store import get_store
+
 # ---------------- CONFIG ----------------
 st.set_page_config(layout="wide")
-GW_DATA_PATH   = "Data/gw_data.parquet"
-STANDINGS_PATH = "Data/league_standings.csv"
-
-# ---------------- LOAD DATA ----------------
-@st.cache_data
-def load_data():
-    df = pd.read_parquet(GW_DATA_PATH)
-    standings = pd.read_csv(STANDINGS_PATH)
-    return df, standings
 
-df, standings = load_data()
 # ---------------- LOAD PLAYERS DATA ----------------
-players = pd.read_csv("Data/players_data.csv")
+store = get_store()
+players = store.players()
 
 
 # ---------------- DASHBOARD TITLE ------------------
@@ -29,8 +21,8 @@ if selected_player:
     players = players[players['name'] == selected_player]
 
 
-players = players[['name','team','Total points','position','Goals Scored','Assists','CS','xG','starts','yellow_cards','red_cards','news']]
-players.rename(columns={'name': 'Name', 'team': 'Team', 'Total points': 'Total Points', 'position': 'Position', 'Goals Scored': 'Goals Scored', 'Assists': 'Assists', 'CS': 'Clean Sheets', 'xG': 'xG', 'starts': 'Starts', 'yellow_cards': 'Yellow Cards', 'red_cards': 'Red Cards', 'news': 'News'}, inplace=True)
+players = players[['name','team','total_points','position','goals_scored','assists','CS','xG','starts','yellow_cards','red_cards','news']]
+players.rename(columns={'name': 'Name', 'team': 'Team', 'total_points': 'Total Points', 'position': 'Position', 'goals_scored': 'Goals Scored', 'assists': 'Assists', 'CS': 'Clean Sheets', 'xG': 'xG', 'starts': 'Starts', 'yellow_cards': 'Yellow Cards', 'red_cards': 'Red Cards', 'news': 'News'}, inplace=True)
 
 # Display filtered dataframe
 st.dataframe(players, use_container_width=True)
@@ -43,14 +35,14 @@ owned_only = st.checkbox("Show owned players")
 # Checkbox for not owned players only
 not_owned_only = st.checkbox("Show not owned players")
 
-if owned_only:
-    df = df[df['team_name'].notnull()]
+# Only the view's columns (and owned rows, when filtered), sliced from the shared data store
+df = store.view("players_data", owned_only=owned_only)
 
 if not_owned_only:
-    df = df[df['team_name'].isnull()]
+    df = df[df['manager_team_name'].isnull()]
 
-df = df[['team_name','name','team','Total points','gameweek','total_points','goals_scored','assists','bonus_x','minutes_x','expected_goals','expected_assists_x','defensive_contribution_x','position']]
-df.rename(columns={'team_name': 'Manager', 'name': 'Name', 'team': 'Team', 'Total points': 'Season Points', 'gameweek': 'Gameweek', 'total_points': 'GW Points', 'goals_scored': 'GW Goals', 'assists': 'GW Assists', 'bonus_x': 'GW Bonus', 'minutes_x': 'GW Minutes', 'expected_goals': 'GW xG', 'expected_assists_x': 'GW xA', 'defensive_contribution_x': 'GW Def Contribution', 'position': 'Position'}, inplace=True)
+df = df[['manager_team_name','full_name','real_team','season_points','gw','gw_points','gw_goals','gw_assists','gw_bonus','gw_minutes','gw_expected_goals','gw_expected_assists','gw_defensive_contribution','position']]
+df = df.rename(columns={'manager_team_name': 'Manager', 'full_name': 'Name', 'real_team': 'Team', 'season_points': 'Season Points', 'gw': 'Gameweek', 'gw_points': 'GW Points', 'gw_goals': 'GW Goals', 'gw_assists': 'GW Assists', 'gw_bonus': 'GW Bonus', 'gw_minutes': 'GW Minutes', 'gw_expected_goals': 'GW xG', 'gw_expected_assists': 'GW xA', 'gw_defensive_contribution': 'GW Def Contribution', 'position': 'Position'})
 
 # Display filtered dataframe
 st.dataframe(df, use_container_width=True)
\ No newline at end of file
@@ -1,81 +1,139 @@
 import logging
-from utils import fetch_data
+import os
+from utils import BASE_URL, fetch_data
+from fixture_index import TEAM_NAMES
+from metrics import metrics
+from schema import typed_array
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Define URLs
-BASE_URL            = "https://draft.premierleague.com/api"
 PLAYER_DATA_URL     = f"{BASE_URL}/bootstrap-static"
+PLAYERS_PATH        = "Data/players_data.parquet"
+
+# Columns of the players table, in order, with their types (season totals typed as
+# their season_* columns in schema.py). Other bootstrap-static fields are ignored;
+# fields missing from the API come out as nulls.
+PLAYERS_SCHEMA = pa.schema([
+    ("ID", pa.int16()),
+    ("assists", pa.int16()),
+    ("bonus", pa.int16()),
+    ("bps", pa.int16()),
+    ("CS", pa.int16()),
+    ("creativity", pa.float32()),
+    ("Gc", pa.int16()),
+    ("goals_scored", pa.int16()),
+    ("ict_index", pa.float32()),
+    ("influence", pa.float32()),
+    ("minutes", pa.int16()),
+    ("own_goals", pa.int8()),
+    ("penalties_missed", pa.int8()),
+    ("penalties_saved", pa.int8()),
+    ("red_cards", pa.int8()),
+    ("saves", pa.int16()),
+    ("threat", pa.float32()),
+    ("yellow_cards", pa.int8()),
+    ("starts", pa.int8()),
+    ("xG", pa.float32()),
+    ("expected_assists", pa.float32()),
+    ("expected_goal_involvements", pa.float32()),
+    ("xGc", pa.float32()),
+    ("clearances_blocks_interceptions", pa.int16()),
+    ("recoveries", pa.int16()),
+    ("tackles", pa.int16()),
+    ("defensive_contribution", pa.int16()),
+    ("added", pa.string()),
+    ("chance_of_playing_next_round", pa.float32()),
+    ("chance_of_playing_this_round", pa.float32()),
+    ("code", pa.int32()),
+    ("event_points", pa.int8()),
+    ("form", pa.float32()),
+    ("news", pa.string()),
+    ("news_added", pa.string()),
+    ("news_return", pa.string()),
+    ("news_updated", pa.string()),
+    ("squad_number", pa.int8()),
+    ("total_points", pa.int16()),
+    ("web_name", pa.string()),
+    ("position", pa.string()),
+    ("team", pa.string()),
+    ("name", pa.string()),
+])
+
+# Column -> bootstrap-static field, where the names differ
+API_FIELDS = {
+    "ID":  "id",
+    "CS":  "clean_sheets",
+    "Gc":  "goals_conceded",
+    "xG":  "expected_goals",
+    "xGc": "expected_goals_conceded",
+}
+
+POSITIONS = {1: 'GK', 2: 'DEF', 3: 'MID', 4: 'FWD'}
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
-#Gets all the players data and saves into a CSV file called players_data.csv in data folder
-def get_player_data(output_file: str = "Data/players_data.csv"):
+
+def build_players_table(elements: list[dict]) -> pa.Table:
+    """
+    Typed players table (PLAYERS_SCHEMA) from the bootstrap-static elements.
+
+    Each column is gathered straight from the elements; position and team IDs
+    are mapped to names and name joins first_name and second_name.
+    """
+    def field(name: str) -> list:
+        return [e.get(name) for e in elements]
+
+    derived = {
+        "position": [POSITIONS.get(t) for t in field("element_type")],
+        "team":     [TEAM_NAMES.get(t) for t in field("team")],
+        "name":     [" ".join(filter(None, [e.get("first_name"), e.get("second_name")])) or None for e in elements],
+    }
+    columns = [
+        typed_array(derived[f.name] if f.name in derived else field(API_FIELDS.get(f.name, f.name)), f.type)
+        for f in PLAYERS_SCHEMA
+    ]
+    return pa.Table.from_arrays(columns, schema=PLAYERS_SCHEMA)
+
+
+def conform_players(df: pd.DataFrame) -> pa.Table:
+    """Cast a players frame (e.g. an older players_data.csv) to PLAYERS_SCHEMA; missing columns are null."""
+    return pa.Table.from_arrays(
+        [
+            pa.array(df[f.name], from_pandas=True).cast(f.type) if f.name in df.columns else pa.nulls(len(df), f.type)
+            for f in PLAYERS_SCHEMA
+        ],
+        schema=PLAYERS_SCHEMA,
+    )
+
+
+#Gets all the players data and saves it as a Parquet file (players_data.parquet) in the data folder
+def get_player_data(output_file: str = PLAYERS_PATH, csv_file: str | None = None):
     """
-    Fetches player data, processes it, and saves it to a CSV file.
+    Fetches player data and saves it as a typed Parquet file.
     This function performs the following steps:
-    1. Fetches player data from a specified URL.
-    2. Extracts relevant fields from the player data.
-    3. Saves the processed player data to a CSV file.
-    4. Returns the player data as a pandas DataFrame.
-    Returns:
-        pd.DataFrame: A DataFrame containing player data with columns:
-                      ['ID', 'First_Name', 'Last_Name', 'Team', 'Position', 'Assists', 'bonus', 'Total points',
-                       'xA', 'CS', 'Gc', 'Goals Scored', 'minutes', 'red_cards', 'starts', 'xG',
-                       'xGi','xGc','code','PpG']
+    1. Fetches player data from the bootstrap-static endpoint.
+    2. Builds the PLAYERS_SCHEMA columns (names, types and order are fixed).
+    3. Saves the table to output_file (Parquet) and, if csv_file is given, to a CSV export.
+    Args:
+        output_file (str): Parquet file to write.
+        csv_file (str | None): Optional CSV copy of the same table.
     """
 
     data = fetch_data(PLAYER_DATA_URL)
     if not data or "elements" not in data:
         logging.error("No player data retrieved from API.")
         return []
-    
-    players = data["elements"]
-
-    # Convert list of dicts to DataFrame (includes all fields)
-    df = pd.DataFrame(players)
-    
-    
-
-    # Merge first_name and second_name into name and drop the original columns
-    df["name"] = df["first_name"] + " " + df["second_name"]
-    df.drop(["first_name", "second_name",'influence_rank',
-       'influence_rank_type', 'creativity_rank', 'creativity_rank_type',
-       'threat_rank', 'threat_rank_type', 'ict_index_rank',
-       'ict_index_rank_type', 'form_rank', 'form_rank_type',
-       'points_per_game_rank', 'points_per_game_rank_type',
-       'corners_and_indirect_freekicks_order',
-       'corners_and_indirect_freekicks_text', 'direct_freekicks_order',
-       'direct_freekicks_text', 'penalties_order', 'penalties_text', 'status',"points_per_game",'in_dreamteam',
-       'ep_this','ep_next','dreamteam_count','draft_rank'], axis=1, inplace=True)
-    df = df.rename(columns={"id": "ID",
-                            "element_type":   "position",
-                            "assists":        "assists", 
-                            "total_points":   "total_points",
-                            "clean_sheets":   "CS", 
-                            "goals_conceded": "Gc",
-                            "goals_scored":   "goals_scored",
-                            "expected_goals": "xG", 
-                            "expected_involvements":   "xGi", 
-                            "expected_goals_conceded": "xGc",
-                            "code": "code",
-                            })
-
-    # Map team numbers to names
-    team_map = {
-        1: "Arsenal", 2: "Aston Villa", 3: "Burnley", 4: "Bournemouth",
-        5: "Brentford", 6: "Brighton", 7: "Chelsea", 8: "Crystal Palace",
-        9: "Everton", 10: "Fulham", 11: "Leeds United", 12: "Liverpool",
-        13: "Manchester City", 14: "Manchester United", 15: "Newcastle United",
-        16: "Nottingham Forest", 17: "Sunderland", 18: "Tottenham",
-        19: "West Ham", 20: "Wolverhampton"
-    }
 
-    position_order = {1: 'GK', 2: 'DEF', 3: 'MID', 4: 'FWD'}
+    table = build_players_table(data["elements"])
 
-    df["team"]     = df["team"].map(team_map)
-    df['position'] = df['position'].map(position_order)
-
-    df.to_csv(output_file, index=False, encoding="utf-8-sig")
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    pq.write_table(table, output_file)
+    metrics.add_rows(output_file, table.num_rows)
     logging.info(f"✅ Full player dataset saved to {output_file}")
-        
+
+    if csv_file:
+        table.to_pandas().to_csv(csv_file, index=False, encoding="utf-8-sig")
+        logging.info(f"✅ CSV export saved to {csv_file}")
@@ -0,0 +1,180 @@
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# ------------------ CONFIG ------------------ #
+INITIAL_RATE      = 10.0   # Requests per second
+MIN_RATE          = 1.0
+MAX_RATE          = 50.0
+BURST             = 10     # Token bucket capacity
+TARGET_LATENCY    = 1.0    # Seconds; slower responses ease the rate off
+FAILURE_THRESHOLD = 5      # Consecutive failures before a circuit opens
+RECOVERY_TIMEOUT  = 30.0   # Seconds an open circuit waits before a probe
+BACKOFF_CAP       = 30.0   # Upper bound of a single retry delay
+
+
+# ------------------ HELPERS ------------------ #
+def endpoint_family(url: str) -> str:
+    """
+    Collapse a URL into its endpoint family (IDs stripped).
+
+    e.g. ".../api/entry/123/event/4" -> "entry/event", ".../api/event/4/live" -> "event/live".
+    """
+    path = url.split("/api/", 1)[-1].split("?", 1)[0].strip("/")
+    parts = [p for p in path.split("/") if p and not re.fullmatch(r"\d+", p)]
+    return "/".join(parts) or "root"
+
+
+def backoff_delay(attempt: int, base: float, cap: float = BACKOFF_CAP) -> float:
+    """Exponential backoff with full jitter for a 1-based attempt number."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+# ------------------ RATE LIMITER ------------------ #
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every thread issuing requests.
+
+    The refill rate grows additively while responses are fast, backs off
+    gently when latency exceeds TARGET_LATENCY and halves on HTTP 429
+    (pausing all callers for Retry-After when given).
+
+    Threads only: every fetch runs on a thread pool (final.py, main.py), so
+    acquire() blocks with time.sleep. An asyncio caller would need a
+    non-blocking acquire on the same bucket.
+    """
+
+    def __init__(self, rate: float = INITIAL_RATE, min_rate: float = MIN_RATE,
+                 max_rate: float = MAX_RATE, burst: int = BURST, target_latency: float = TARGET_LATENCY):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.capacity = burst
+        self.target_latency = target_latency
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        """Block the current thread until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self, latency: float):
+        """Adapt the rate after a successful response."""
+        with self._lock:
+            if latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + 0.5)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Halve the rate after a 429 and pause every caller for Retry-After."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        logging.warning(f"⏳ Throttled by API: rate lowered to {self.rate:.1f} req/s"
+                        + (f", pausing {retry_after:.0f}s" if retry_after else ""))
+
+
+# ------------------ CIRCUIT BREAKER ------------------ #
+class CircuitBreaker:
+    """
+    Per endpoint-family breaker: opens after FAILURE_THRESHOLD consecutive
+    failures, fails fast while open, then lets a single probe through after
+    RECOVERY_TIMEOUT (half-open) to decide whether to close again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, recovery_timeout: float = RECOVERY_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a request to this family may be attempted."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    logging.error(f"🔌 Circuit opened for '{self.name}' after {self._failures} failures")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def record_throttle(self):
+        """A 429 says nothing about the endpoint's health: release the probe without counting a failure."""
+        with self._lock:
+            self._probing = False
+
+
+class CircuitBreakerRegistry:
+    """Thread-safe lazy map of endpoint family -> CircuitBreaker."""
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, family: str) -> CircuitBreaker:
+        with self._lock:
+            if family not in self._breakers:
+                self._breakers[family] = CircuitBreaker(family, **self._kwargs)
+            return self._breakers[family]
+
+
+rate_limiter     = AdaptiveRateLimiter()
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,118 @@
+import pandas as pd
+import pyarrow as pa
+
+# ------------------ DECLARED TYPES ------------------ #
+# Output types of the gameweek tables (Data/gw_data.parquet, Data/gw_dataset and the other
+# star-schema tables, see star.py). Columns not listed here keep their inferred type.
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+CATEGORY_COLUMNS = ["manager_team_name", "real_team", "position", "full_name", "short_name"]
+
+INT8_COLUMNS = [
+    "gw_goals", "gw_assists", "gw_clean_sheets", "gw_goals_conceded", "gw_own_goals",
+    "gw_penalties_saved", "gw_penalties_missed", "gw_yellow_cards", "gw_red_cards", "gw_saves",
+    "gw_bonus", "gw_starts", "gw_points", "gw_clearances_blocks_interceptions", "gw_recoveries",
+    "gw_tackles", "gw_defensive_contribution", "event_points", "def_points",
+    "season_own_goals", "season_penalties_saved", "season_penalties_missed", "season_red_cards",
+    "season_yellow_cards", "season_starts",
+]
+
+INT16_COLUMNS = [
+    "gw", "player_id", "gw_minutes", "gw_bps",
+    "season_minutes", "season_goals", "season_assists", "season_clean_sheets", "season_goals_conceded",
+    "season_bonus", "season_bps", "season_saves", "season_points",
+    "season_clearances_blocks_interceptions", "season_recoveries", "season_tackles",
+    "season_defensive_contribution", "total_contributions",
+]
+
+FLOAT32_COLUMNS = [
+    "gw_influence", "gw_creativity", "gw_threat", "gw_ict_index",
+    "gw_expected_goals", "gw_expected_assists", "gw_expected_goal_involvements", "gw_expected_goals_conceded",
+    "season_influence", "season_creativity", "season_threat", "season_ict_index",
+    "season_expected_goals", "season_expected_assists", "season_expected_goal_involvements",
+    "season_expected_goals_conceded", "form", "chance_of_playing_next_round", "chance_of_playing_this_round",
+    "progress",
+]
+
+# Player metadata from bootstrap-static (see players.PLAYERS_SCHEMA): text, even when every value is null
+STRING_COLUMNS = ["added", "news", "news_added", "news_return", "news_updated"]
+
+# Null for players nobody picked; read back as pandas nullable integers
+NULLABLE_INT_COLUMNS = {
+    "manager_id": pd.Int32Dtype(),
+    "manager_team_id": pd.Int32Dtype(),
+    "team_position": pd.Int8Dtype(),
+}
+
+COLUMN_TYPES: dict[str, pa.DataType] = {
+    **{c: CATEGORY for c in CATEGORY_COLUMNS},
+    **{c: pa.int8() for c in INT8_COLUMNS},
+    **{c: pa.int16() for c in INT16_COLUMNS},
+    **{c: pa.float32() for c in FLOAT32_COLUMNS},
+    **{c: pa.string() for c in STRING_COLUMNS},
+    "gw_in_dreamteam": pa.bool_(),
+    "code": pa.int32(),
+    "manager_id": pa.int32(),
+    "manager_team_id": pa.int32(),
+    "team_position": pa.int8(),
+    "squad_number": pa.int8(),
+}
+
+
+# ------------------ HELPERS ------------------ #
+def typed_schema(schema: pa.Schema) -> pa.Schema:
+    """Replace the type of every declared column in an (inferred) schema."""
+    return pa.schema([
+        field.with_type(COLUMN_TYPES[field.name]) if field.name in COLUMN_TYPES else field
+        for field in schema
+    ])
+
+
+def typed_array(values: list, type_: pa.DataType) -> pa.Array:
+    """
+    Typed array from raw JSON values (numbers, numeric strings or None).
+
+    Casts are checked, as in enforce(): a value that does not fit raises.
+    """
+    array = pa.array(values)
+    if pa.types.is_string(array.type) and not pa.types.is_string(type_):
+        array = array.cast(pa.float64()) if pa.types.is_floating(type_) else array.cast(pa.int64())
+    return array.cast(type_)
+
+
+def conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Reorder / null-fill / cast a table to the given (declared) schema; extra columns are dropped."""
+    columns = [
+        table.column(field.name).cast(field.type) if field.name in table.column_names
+        else pa.nulls(table.num_rows, field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def enforce(table: pa.Table) -> pa.Table:
+    """
+    Cast a table to the declared types.
+
+    Casts are checked: a value that does not fit its declared type (e.g. an
+    int8 counter above 127) raises instead of being silently truncated.
+    """
+    return table.cast(typed_schema(table.schema))
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Convert a gameweek table to pandas, keeping the declared dtypes.
+
+    Dictionary columns become categoricals (categories sorted, so groupbys
+    keep the alphabetical order of plain strings); nullable integer columns
+    use pandas' Int dtypes instead of being widened to float64.
+    """
+    df = enforce(table).to_pandas()
+    for name in CATEGORY_COLUMNS:
+        if name in df.columns:
+            df[name] = df[name].cat.set_categories(sorted(df[name].cat.categories))
+    for name, dtype in NULLABLE_INT_COLUMNS.items():
+        if name in df.columns:
+            df[name] = df[name].astype(dtype)
+    return df
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+# ------------------ CONFIG ------------------ #
+# Defensive contributions (DEFCON) needed per position to earn the bonus
+DEFCON_THRESHOLDS = {"DEF": 10, "MID": 12}
+DEFCON_POINTS     = 2
+
+SCORING_COLUMNS = ["def_points", "progress", "total_contributions"]
+SCORING_INPUTS  = ["position", "gw_defensive_contribution"]
+
+
+# ------------------ SCORING ------------------ #
+def defensive_points(positions, contributions) -> dict[str, np.ndarray]:
+    """
+    Score defensive contributions for any number of player-GW rows at once.
+
+    Players in positions without a threshold (GK, FWD) score 0 everywhere.
+
+    Args:
+        positions: Position per row ("GK", "DEF", "MID", "FWD").
+        contributions: gw_defensive_contribution per row.
+
+    Returns:
+        dict[str, np.ndarray]: def_points, progress (0-1 towards the threshold)
+        and total_contributions, one value per row.
+    """
+    positions = np.asarray(positions, dtype=object)
+    contributions = np.nan_to_num(np.asarray(contributions, dtype="float64"))
+
+    thresholds = np.zeros(len(positions))
+    for position, threshold in DEFCON_THRESHOLDS.items():
+        thresholds[positions == position] = threshold
+    eligible = thresholds > 0
+    safe_thresholds = np.where(eligible, thresholds, 1.0)
+
+    return {
+        "def_points": np.where(eligible & (contributions >= thresholds), DEFCON_POINTS, 0).astype("int8"),
+        "progress": np.where(eligible, np.minimum(contributions / safe_thresholds, 1.0), 0.0).astype("float32"),
+        "total_contributions": np.where(eligible, contributions, 0).astype("int16"),
+    }
+
+
+def add_defensive_points(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df with the SCORING_COLUMNS added (computed from SCORING_INPUTS)."""
+    if df.empty or not set(SCORING_INPUTS) <= set(df.columns):
+        return df.assign(**{c: pd.Series(dtype="float64") for c in SCORING_COLUMNS if c not in df.columns})
+    return df.assign(**defensive_points(df["position"], df["gw_defensive_contribution"]))
@@ -0,0 +1,248 @@
+import logging
+import operator
+import os
+from functools import reduce
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from live_decoder import LIVE_STATS
+from metrics import metrics
+from schema import COLUMN_TYPES, conform, enforce, to_pandas
+from scoring import SCORING_COLUMNS, defensive_points
+
+# ------------------ CONFIG ------------------ #
+# Star schema of the gameweek data: the player-GW fact table (Data/gw_data.parquet and its
+# gw_dataset partitions, written by final.py) holds only per-GW stats and scores; ownership
+# and the player / manager attributes live in the tables below, joined on read.
+PICKS_PATH       = "Data/gw_picks.parquet"
+PLAYER_DIM_PATH  = "Data/dim_players.parquet"
+MANAGER_DIM_PATH = "Data/dim_managers.parquet"
+
+# Live stat -> published gw_* column
+STAT_COLUMNS = {stat: {"goals_scored": "gw_goals", "total_points": "gw_points"}.get(stat, f"gw_{stat}") for stat in LIVE_STATS}
+
+FACT_KEYS       = ["player_id", "gw"]
+FACT_COLUMNS    = [*FACT_KEYS, *STAT_COLUMNS.values()]
+PICK_COLUMNS    = ["gw", "player_id", "manager_id", "team_position"]
+MANAGER_COLUMNS = ["manager_id", "manager_team_id", "manager_team_name"]
+
+# players_data column -> player dimension column; other season totals become season_<stat>
+PLAYER_RENAMES = {
+    "ID":   "player_id",
+    "name": "full_name",
+    "web_name": "short_name",
+    "team": "real_team",
+    "CS":   "season_clean_sheets",
+    "Gc":   "season_goals_conceded",
+    "xG":   "season_expected_goals",
+    "xGc":  "season_expected_goals_conceded",
+}
+
+
+def _schema(columns: list[str]) -> pa.Schema:
+    return pa.schema([pa.field(c, COLUMN_TYPES[c]) for c in columns])
+
+
+FACT_SCHEMA    = _schema(FACT_COLUMNS + SCORING_COLUMNS)
+PICKS_SCHEMA   = _schema(PICK_COLUMNS)
+MANAGER_SCHEMA = _schema(MANAGER_COLUMNS)
+
+
+# ------------------ BUILD ------------------ #
+def player_column(name: str) -> str:
+    """Player dimension name of a players_data column."""
+    if name in PLAYER_RENAMES:
+        return PLAYER_RENAMES[name]
+    if name in STAT_COLUMNS:
+        return "season_" + STAT_COLUMNS[name].removeprefix("gw_")
+    return name
+
+
+def build_player_dim(players: pa.Table) -> pa.Table:
+    """Player dimension (one row per player_id, published names and types) from the players table."""
+    return enforce(players.rename_columns([player_column(name) for name in players.column_names]))
+
+
+def build_manager_dim(standings: pd.DataFrame) -> pa.Table:
+    """Manager dimension (MANAGER_COLUMNS) from the league standings."""
+    df = pd.DataFrame({
+        "manager_id": standings["manager_id"],
+        "manager_team_id": standings["manager_id"],
+        "manager_team_name": standings["team_name"],
+    })
+    return conform(pa.Table.from_pandas(df, preserve_index=False), MANAGER_SCHEMA)
+
+
+def split_gameweek(df: pd.DataFrame, positions: pd.Series) -> tuple[pa.Table, pa.Table]:
+    """
+    Split one GW of published rows into its fact and picks rows.
+
+    Player and manager attributes are dropped; the defensive-contribution
+    scores (scoring.py) are computed with the positions of the player dimension.
+
+    Args:
+        df: Rows of one GW (player_id, gw, gw_* stats, manager_id, team_position, ...).
+        positions: Position per player_id.
+
+    Returns:
+        tuple[pa.Table, pa.Table]: (FACT_SCHEMA rows, PICKS_SCHEMA rows of the picked players)
+    """
+    facts = df.reindex(columns=FACT_COLUMNS)
+    facts = facts.assign(**defensive_points(
+        positions.reindex(facts["player_id"]).to_numpy(), facts["gw_defensive_contribution"]
+    ))
+    picks = df[df["manager_id"].notna()] if "manager_id" in df.columns else df.iloc[:0]
+    return (
+        conform(pa.Table.from_pandas(facts, preserve_index=False), FACT_SCHEMA),
+        conform(pa.Table.from_pandas(picks.reindex(columns=PICK_COLUMNS), preserve_index=False), PICKS_SCHEMA),
+    )
+
+
+def write_dimensions(players_path: str, standings_path: str,
+                     player_dim_path: str = PLAYER_DIM_PATH, manager_dim_path: str = MANAGER_DIM_PATH):
+    """
+    Write the player and manager dimensions (atomically) from the players table and the standings.
+
+    A dimension whose content is unchanged is left untouched, so its mtime
+    keeps the aggregates (aggregates.write_aggregates) and the dashboard's
+    data store (data_store.DataStore.signature) from being invalidated.
+    """
+    tables = {
+        player_dim_path: build_player_dim(pq.read_table(players_path)),
+        manager_dim_path: build_manager_dim(pd.read_csv(standings_path)),
+    }
+    for path, table in tables.items():
+        if os.path.exists(path) and pq.read_table(path).equals(table):
+            logging.info(f"{path} unchanged")
+            continue
+        tmp_path = f"{path}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        metrics.add_rows(path, table.num_rows)
+
+
+# ------------------ READ ------------------ #
+def read_table(path: str, columns: list[str] | None = None, filter=None) -> pd.DataFrame | None:
+    """A star table with the declared dtypes (see schema.to_pandas), or None if the file is missing."""
+    if not path or not os.path.exists(path):
+        return None
+    return to_pandas(ds.dataset(path, format="parquet").to_table(columns=columns, filter=filter))
+
+
+def player_positions(player_dim_path: str = PLAYER_DIM_PATH) -> pd.Series:
+    """Position per player_id (empty if the player dimension is missing)."""
+    players = read_table(player_dim_path, columns=["player_id", "position"])
+    if players is None:
+        return pd.Series(dtype=object)
+    return players.set_index("player_id")["position"].astype(object)
+
+
+def join(
+    facts: pd.DataFrame,
+    picks: pd.DataFrame | None = None,
+    players: pd.DataFrame | None = None,
+    managers: pd.DataFrame | None = None,
+    owned_only: bool = False,
+) -> pd.DataFrame:
+    """
+    Assemble player-GW rows from star tables, keeping the order of the fact rows.
+
+    Args:
+        facts: Rows keyed by (player_id, gw).
+        picks: PICK_COLUMNS rows; players nobody picked get null manager_id / team_position.
+        players: Player dimension columns to add (with player_id).
+        managers: Manager dimension columns to add (with manager_id).
+        owned_only: Keep only the rows of picked players.
+    """
+    df = facts
+    if picks is not None:
+        df = df.merge(picks, on=FACT_KEYS, how="inner" if owned_only else "left")
+    if players is not None:
+        df = df.merge(players, on="player_id", how="left")
+    if managers is not None and "manager_id" in df.columns:
+        df = df.merge(managers, on="manager_id", how="left")
+    return df
+
+
+def load_rows(
+    dataset: ds.Dataset,
+    gw_range: tuple[int, int] = None,
+    manager=None,
+    owned_only: bool = False,
+    columns: list[str] = None,
+    picks_path: str = PICKS_PATH,
+    player_dim_path: str | None = PLAYER_DIM_PATH,
+    manager_dim_path: str | None = MANAGER_DIM_PATH,
+) -> pd.DataFrame:
+    """
+    Player-GW rows with the published columns, pushing filters down to the scans.
+
+    With the star layout the fact rows are joined with the picks and the
+    dimensions (a None dimension path leaves that dimension out). A manager
+    filter is resolved through the manager dimension and the picks, and only
+    that manager's players are read from the fact table. Data written before
+    the star layout (every column in the GW rows) is read as is.
+
+    Args:
+        dataset: The fact table (or the wide GW table).
+        gw_range: Inclusive (first, last) gameweek.
+        manager: Manager team name (str) or manager ID (int).
+        owned_only: Keep only players picked by a manager.
+        columns: Columns to return (all if None).
+    """
+    gw_filter = None
+    if gw_range is not None:
+        gw_filter = (ds.field("gw") >= gw_range[0]) & (ds.field("gw") <= gw_range[1])
+
+    if "manager_id" in dataset.schema.names:
+        filters = [gw_filter] if gw_filter is not None else []
+        if isinstance(manager, str):
+            filters.append(ds.field("manager_team_name") == manager)
+        elif manager is not None:
+            filters.append(ds.field("manager_id") == manager)
+        if owned_only:
+            filters.append(ds.field("manager_id").is_valid())
+        return to_pandas(dataset.to_table(columns=columns, filter=reduce(operator.and_, filters) if filters else None))
+
+    def wanted(path: str | None, keys: list[str]) -> list[str] | None:
+        """Columns to read from a dimension (None: all, []: skip it)."""
+        if not path or not os.path.exists(path):
+            return []
+        if columns is None:
+            return None
+        names = pq.read_schema(path).names
+        needed = [c for c in columns if c in names and c not in keys]
+        return keys + needed if needed else []
+
+    managers = read_table(manager_dim_path)
+    picks = read_table(picks_path, filter=gw_filter)
+    if picks is None:
+        picks = to_pandas(PICKS_SCHEMA.empty_table())
+    if isinstance(manager, str):
+        ids = managers.loc[managers["manager_team_name"] == manager, "manager_id"] if managers is not None else []
+        picks = picks[picks["manager_id"].isin(ids)]
+    elif manager is not None:
+        picks = picks[picks["manager_id"] == manager]
+    owned = owned_only or manager is not None
+
+    filters = [gw_filter] if gw_filter is not None else []
+    if manager is not None:
+        filters.append(ds.field("player_id").isin(pa.array(picks["player_id"].unique(), COLUMN_TYPES["player_id"])))
+    fact_columns = None if columns is None else [c for c in dataset.schema.names if c in FACT_KEYS or c in columns]
+    facts = to_pandas(dataset.to_table(columns=fact_columns, filter=reduce(operator.and_, filters) if filters else None))
+
+    player_columns = wanted(player_dim_path, ["player_id"])
+    manager_columns = wanted(manager_dim_path, ["manager_id"])
+    if managers is not None and manager_columns is not None:
+        managers = managers[manager_columns] if manager_columns else None
+    df = join(
+        facts,
+        picks,
+        players=read_table(player_dim_path, columns=player_columns) if player_columns != [] else None,
+        managers=managers,
+        owned_only=owned,
+    )
+    return df if columns is None else df[columns]
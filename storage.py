@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+from rate_limit import backoff_delay
+
+# ------------------ CONFIG ------------------ #
+BUCKET           = "data"
+MANIFEST_NAME    = "manifest.json"       # Remote {name: {"sha256", "size", "uploaded_at"}} of the uploaded files
+REMOTE_CACHE_DIR = "Data/remote_cache"   # Local copies of downloaded files
+MAX_WORKERS      = 8
+RETRIES          = 3
+RETRY_DELAY      = 1.0                   # Base delay (seconds) of the retry backoff
+HASH_CHUNK       = 1 << 20
+
+
+# ------------------ BACKENDS ------------------ #
+class SupabaseStorage:
+    """Supabase Storage bucket. The client is created on first use, from SUPABASE_URL / SUPABASE_SERVICE_KEY by default."""
+
+    def __init__(self, bucket: str = BUCKET, url: Optional[str] = None, key: Optional[str] = None):
+        self.bucket = bucket
+        self.url = url or os.environ.get("SUPABASE_URL")
+        self.key = key or os.environ.get("SUPABASE_SERVICE_KEY")
+        self._client = None
+
+    def _storage(self):
+        if self._client is None:
+            from supabase import create_client
+            self._client = create_client(self.url, self.key)
+        return self._client.storage.from_(self.bucket)
+
+    def upload(self, name: str, data: bytes, content_type: str):
+        self._storage().upload(name, data, file_options={"content-type": content_type, "upsert": "true"})
+
+    def download(self, name: str) -> bytes:
+        return self._storage().download(name)
+
+
+class LocalStorage:
+    """A local directory standing in for a bucket (dry runs and tests)."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def upload(self, name: str, data: bytes, content_type: str):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def download(self, name: str) -> bytes:
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+
+# ------------------ HELPERS ------------------ #
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def with_retries(action, label: str, retries: int = RETRIES, delay: float = RETRY_DELAY):
+    """Call action() until it succeeds, sleeping a jittered exponential backoff between attempts."""
+    for attempt in range(1, retries + 1):
+        try:
+            return action()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            logging.warning(f"⚠️ {label} failed (attempt {attempt}/{retries}): {e}")
+            time.sleep(backoff_delay(attempt, delay))
+
+
+def read_manifest(storage) -> dict:
+    """The bucket's manifest.json (raises if it cannot be downloaded)."""
+    return json.loads(storage.download(MANIFEST_NAME))
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# ------------------ DOWNLOAD CACHE ------------------ #
+def fetch_files(names: list[str], storage, cache_dir: str = REMOTE_CACHE_DIR, max_workers: int = MAX_WORKERS) -> dict[str, str]:
+    """
+    Bring local copies of bucket files up to date and return their paths.
+
+    The remote manifest is downloaded first. A cached file is reused when its
+    hash matches the manifest; the others are downloaded concurrently (with
+    retries), checked against the manifest hash and written atomically. When
+    the manifest or a download is unreachable, the cached copy is used as is.
+
+    Args:
+        names: Object names in the bucket.
+        storage: SupabaseStorage, LocalStorage or any object with download().
+        cache_dir: Folder holding the local copies.
+        max_workers: Concurrent downloads.
+
+    Returns:
+        dict: Object name -> local path.
+
+    Raises:
+        Exception: The download error, for a file that has no cached copy.
+    """
+    paths = {name: os.path.join(cache_dir, name) for name in names}
+    try:
+        manifest = with_retries(lambda: read_manifest(storage), "Manifest download")
+    except Exception as e:
+        logging.warning(f"⚠️ Storage unreachable ({e}); using the cached files in {cache_dir}")
+        manifest = None
+
+    def is_current(name: str) -> bool:
+        if not os.path.exists(paths[name]):
+            return False
+        if manifest is None:
+            return True
+        expected = manifest.get(name, {}).get("sha256")
+        return expected is not None and file_sha256(paths[name]) == expected
+
+    stale = [name for name in names if not is_current(name)]
+    if manifest is not None:
+        logging.info(f"📦 {len(names) - len(stale)} of {len(names)} cached files are current")
+
+    def download(name: str) -> int:
+        data = with_retries(lambda: storage.download(name), f"Download of {name}")
+        expected = manifest.get(name, {}).get("sha256") if manifest else None
+        if expected is not None and hashlib.sha256(data).hexdigest() != expected:
+            raise ValueError(f"{name} does not match the manifest hash")
+        _write_atomic(paths[name], data)
+        return len(data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(download, name) for name in stale}
+        for name, future in futures.items():
+            try:
+                size = future.result()
+                entry = (manifest or {}).get(name, {})
+                logging.info(f"⬇️ {name}: {size / 2**20:.2f} MiB"
+                             + (f" (uploaded {entry['uploaded_at']})" if "uploaded_at" in entry else ""))
+            except Exception as e:
+                if not os.path.exists(paths[name]):
+                    raise
+                logging.warning(f"⚠️ Could not refresh {name} ({e}); using the cached copy")
+    return paths
+
+
+def utc_timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
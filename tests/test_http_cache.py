@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import final
+import http_cache
+from http_cache import FOREVER, ttl_for, is_settled, mark_finished_events
+
+
+def picks_url(monkeypatch, manager_id: int, gw: int) -> str:
+    """The URL final.fetch_manager_picks actually requests."""
+    requested = []
+    monkeypatch.setattr(final, "fetch_data", lambda url: requested.append(url))
+    final.fetch_manager_picks(manager_id, gw)
+    return requested[0]
+
+
+def test_picks_url_matches_its_ttl_rule(monkeypatch):
+    url = picks_url(monkeypatch, 115613, 3)
+    assert "//entry" not in url and "entry//" not in url
+    assert ttl_for(url) == 300
+
+
+def test_picks_of_settled_gameweek_are_pinned(monkeypatch):
+    monkeypatch.setattr(http_cache, "_finished_events", set())
+    url = picks_url(monkeypatch, 115613, 3)
+    assert not is_settled(url)
+
+    mark_finished_events([3])
+    assert is_settled(url)
+    assert ttl_for(url, settled=True) == FOREVER
+    assert not is_settled(picks_url(monkeypatch, 115613, 4))
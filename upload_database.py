@@ -1,37 +1,154 @@
-import pandas as pd
-import io
+import argparse
+import json
+import logging
 import os
-from supabase import create_client
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+from storage import MANIFEST_NAME, MAX_WORKERS, SupabaseStorage, file_sha256, read_manifest, utc_timestamp, with_retries
 
-def upload_csv(file_path, bucket="data"):
-    df = pd.read_csv(file_path)
-    buffer = io.StringIO()
-    df.to_csv(buffer, index=False)
-    supabase.storage.from_(bucket).upload(os.path.basename(file_path), buffer.getvalue(), content_type="text/csv")
+# ------------------ CONFIG ------------------ #
+DATA_DIR     = "Data"
+GW_FOLDER    = "gameweeks_parquet"   # Per-GW files written by final.py, inside DATA_DIR
+LAST_UPDATED = "last_updated.txt"
+RUN_REPORT   = "run_report.json"       # Written by main.run_pipeline (see metrics.py)
+
+# Files the dashboard downloads (see data_utils.load_data2), relative to DATA_DIR
+DATA_FILES = [
+    "league_standings.csv",
+    "players_data.parquet",
+    "gameweeks.csv",
+    "fixtures.csv",
+    "gw_data.parquet",
+    "gw_picks.parquet",
+    "dim_players.parquet",
+    "dim_managers.parquet",
+]
+
+CONTENT_TYPES = {
+    ".csv":     "text/csv",
+    ".parquet": "application/octet-stream",
+    ".json":    "application/json",
+    ".txt":     "text/plain",
+}
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+
+# ------------------ HELPERS ------------------ #
+def content_type(name: str) -> str:
+    return CONTENT_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+
+
+def collect_files(data_dir: str = DATA_DIR) -> dict[str, str]:
+    """
+    Map remote names to local paths for every file to publish.
+
+    Args:
+        data_dir: Folder written by the pipeline.
+
+    Returns:
+        dict: Remote name (path relative to data_dir) -> local path, for the
+        DATA_FILES and per-GW Parquet files that exist.
+    """
+    files = {name: os.path.join(data_dir, name) for name in DATA_FILES}
+    gw_folder = os.path.join(data_dir, GW_FOLDER)
+    if os.path.isdir(gw_folder):
+        for f in sorted(os.listdir(gw_folder)):
+            if f.startswith("gw_data_gw") and f.endswith(".parquet"):
+                files[f"{GW_FOLDER}/{f}"] = os.path.join(gw_folder, f)
+    return {name: path for name, path in files.items() if os.path.exists(path)}
+
+
+def load_manifest(storage) -> dict:
+    """Remote manifest, or {} if there is none yet (everything is uploaded)."""
+    try:
+        return read_manifest(storage)
+    except Exception as e:
+        logging.warning(f"⚠️ No remote manifest ({e}); uploading every file.")
+        return {}
+
+
+def upload_file(storage, name: str, path: str) -> int:
+    """
+    Upload a file's bytes unchanged, retrying with jittered exponential backoff.
+
+    Returns:
+        int: Bytes uploaded.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    with_retries(lambda: storage.upload(name, data, content_type(name)), f"Upload of {name}")
+    return len(data)
+
+
+# ------------------ SYNC ------------------ #
+def sync_files(files: dict[str, str], storage, max_workers: int = MAX_WORKERS) -> list[str]:
+    """
+    Upload the files whose content differs from the remote manifest, then update it.
+
+    Hashes are compared against the manifest from the previous run; changed
+    files are uploaded concurrently. The manifest is written last and only
+    records files that were uploaded successfully, so a failed file is
+    retried on the next run.
+
+    Args:
+        files: Remote name -> local path (see collect_files).
+        storage: storage.SupabaseStorage, storage.LocalStorage or any object with upload/download.
+        max_workers: Concurrent uploads.
+
+    Returns:
+        list[str]: Names of the uploaded files.
+
+    Raises:
+        RuntimeError: If any upload failed after its retries.
+    """
+    manifest = load_manifest(storage)
+    hashes = {name: file_sha256(path) for name, path in files.items()}
+    changed = [name for name in files if manifest.get(name, {}).get("sha256") != hashes[name]]
+    logging.info(f"📦 {len(changed)} of {len(files)} files changed since the last upload")
+
+    uploaded, failed, total_bytes = [], [], 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(upload_file, storage, name, files[name]): name for name in changed}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                total_bytes += future.result()
+            except Exception as e:
+                logging.error(f"❌ Failed to upload {name}: {e}")
+                failed.append(name)
+                continue
+            manifest[name] = {"sha256": hashes[name], "size": os.path.getsize(files[name]), "uploaded_at": utc_timestamp()}
+            uploaded.append(name)
+
+    if uploaded:
+        body = json.dumps(manifest, indent=2, sort_keys=True).encode()
+        with_retries(lambda: storage.upload(MANIFEST_NAME, body, content_type(MANIFEST_NAME)), f"Upload of {MANIFEST_NAME}")
+    logging.info(f"✅ Uploaded {len(uploaded)} files ({total_bytes / 2**20:.2f} MiB)")
+
+    if failed:
+        raise RuntimeError(f"Failed to upload: {', '.join(sorted(failed))}")
+    return sorted(uploaded)
+
+
+# ------------------ MAIN ------------------ #
+def main(storage=None, data_dir: str = DATA_DIR, include_report: bool = True) -> list[str]:
+    storage = storage or SupabaseStorage()
+
+    with open(LAST_UPDATED, "w") as f:
+        f.write(datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"))
+
+    files = collect_files(data_dir)
+    files[LAST_UPDATED] = LAST_UPDATED
+    if include_report and os.path.exists(os.path.join(data_dir, RUN_REPORT)):
+        files[RUN_REPORT] = os.path.join(data_dir, RUN_REPORT)
+    return sync_files(files, storage)
 
-def upload_parquet(file_path, bucket="data"):
-    df = pd.read_parquet(file_path)
-    buffer = io.BytesIO()
-    df.to_parquet(buffer, index=False)
-    supabase.storage.from_(bucket).upload(os.path.basename(file_path), buffer.getvalue(), content_type="application/octet-stream")
 
 if __name__ == "__main__":
-    # CSV files
-    upload_csv("Data/league_standings.csv")
-    upload_csv("Data/players_data.csv")
-    
-    # Parquet files
-    upload_parquet("Data/gw_data.parquet")
-    # Optional: upload individual gameweek files
-    import os
-    for f in os.listdir("Data"):
-        if f.startswith("gw") and f.endswith(".parquet") and f != "gw_data.parquet":
-            upload_parquet(f)
-
-with open("last_updated.txt", "w") as f:        
-    f.write(datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"))
+    parser = argparse.ArgumentParser(description="Upload changed pipeline outputs to Supabase Storage.")
+    parser.add_argument("--no-report", action="store_true", help=f"Do not upload {RUN_REPORT}.")
+    args = parser.parse_args()
+    main(include_report=not args.no_report)
@@ -7,6 +7,11 @@ import requests
 import time
 from typing import List, Any, Optional
 
+from http_cache import CACHE_ENABLED, SHARED_FAMILIES, response_cache, shared_fetches, decode as decode_cached
+from live_decoder import decode_live
+from metrics import metrics
+from rate_limit import backoff_delay, circuit_breakers, endpoint_family, parse_retry_after, rate_limiter
+
 # Database file (used by fetch_players_data)
 DB_FILE = "fpl_data.db"
 
@@ -19,39 +24,104 @@ session = requests.Session()
 
 # Database file
 DB_FILE = "fpl_data.db"
-# Define URLs
-BASE_URL        = "https://draft.premierleague.com/api"
+# Define URLs (FPL_BASE_URL points the pipeline at a local API stub, see benchmarks/api_stub.py)
+BASE_URL        = os.environ.get("FPL_BASE_URL", "https://draft.premierleague.com/api")
 
 #Player data from the gameweek endpoint
 GW_URL      = f"{BASE_URL}/event/"
 
 session = requests.session()
 
+# Connection pool sized for concurrent fetching (see final.fetch_picks_batch)
+HTTP_POOL_SIZE = 16
+_adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
 # ------------------ API HELPERS ------------------ #
-def fetch_data(url: str, retries: int = 3, delay: int = 2, timeout: int = 10) -> Optional[dict]:
+def fetch_data(url: str, retries: int = 3, delay: int = 2, timeout: int = 10, use_cache: bool = CACHE_ENABLED) -> Optional[dict]:
     """
     Fetch JSON data from a given URL with retries and error handling.
 
+    Responses are kept in the on-disk HTTP cache (see http_cache.py): fresh
+    entries are served without a request, stale ones are revalidated with a
+    conditional request (ETag / Last-Modified). Requests go through the
+    shared adaptive rate limiter and a per-endpoint circuit breaker (see
+    rate_limit.py), which honour 429 / Retry-After and fail fast once an
+    endpoint family is down.
+
     Args:
         url (str): The API endpoint to fetch.
         retries (int): Number of retry attempts if request fails.
-        delay (int): Delay (seconds) between retries.
+        delay (int): Base delay (seconds) of the jittered exponential backoff.
         timeout (int): Timeout (seconds) for each request.
+        use_cache (bool): Read from / write to the response cache.
 
     Returns:
         dict | None: JSON response if successful, else None.
     """
+    family = endpoint_family(url)
+    if family in SHARED_FAMILIES and shared_fetches.active:
+        # League-independent payload inside a batch run: fetched once, shared by every league
+        return shared_fetches.do(url, lambda: _fetch_data(url, family, retries, delay, timeout, use_cache))
+    return _fetch_data(url, family, retries, delay, timeout, use_cache)
+
+
+def _fetch_data(url: str, family: str, retries: int, delay: int, timeout: int, use_cache: bool) -> Optional[dict]:
+    cached = response_cache.get(url) if use_cache else None
+    if cached and response_cache.is_fresh(cached, url):
+        response_cache.record("hits", len(cached["body"]))
+        metrics.record_cached(family)
+        return decode_cached(cached["body"])
+
+    breaker = circuit_breakers.get(family)
+    if not breaker.allow():
+        logging.warning(f"Circuit open for '{family}', skipping {url}")
+        return None
+
     for attempt in range(1, retries + 1):
+        rate_limiter.acquire()
+        start = time.monotonic()
+        response = None
         try:
-            response = session.get(url, timeout=timeout)
+            response = session.get(url, timeout=timeout, headers=response_cache.conditional_headers(cached))
+            metrics.record_request(family, time.monotonic() - start, len(response.content), ok=response.status_code < 400)
+            if response.status_code == 429:
+                rate_limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                raise requests.HTTPError("429 Too Many Requests", response=response)
+            if response.status_code == 304 and cached:
+                rate_limiter.on_success(time.monotonic() - start)
+                breaker.record_success()
+                response_cache.touch(url)
+                response_cache.record("revalidated", len(cached["body"]))
+                return decode_cached(cached["body"])
+            if 400 <= response.status_code < 500 and response.status_code != 408:
+                # Client errors (e.g. 404) will not succeed on retry and do not mean the endpoint is down
+                breaker.record_success()
+                logging.error(f"❌ {response.status_code} from {url}, not retrying.")
+                return None
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            rate_limiter.on_success(time.monotonic() - start)
+            breaker.record_success()
+            if use_cache:
+                response_cache.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                response_cache.record("misses", len(response.content))
+            return data
         except requests.RequestException as e:
             logging.warning(f"Attempt {attempt}/{retries} failed for {url}: {e}")
-            if attempt < retries:
-                time.sleep(delay)
+            if response is None:
+                metrics.record_request(family, time.monotonic() - start, 0, ok=False)
+            throttled = e.response is not None and e.response.status_code == 429
+            if throttled:
+                breaker.record_throttle()
             else:
-                logging.error(f"❌ Failed to fetch data from {url} after {retries} attempts.")
+                breaker.record_failure()
+            if attempt < retries and breaker.allow():
+                metrics.record_retry(family)
+                time.sleep(backoff_delay(attempt, delay))
+            else:
+                logging.error(f"❌ Failed to fetch data from {url} after {attempt} attempts.")
                 return None
     
 # ------------------ FILE HELPERS ------------------ #
@@ -71,6 +141,7 @@ def save_csv(filename: str, headers: List[str], rows: List[List[Any]]):
             writer = csv.writer(csvfile)
             writer.writerow(headers)
             writer.writerows(rows)
+        metrics.add_rows(filename, len(rows))
         logging.info(f"✅ Saved CSV: {filename}")
     except Exception as e:
         logging.error(f"Failed to save CSV {filename}: {e}")
@@ -129,7 +200,7 @@ def fetch_players_data() -> pd.DataFrame:
         return pd.DataFrame()
 
 # ------------------ GAMEWEEK HELPERS ------------------ #
-def get_player_gw_data(gameweek: int, base_url: str = "https://draft.premierleague.com/api") -> pd.DataFrame:
+def get_player_gw_data(gameweek: int, base_url: str = BASE_URL) -> pd.DataFrame:
     """
     Fetch all player stats for a given gameweek.
 
@@ -138,7 +209,7 @@ def get_player_gw_data(gameweek: int, base_url: str = "https://draft.premierleag
         base_url (str): Base API URL.
 
     Returns:
-        pd.DataFrame: Gameweek player stats.
+        pd.DataFrame: Gameweek player stats (id, gameweek and the LIVE_STATS columns).
     """
     gw_url = f"{base_url}/event/{gameweek}/live"
     data = fetch_data(gw_url)
@@ -147,11 +218,5 @@ def get_player_gw_data(gameweek: int, base_url: str = "https://draft.premierleag
         logging.warning(f"No gameweek data found for GW{gameweek}")
         return pd.DataFrame()
 
-    records = []
-    for player_id, value in data["elements"].items():
-        stats = value.get("stats", {})
-        stats["id"] = int(player_id)
-        stats["gameweek"] = int(gameweek)
-        records.append(stats)
-
-    return pd.DataFrame(records)
\ No newline at end of file
+    # Typed columns straight from the payload (live_decoder.LIVE_SCHEMA), which stays unmodified
+    return decode_live(data, int(gameweek)).to_pandas()
\ No newline at end of file
@@ -2,21 +2,22 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 from data_utils import (
-    get_starting_lineup,
-    calculate_team_gw_points,
+    get_team_gw_points_table,
     get_teams_avg_points,
-    points_per_player_position,
+    get_position_points,
+    get_league_average,
     get_top_performers,
     get_player_progression
 )
+from data_store import get_store
 
 # ---------------- OVERVIEW ----------------
-def display_overview(manager_name: str, manager_df: pd.DataFrame):
+def display_overview(manager_name: str):
     st.header("🏆 Season Overview")
-    starting_players = get_starting_lineup(manager_df)
 
-    # Team points per GW
-    team_gw_points = calculate_team_gw_points(starting_players)
+    # Team points per GW (precomputed by the pipeline, see aggregates.py)
+    aggregates = get_store().aggregates()
+    team_gw_points = get_team_gw_points_table(aggregates, manager=manager_name)
     team_avg_points = get_teams_avg_points(team_gw_points)
 
     st.subheader("Team Points by Gameweek")
@@ -28,7 +29,7 @@ def display_overview(manager_name: str, manager_df: pd.DataFrame):
 
         # Pie chart for points distribution by position
         fig = px.pie(
-            points_per_player_position(starting_players),
+            get_position_points(aggregates, manager_name),
             names='position',
             values='gw_points',
             title="Points Distribution by Position",
@@ -38,20 +39,16 @@ def display_overview(manager_name: str, manager_df: pd.DataFrame):
 
 
 # ---------------- PERFORMANCE TREND ----------------
-def display_performance_trend(manager_name: str, df: pd.DataFrame):
+def display_performance_trend(manager_name: str):
     st.header("📈 Points Progression")
-    manager_df = df[df['manager_team_name'] == manager_name]
-    starting_players = get_starting_lineup(manager_df)
-    team_gw_points = calculate_team_gw_points(starting_players)
+    aggregates = get_store().aggregates()
+    team_gw_points = get_team_gw_points_table(aggregates, manager=manager_name)
 
     manager_row = team_gw_points.loc[manager_name].drop('Total')
     manager_points = pd.DataFrame({'gameweek': manager_row.index.astype(int), 'manager_points': manager_row.values})
 
     # League average (excluding current manager)
-    all_starting = get_starting_lineup(df)
-    all_team_gw_points = all_starting.groupby(['manager_team_name', 'gw'])['gw_points'].sum().reset_index()
-    other_teams = all_team_gw_points[all_team_gw_points['manager_team_name'] != manager_name]
-    league_avg = other_teams.groupby('gw')['gw_points'].mean().reset_index().rename(columns={'gw_points':'avg_points'})
+    league_avg = get_league_average(aggregates, exclude=manager_name)
 
     comparison_df = manager_points.merge(league_avg, left_on='gameweek', right_on='gw', how='left')
     comparison_df.drop(columns='gw', inplace=True)
@@ -99,30 +96,6 @@ def display_player_progression(manager_df: pd.DataFrame):
     st.plotly_chart(fig, use_container_width=True)
 
 
-#---------Defensive Contributions ---------
-def calc_defensive_points(row):
-    # Only Defenders and Midfielders are eligible
-    if row["position"] not in ["DEF", "MID"]:
-        return pd.Series({
-            "def_points": 0,
-            "progress": 0.0,
-            "total_contributions": 0
-        })
-    
-
-    contributions = row["gw_defensive_contribution"]
-    threshold = 10 if row["position"] == "DEF" else 12
-
-    earned = 2 if contributions >= threshold else 0
-    progress = min(contributions / threshold, 1.0)
-
-    return pd.Series({
-        "def_points": earned,
-        "progress": progress,
-        "total_contributions": contributions
-    })
-
-
 # ---------------- OTHER STATS ----------------
 def display_other_stats(manager_points: pd.DataFrame, top_performances: pd.DataFrame):
     st.header("📜 Other Stats")
@@ -136,3 +109,16 @@ def display_other_stats(manager_points: pd.DataFrame, top_performances: pd.DataF
 
     col2.metric("Best Gameweek", int(best_gw_row['gameweek']), f"{best_gw_row['manager_points']} pts")
     col3.metric("Toughest Gameweek", int(worst_gw_row['gameweek']), f"{worst_gw_row['manager_points']} pts")
+
+
+# ---------------- MANAGER PAGE ----------------
+def render_manager_page(manager_name: str, manager_df: pd.DataFrame):
+    """Render the full dashboard of one manager from their owned rows."""
+    st.title(f"📊 {manager_name} Dashboard")
+
+    display_overview(manager_name)
+    manager_points = display_performance_trend(manager_name)
+    display_latest_gw(manager_df)
+    top_performances = display_top_performers(manager_df)
+    display_player_progression(manager_df)
+    display_other_stats(manager_points, top_performances)